@@ -0,0 +1,91 @@
+import sys
+import csv
+import sqlite3
+import argparse
+
+# Table "jeux" (un jeu par ligne : AppID, note Metacritic, évaluation Steam, compteurs de reviews) sans interface graphique :
+# utilisée par BDD_Steam.py et en ligne de commande (création, ajout, import CSV, affichage).
+COLONNES = ["nom", "app_id", "note_metacritic", "evaluation_steam", "reviews_total", "reviews_pos", "reviews_neg", "controverses"]
+COLONNES_ENTIERES = {"reviews_total", "reviews_pos", "reviews_neg"}
+
+# Fonction ouvrant (ou créant) la base de données et sa table "jeux"
+def ouvrir_bdd(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jeux (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nom TEXT NOT NULL,
+            app_id TEXT,
+            note_metacritic TEXT,
+            evaluation_steam TEXT,
+            reviews_total INTEGER,
+            reviews_pos INTEGER,
+            reviews_neg INTEGER,
+            controverses TEXT
+        )
+    """)
+    conn.commit()
+    return conn
+
+# Fonction convertissant les valeurs saisies (chaînes, vides = None) dans l'ordre de COLONNES en ligne de la table
+def normaliser(values):
+    values = [val.strip() if isinstance(val, str) else val for val in values]
+    values = [val if val != "" else None for val in values]
+    return tuple((int(val) if val else 0) if col in COLONNES_ENTIERES else val for col, val in zip(COLONNES, values))
+
+# Fonction ajoutant des jeux (valeurs dans l'ordre de COLONNES) en une seule transaction ; renvoie le nombre de jeux ajoutés
+def ajouter_jeux(conn, lignes):
+    lignes = [normaliser(values) for values in lignes]
+    with conn:
+        conn.executemany(f"INSERT INTO jeux ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})", lignes)
+    return len(lignes)
+
+# Fonction lisant un fichier CSV (en-tête avec les noms de COLONNES, séparateur détecté) ; renvoie les lignes dans l'ordre de COLONNES
+def lire_csv(csv_path):
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        dialect = csv.Sniffer().sniff(f.read(4096), delimiters=",;\t")
+        f.seek(0)
+        reader = csv.DictReader(f, dialect=dialect)
+        if "nom" not in (reader.fieldnames or []):
+            raise ValueError(f"colonne 'nom' absente (colonnes attendues : {', '.join(COLONNES)})")
+        return [[row.get(col) for col in COLONNES] for row in reader]
+
+# Fonction renvoyant toutes les lignes de la table "jeux"
+def lister_jeux(conn):
+    return conn.execute("SELECT * FROM jeux").fetchall()
+
+# Fonction vidant la table "jeux"
+def vider(conn):
+    with conn:
+        conn.execute("DELETE FROM jeux")
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Gestion de la table 'jeux' (sans interface graphique).")
+    parser.add_argument("bdd", help="Base SQLite (créée si besoin)")
+    sub = parser.add_subparsers(dest="commande", required=True)
+    p_importer = sub.add_parser("importer", help="Importer des jeux depuis un fichier CSV")
+    p_importer.add_argument("csv", help=f"Fichier CSV avec en-tête ({', '.join(COLONNES)})")
+    p_importer.add_argument("--remplacer", action="store_true", help="Vider la table avant l'import")
+    p_ajouter = sub.add_parser("ajouter", help="Ajouter un jeu")
+    for col in COLONNES:
+        p_ajouter.add_argument(f"--{col.replace('_', '-')}", dest=col, required=col == "nom")
+    sub.add_parser("lister", help="Afficher les jeux")
+    args = parser.parse_args()
+
+    conn = ouvrir_bdd(args.bdd)
+    try:
+        if args.commande == "importer":
+            lignes = lire_csv(args.csv)
+            if args.remplacer:
+                vider(conn)
+            print(f"{ajouter_jeux(conn, lignes)} jeux importés dans {args.bdd}")
+        elif args.commande == "ajouter":
+            ajouter_jeux(conn, [[getattr(args, col) for col in COLONNES]])
+            print(f"{args.nom} ajouté à {args.bdd}")
+        else:
+            for row in lister_jeux(conn):
+                print(" | ".join("" if val is None else str(val) for val in row))
+    except (OSError, ValueError, csv.Error, sqlite3.Error) as e:
+        sys.exit(f"Erreur : {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+import corpus
+from cache_langues import detecter_lot
+
+TAILLE_LOT = 5000
+
+# Fonction ouvrant la base de données (mode WAL) et créant la table "reviews" et son index plein texte FTS5
+def ouvrir_bdd(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            jeu_id INTEGER REFERENCES jeux(id),
+            jeu TEXT NOT NULL,
+            tranche TEXT,
+            chemin TEXT,
+            recommendationid TEXT,
+            label INTEGER,
+            langue TEXT,
+            longueur INTEGER,
+            timestamp INTEGER,
+            texte TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_reviews_tranche ON reviews (tranche, longueur);
+        CREATE INDEX IF NOT EXISTS idx_reviews_jeu ON reviews (jeu);
+        CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+            texte, content='reviews', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        );
+    """)
+    return conn
+
+# Fonction renvoyant la correspondance nom du jeu -> id de la table "jeux" (si elle existe)
+def lire_ids_jeux(conn):
+    try:
+        return {nom: id_ for id_, nom in conn.execute("SELECT id, nom FROM jeux")}
+    except sqlite3.OperationalError:
+        return {}
+
+# Fonction insérant un lot de reviews ; les langues manquantes sont identifiées pour tout le lot à la fois
+def inserer_lot(conn, lot, langues=True):
+    a_detecter = [i for i, row in enumerate(lot) if row[6] is None]
+    if langues and a_detecter:
+        for i, langue in zip(a_detecter, detecter_lot([lot[i][-1] for i in a_detecter])):
+            lot[i] = lot[i][:6] + (langue,) + lot[i][7:]
+    conn.executemany("INSERT INTO reviews (jeu_id, jeu, tranche, chemin, recommendationid, label, langue, longueur, timestamp, texte) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", lot)
+    return len(lot)
+
+# Fonction chargeant toutes les reviews d'un corpus (arborescence ou shard) dans la table "reviews", par lots dans une seule transaction
+def ingerer(source, db_path, taille_lot=TAILLE_LOT, langues=True):
+    conn = ouvrir_bdd(db_path)
+    ids_jeux = lire_ids_jeux(conn)
+    stats = corpus.nouvelles_stats()
+    lot, total = [], 0
+
+    with conn: # Transaction unique : la table est remplacée d'un bloc (ou pas du tout en cas d'erreur)
+        conn.execute("DELETE FROM reviews")
+        conn.execute("INSERT INTO reviews_fts (reviews_fts) VALUES ('delete-all')")
+        for review in corpus.iter_reviews(source, stats=stats):
+            texte = review["texte"]
+            lot.append((ids_jeux.get(review["jeu"]), review["jeu"], review["tranche"], review["chemin"],
+                        review["recommendationid"], review["label"], review["langue"], len(texte), review["timestamp"], texte))
+            if len(lot) >= taille_lot:
+                total += inserer_lot(conn, lot, langues)
+                lot = []
+        if lot:
+            total += inserer_lot(conn, lot, langues)
+        # L'index plein texte est reconstruit en une passe plutôt que mis à jour ligne par ligne
+        conn.execute("INSERT INTO reviews_fts (reviews_fts) VALUES ('rebuild')")
+
+    conn.close()
+    return total, stats
+
+# Fonction sélectionnant un sous-ensemble de reviews en une seule requête (tranches, longueur minimale, langue, recherche plein texte)
+def selectionner(db_path, tranches=None, longueur_min=0, langue=None, recherche=None):
+    conditions, params = ["longueur >= ?"], [longueur_min]
+    if tranches:
+        conditions.append(f"tranche IN ({', '.join('?' * len(tranches))})")
+        params.extend(tranches)
+    if langue:
+        conditions.append("langue = ?")
+        params.append(langue)
+    if recherche:
+        conditions.append("id IN (SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH ?)")
+        params.append(recherche)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute(f"SELECT * FROM reviews WHERE {' AND '.join(conditions)} ORDER BY id", params):
+            yield dict(row)
+    finally:
+        conn.close()
+
+# Fonction comptant les reviews ingérées par tranche
+def compter_par_tranche(db_path):
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT tranche, COUNT(*) FROM reviews GROUP BY tranche"))
+    conn.close()
+    return counts
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Ingestion des reviews dans SQLite (table 'reviews' + index FTS5) et requêtes filtrées.")
+    sub = parser.add_subparsers(dest="commande", required=True)
+
+    p_ing = sub.add_parser("ingerer", help="Charger toutes les reviews d'un corpus dans la base")
+    p_ing.add_argument("source", help="Dossier du corpus (arborescence data/ ou corpus shard)")
+    p_ing.add_argument("bdd", help="Base SQLite (ex : data/BDD_Review.db)")
+    p_ing.add_argument("--taille-lot", type=int, default=TAILLE_LOT)
+    p_ing.add_argument("--sans-langue", action="store_true", help="Ne pas détecter la langue des reviews")
+
+    p_req = sub.add_parser("requete", help="Afficher les reviews correspondant aux filtres")
+    p_req.add_argument("bdd")
+    p_req.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable)")
+    p_req.add_argument("--longueur-min", type=int, default=0)
+    p_req.add_argument("--langue", help="Code langue (ex : en, fr)")
+    p_req.add_argument("--recherche", help="Requête plein texte FTS5 (ex : refund)")
+    p_req.add_argument("--compter", action="store_true", help="N'afficher que le nombre de reviews")
+    args = parser.parse_args()
+
+    if args.commande == "ingerer":
+        if not os.path.exists(args.source):
+            sys.exit(f"{args.source} n'existe pas.")
+        debut = time.perf_counter()
+        total, stats = ingerer(args.source, args.bdd, args.taille_lot, not args.sans_langue)
+        print(f"{total} reviews ingérées dans {args.bdd} en {time.perf_counter() - debut:.2f} s "
+              f"(ignorées : {stats['ignored_no_note']} sans Note, {stats['ignored_not_review']} pas 'review_')")
+    else:
+        rows = selectionner(args.bdd, args.tranche, args.longueur_min, args.langue, args.recherche)
+        if args.compter:
+            print(sum(1 for _ in rows))
+        else:
+            for row in rows:
+                note = "👍" if row["label"] else "👎"
+                print(f"[{row['tranche']}] {row['jeu']} {note} ({row['langue']}, {row['longueur']} car.) : {row['texte'][:100]!r}")
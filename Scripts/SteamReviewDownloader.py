@@ -1,142 +1,215 @@
-import os
-import requests
-from PySide6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
-    QFileDialog, QSpinBox, QComboBox, QMessageBox, QHBoxLayout
-)
-import sys
-
-# Fonction permettant de récupérér les reviews Steam par son API.
-def get_reviews(appid, count=20, language="all"):
-    url = f"https://store.steampowered.com/appreviews/{appid}"
-    params = {
-        "json": 1,
-        "num_per_page": count,
-        "language": language,
-        "purchase_type": "all"
-    }
-
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
-        return []
-
-    data = response.json()
-    return data.get("reviews", [])
-
-# Fonction sauvegardant les reviews collectés en fichiers texte
-def save_reviews_to_txt(reviews, output_folder):
-    os.makedirs(output_folder, exist_ok=True)
-
-    for i, review in enumerate(reviews):
-        content = review.get('review', '').strip()
-        voted_up = review.get('voted_up', None)
-        if not content:
-            continue
-
-        rating = "👍" if voted_up else "👎"
-
-        file_path = os.path.join(output_folder, f"review_{i+1}.txt")
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(f"Note : {rating}\n\n{content}")
-
-# Interface graphique
-class SteamReviewDownloader(QWidget):
-    def __init__(self): # Fonction initiale de la fenêtre
-        super().__init__()
-        self.setWindowTitle("Télécharger des reviews Steam")
-        self.setFixedWidth(500)
-        self.setup_ui()
-
-    def setup_ui(self): # Fonction organisant la structure de l'interface graphique
-        layout = QVBoxLayout()
-
-        self.appid_input = QLineEdit()
-        layout.addWidget(QLabel("AppID du jeu Steam :"))
-        layout.addWidget(self.appid_input)
-
-        self.name_input = QLineEdit()
-        layout.addWidget(QLabel("Nom du jeu (facultatif) :"))
-        layout.addWidget(self.name_input)
-
-        self.lang_combo = QComboBox()
-        self.lang_combo.addItems(["all", "english", "french", "german", "spanish", "russian", "japanese", "chinese"])
-        layout.addWidget(QLabel("Langue des reviews :"))
-        layout.addWidget(self.lang_combo)
-
-        self.count_spin = QSpinBox()
-        self.count_spin.setRange(1, 1000)
-        self.count_spin.setValue(20)
-        layout.addWidget(QLabel("Nombre de reviews :"))
-        layout.addWidget(self.count_spin)
-
-        path_layout = QHBoxLayout()
-        self.path_input = QLineEdit()
-        self.path_button = QPushButton("Choisir dossier")
-        self.path_button.clicked.connect(self.choose_folder)
-        path_layout.addWidget(self.path_input)
-        path_layout.addWidget(self.path_button)
-
-        layout.addWidget(QLabel("Dossier de sortie :"))
-        layout.addLayout(path_layout)
-
-        btn_layout = QHBoxLayout()
-        self.start_button = QPushButton("Lancer")
-        self.start_button.clicked.connect(self.start_download)
-        btn_layout.addWidget(self.start_button)
-
-        self.reset_button = QPushButton("Réinitialiser")
-        self.reset_button.clicked.connect(self.reset_fields)
-        btn_layout.addWidget(self.reset_button)
-
-        layout.addLayout(btn_layout)
-        self.setLayout(layout)
-
-    def choose_folder(self): # Fonction permettant de choisir le dossier de sortie
-        folder = QFileDialog.getExistingDirectory(self, "Choisir un dossier")
-        if folder:
-            self.path_input.setText(folder)
-
-    def start_download(self): # Fonction pour le téléchargement des reviews
-        appid = self.appid_input.text().strip()
-        if not appid.isdigit():
-            QMessageBox.warning(self, "Erreur", "L'AppID doit être un nombre.")
-            return
-
-        name = self.name_input.text().strip() or appid
-        count = self.count_spin.value()
-        language = self.lang_combo.currentText()
-        output_dir = self.path_input.text().strip()
-
-        if not output_dir:
-            QMessageBox.warning(self, "Erreur", "Veuillez choisir un dossier de sortie.")
-            return
-
-        full_path = os.path.join(output_dir, name)
-
-        self.start_button.setEnabled(False)
-        self.start_button.setText("Téléchargement...")
-
-        try:
-            reviews = get_reviews(appid, count, language)
-            if not reviews:
-                raise Exception("Aucune review récupérée.")
-            save_reviews_to_txt(reviews, full_path)
-            QMessageBox.information(self, "Succès", f"{len(reviews)} reviews enregistrées dans :\n{full_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", str(e))
-        finally:
-            self.start_button.setEnabled(True)
-            self.start_button.setText("Lancer")
-
-    def reset_fields(self): # Fonction permettant de réinitialiser les champs utilisateurs
-        self.appid_input.clear()
-        self.name_input.clear()
-        self.count_spin.setValue(20)
-        self.lang_combo.setCurrentIndex(0)
-        self.path_input.clear()
-
-if __name__ == "__main__": # Fonction de lancement de l'application
-    app = QApplication(sys.argv)
-    window = SteamReviewDownloader()
-    window.show()
-    sys.exit(app.exec())
+import os
+import re
+import sys
+from PySide6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
+    QFileDialog, QSpinBox, QComboBox, QMessageBox, QHBoxLayout, QCheckBox
+)
+from PySide6.QtCore import QThread, Signal
+
+from reviews_steam import download_reviews, download_reviews_to_shard, sync_reviews
+
+# Thread exécutant un téléchargement sans bloquer la boucle d'évènements Qt
+class DownloadWorker(QThread):
+    finished_ok = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            self.finished_ok.emit(self.func(*self.args))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+# Interface graphique
+class SteamReviewDownloader(QWidget):
+    def __init__(self): # Fonction initiale de la fenêtre
+        super().__init__()
+        self.setWindowTitle("Télécharger des reviews Steam")
+        self.setFixedWidth(500)
+        self.setup_ui()
+
+    def setup_ui(self): # Fonction organisant la structure de l'interface graphique
+        layout = QVBoxLayout()
+
+        self.appid_input = QLineEdit()
+        layout.addWidget(QLabel("AppID du jeu Steam :"))
+        layout.addWidget(self.appid_input)
+
+        self.name_input = QLineEdit()
+        layout.addWidget(QLabel("Nom du jeu (facultatif) :"))
+        layout.addWidget(self.name_input)
+
+        self.lang_combo = QComboBox()
+        self.lang_combo.addItems(["all", "english", "french", "german", "spanish", "russian", "japanese", "chinese"])
+        layout.addWidget(QLabel("Langue des reviews :"))
+        layout.addWidget(self.lang_combo)
+
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 1000000)
+        self.count_spin.setValue(20)
+        layout.addWidget(QLabel("Nombre de reviews :"))
+        layout.addWidget(self.count_spin)
+
+        self.sync_checkbox = QCheckBox("Synchronisation incrémentale (nouvelles reviews uniquement)")
+        layout.addWidget(self.sync_checkbox)
+
+        self.shard_checkbox = QCheckBox("Ajouter au corpus shard du dossier de sortie (corpus_XXXX.shard)")
+        layout.addWidget(self.shard_checkbox)
+
+        self.tranche_input = QLineEdit()
+        self.tranche_input.setPlaceholderText("ex : 30-40")
+        layout.addWidget(QLabel("Tranche Metacritic du jeu (corpus shard) :"))
+        layout.addWidget(self.tranche_input)
+
+        path_layout = QHBoxLayout()
+        self.path_input = QLineEdit()
+        self.path_button = QPushButton("Choisir dossier")
+        self.path_button.clicked.connect(self.choose_folder)
+        path_layout.addWidget(self.path_input)
+        path_layout.addWidget(self.path_button)
+
+        layout.addWidget(QLabel("Dossier de sortie :"))
+        layout.addLayout(path_layout)
+
+        btn_layout = QHBoxLayout()
+        self.start_button = QPushButton("Lancer")
+        self.start_button.clicked.connect(self.start_download)
+        btn_layout.addWidget(self.start_button)
+
+        self.batch_button = QPushButton("Lot depuis la BDD")
+        self.batch_button.clicked.connect(self.start_batch_download)
+        btn_layout.addWidget(self.batch_button)
+
+        self.reset_button = QPushButton("Réinitialiser")
+        self.reset_button.clicked.connect(self.reset_fields)
+        btn_layout.addWidget(self.reset_button)
+
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def choose_folder(self): # Fonction permettant de choisir le dossier de sortie
+        folder = QFileDialog.getExistingDirectory(self, "Choisir un dossier")
+        if folder:
+            self.path_input.setText(folder)
+
+    def start_download(self): # Fonction pour le téléchargement des reviews
+        appid = self.appid_input.text().strip()
+        if not appid.isdigit():
+            QMessageBox.warning(self, "Erreur", "L'AppID doit être un nombre.")
+            return
+
+        name = self.name_input.text().strip() or appid
+        count = self.count_spin.value()
+        language = self.lang_combo.currentText()
+        output_dir = self.path_input.text().strip()
+
+        if not output_dir:
+            QMessageBox.warning(self, "Erreur", "Veuillez choisir un dossier de sortie.")
+            return
+
+        full_path = os.path.join(output_dir, name)
+        if self.shard_checkbox.isChecked() and not self.check_shard_options():
+            return
+        tranche = self.tranche_input.text().strip()
+
+        self.set_running(True)
+        if self.shard_checkbox.isChecked():
+            self.worker = DownloadWorker(self.download_to_shard, appid, output_dir, tranche, name, count, language)
+            full_path = output_dir
+        elif self.sync_checkbox.isChecked():
+            self.worker = DownloadWorker(lambda: sum(sync_reviews(appid, full_path, language, count)))
+        else:
+            self.worker = DownloadWorker(download_reviews, appid, full_path, count, language)
+        self.worker.finished_ok.connect(lambda saved: self.on_download_done(saved, full_path))
+        self.worker.failed.connect(self.on_download_failed)
+        self.worker.start()
+
+    @staticmethod
+    def download_to_shard(appid, output_dir, tranche, name, count, language): # Fonction ajoutant les reviews d'un jeu au corpus shard (exécutée dans le thread)
+        from corpus_shard import ShardWriter, recommendationids
+        connues = recommendationids(output_dir) if os.path.isdir(output_dir) else set()
+        with ShardWriter(output_dir) as writer:
+            return download_reviews_to_shard(appid, writer, tranche, name, count, language, connues=connues)
+
+    def check_shard_options(self): # Fonction vérifiant les options du format shard (tranche valide, pas de synchronisation)
+        if self.sync_checkbox.isChecked():
+            QMessageBox.warning(self, "Erreur", "La synchronisation incrémentale n'est disponible que pour les fichiers texte.")
+            return False
+        if not re.match(r"^\d{1,3}-\d{1,3}$", self.tranche_input.text().strip()):
+            QMessageBox.warning(self, "Erreur", "Veuillez indiquer la tranche Metacritic du jeu (ex : 30-40).")
+            return False
+        return True
+
+    def start_batch_download(self): # Fonction téléchargeant tous les jeux de la table "jeux" d'une base de données, en parallèle
+        from telechargement_lot import lire_jeux, telecharger_lot, format_rapport
+
+        output_dir = self.path_input.text().strip()
+        if not output_dir:
+            QMessageBox.warning(self, "Erreur", "Veuillez choisir un dossier de sortie.")
+            return
+        if self.shard_checkbox.isChecked() and self.sync_checkbox.isChecked():
+            QMessageBox.warning(self, "Erreur", "La synchronisation incrémentale n'est disponible que pour les fichiers texte.")
+            return
+
+        db_path, _ = QFileDialog.getOpenFileName(self, "Choisir la base de données des jeux", "", "Base de données SQLite (*.db)")
+        if not db_path:
+            return
+
+        jeux = lire_jeux(db_path)
+        if not jeux:
+            QMessageBox.warning(self, "Erreur", "Aucun jeu avec un AppID dans la base.")
+            return
+
+        count = self.count_spin.value()
+        language = self.lang_combo.currentText()
+        sync = self.sync_checkbox.isChecked()
+        shard = self.shard_checkbox.isChecked()
+
+        self.set_running(True)
+        self.worker = DownloadWorker(
+            lambda: format_rapport(*telecharger_lot(jeux, output_dir, count, language, par_tranche=True, sync=sync, shard=shard))
+        )
+        self.worker.finished_ok.connect(self.on_batch_done)
+        self.worker.failed.connect(self.on_download_failed)
+        self.worker.start()
+
+    def set_running(self, running): # Fonction (dés)activant les boutons pendant un téléchargement
+        self.start_button.setEnabled(not running)
+        self.batch_button.setEnabled(not running)
+        self.start_button.setText("Téléchargement..." if running else "Lancer")
+
+    def on_download_done(self, saved, full_path): # Fonction appelée à la fin d'un téléchargement simple
+        self.set_running(False)
+        if not saved:
+            QMessageBox.critical(self, "Erreur", "Aucune review récupérée.")
+            return
+        QMessageBox.information(self, "Succès", f"{saved} reviews enregistrées dans :\n{full_path}")
+
+    def on_batch_done(self, rapport): # Fonction affichant le rapport de débit du téléchargement en lot
+        self.set_running(False)
+        QMessageBox.information(self, "Téléchargement en lot terminé", rapport)
+
+    def on_download_failed(self, message): # Fonction affichant l'erreur survenue dans le thread de téléchargement
+        self.set_running(False)
+        QMessageBox.critical(self, "Erreur", message)
+
+    def reset_fields(self): # Fonction permettant de réinitialiser les champs utilisateurs
+        self.appid_input.clear()
+        self.name_input.clear()
+        self.count_spin.setValue(20)
+        self.lang_combo.setCurrentIndex(0)
+        self.sync_checkbox.setChecked(False)
+        self.shard_checkbox.setChecked(False)
+        self.tranche_input.clear()
+        self.path_input.clear()
+
+if __name__ == "__main__": # Fonction de lancement de l'application
+    app = QApplication(sys.argv)
+    window = SteamReviewDownloader()
+    window.show()
+    sys.exit(app.exec())
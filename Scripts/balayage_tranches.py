@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+import corpus
+import modeles
+
+# Balayage des tranches Metacritic : le corpus est lu et vectorisé une seule fois (vocabulaire TF-IDF commun),
+# puis chaque sous-ensemble de tranches est évalué avec et sans oversampling, en sélectionnant ses lignes de la matrice.
+# Les résultats sont écrits au format long (une ligne par sous-ensemble, oversampling, modèle et mesure) pour f_score_graph.py.
+TOUTES = "Toutes"
+MESURES = ("precision", "recall", "f1-score")
+
+# Fonction renvoyant les sous-ensembles évalués par défaut : chaque tranche seule, puis toutes les tranches ensemble
+def default_subsets(tranches):
+    subsets = {tranche: [tranche] for tranche in sorted(tranches)}
+    subsets[TOUTES] = sorted(tranches)
+    return subsets
+
+# Fonction lisant le corpus une fois : textes, labels et tranche de chaque review
+def load_corpus(root, tranches=None, min_size=1):
+    import numpy as np
+    textes, labels, tranche_of = [], [], []
+    stats = corpus.nouvelles_stats()
+    for review in corpus.iter_reviews(root, tranches, min_size, stats):
+        textes.append(review["texte"])
+        labels.append(review["label"])
+        tranche_of.append(review["tranche"])
+    return textes, np.array(labels), np.array(tranche_of), stats
+
+# Fonction évaluant tous les modèles sur tous les sous-ensembles et réglages d'oversampling (tâches réparties sur n_workers processus).
+# Le découpage 80/20 de chaque sous-ensemble est celui de analyse_classifieurs.py (mêmes lignes, même graine).
+def sweep(X, y, tranche_of, subsets, models, oversampling_settings=(False, True), n_workers=1, dense=(), test_size=0.2):
+    import numpy as np
+    from sklearn.base import clone
+    from sklearn.model_selection import train_test_split
+    from entrainement import run_fold_tasks
+    tasks, sizes = [], {}
+    for subset, tranches in subsets.items():
+        rows = np.where(np.isin(tranche_of, tranches))[0]
+        if len(rows) < 10 or len(np.unique(y[rows])) < 2:
+            print(f"Sous-ensemble {subset} ignoré : pas assez de données")
+            continue
+        train_idx, test_idx = train_test_split(rows, test_size=test_size, random_state=42)
+        sizes[subset] = (len(train_idx), len(test_idx))
+        for oversampling in oversampling_settings:
+            for name, model in models.items():
+                tasks.append((name, clone(model), (subset, oversampling), train_idx, test_idx, oversampling))
+
+    rows = []
+    for result in run_fold_tasks(tasks, X, y, n_workers, dense):
+        subset, oversampling = result["pli"]
+        for mesure in MESURES + ("fit", "predict"):
+            rows.append((subset, ",".join(subsets[subset]), int(oversampling), result["modele"], mesure, float(result[mesure]),
+                         sizes[subset][0], sizes[subset][1]))
+    return rows
+
+# Fonction enregistrant les résultats du balayage (format long) dans la base de résultats
+def save_sweep_to_db(db_path, rows):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS balayage_tranches (
+                sous_ensemble TEXT,
+                tranches TEXT,
+                oversampling INTEGER,
+                modele TEXT,
+                mesure TEXT,
+                valeur REAL,
+                n_entrainement INTEGER,
+                n_test INTEGER
+            )
+        """)
+        conn.execute("DELETE FROM balayage_tranches")
+        conn.executemany("INSERT INTO balayage_tranches VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.close()
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Évaluation des classifieurs sur chaque tranche Metacritic, avec et sans oversampling, en une passe.")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic lue (répétable, toutes par défaut)")
+    parser.add_argument("--sous-ensemble", action="append",
+                        help="Sous-ensemble supplémentaire de tranches séparées par des virgules (ex : 30-40,90-100)")
+    parser.add_argument("--taille-min", type=int, default=1, help="Taille minimale des reviews")
+    parser.add_argument("--modeles", help="Modèles évalués, séparés par des virgules (sélection par défaut du registre)")
+    parser.add_argument("--config-modeles", help="Fichier JSON complétant le registre des modèles")
+    parser.add_argument("--max-features", type=int, default=5000, help="Taille du vocabulaire TF-IDF")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processus parallèles (1 = séquentiel)")
+    parser.add_argument("--bdd", default="resultats_classifieurs.db", help="Base de résultats")
+    parser.add_argument("--graphiques", help="Dossier où dessiner les graphiques de chaque mesure, avec et sans oversampling")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    try:
+        registre, selection = modeles.load_registry(args.config_modeles)
+    except (OSError, ValueError, ImportError, AttributeError) as e:
+        sys.exit(f"Configuration des modèles invalide : {e}")
+    names = args.modeles.split(",") if args.modeles else selection
+    unknown = [name for name in names if name not in registre]
+    if unknown:
+        sys.exit(f"Modèles inconnus : {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    textes, y, tranche_of, stats = load_corpus(args.corpus, args.tranche, args.taille_min)
+    if len(textes) < 10:
+        sys.exit("Pas assez de données pour entraîner les modèles.")
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    X = TfidfVectorizer(max_features=args.max_features).fit_transform(textes)
+    print(f"{stats['used']} reviews lues et vectorisées en {time.perf_counter() - start:.2f} s")
+
+    subsets = default_subsets(np.unique(tranche_of))
+    for subset in args.sous_ensemble or []:
+        subsets[subset] = subset.split(",")
+
+    n_workers = max(1, args.workers)
+    models = modeles.create_models(names, registre, n_jobs=1 if n_workers > 1 else None)
+    rows = sweep(X, y, tranche_of, subsets, models, n_workers=n_workers, dense=modeles.dense_models(names, registre))
+    save_sweep_to_db(args.bdd, rows)
+
+    for subset, _, oversampling, name, mesure, valeur, _, _ in rows:
+        if mesure == "f1-score":
+            print(f"{subset:<12} {'avec' if oversampling else 'sans'} oversampling  {name:<22} f1 {valeur:.4f}")
+    print(f"Balayage terminé en {time.perf_counter() - start:.2f} s ({len(rows)} lignes dans {args.bdd})")
+
+    if args.graphiques: # Graphiques dessinés hors écran en parallèle (voir rendu_graphiques.py)
+        import rendu_graphiques
+        from f_score_graph import lire_scores, fscore_spec
+        specs = []
+        for oversampling in (True, False):
+            for mesure in MESURES:
+                fichier = os.path.join(args.graphiques, f"{mesure}_{'avec' if oversampling else 'sans'}_oversampling.png")
+                specs.append(fscore_spec(fichier, *lire_scores(args.bdd, oversampling, mesure), oversampling, mesure))
+        dessines, inchanges, duree = rendu_graphiques.render(args.bdd, specs, n_workers)
+        print(f"Graphiques : {dessines} dessinés, {inchanges} inchangés en {duree:.2f} s ({args.graphiques})")
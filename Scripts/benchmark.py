@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from importlib import metadata
+
+import corpus
+import modeles
+import corpus_synthetique
+
+# Mesures de performance de chaque étape du traitement sur des corpus synthétiques de tailles croissantes (corpus_synthetique.py) :
+# génération, parcours et lecture du corpus (arborescence, shard, base SQLite), écriture SQLite, détection de langue, analyse de
+# sentiment, vectorisation TF-IDF, oversampling, entraînement et prédiction de chaque modèle, rendu des graphiques.
+# Les mesures sont enregistrées en JSON avec les versions utilisées, pour comparer deux versions du code (--reference).
+# La détection de langue et l'analyse de sentiment, traitées review par review, sont mesurées sur un échantillon.
+TAILLES_DEFAUT = [1000, 10000]
+ECHANTILLON_DEFAUT = 2000
+MAX_QUADRATIQUE_DEFAUT = 20000
+SEUIL_REGRESSION_DEFAUT = 1.2
+DUREE_MIN_COMPARAISON = 0.05 # Étapes plus courtes ignorées par la comparaison (bruit de mesure)
+
+# Fonction renvoyant les versions de l'environnement (interpréteur, bibliothèques, commit git) jointes aux mesures
+def versions():
+    infos = {"python": platform.python_version(), "plateforme": platform.platform(), "processeurs": os.cpu_count()}
+    for paquet in ("numpy", "scipy", "scikit-learn", "matplotlib", "seaborn", "nltk", "textblob", "textblob-fr", "langdetect"):
+        try:
+            infos[paquet] = metadata.version(paquet)
+        except metadata.PackageNotFoundError:
+            infos[paquet] = None
+    try:
+        infos["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                         capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        infos["commit"] = None
+    return infos
+
+# Collecte des mesures : une ligne par (taille, format, étape)
+class Mesures:
+    def __init__(self):
+        self.lignes = []
+
+    def ajouter(self, taille, format_, etape, duree, elements=None, **details): # Fonction enregistrant une mesure et l'affichant
+        ligne = {"taille": taille, "format": format_, "etape": etape, "duree": round(duree, 6) if duree is not None else None,
+                 "elements": elements, "debit": round(elements / duree, 1) if elements and duree else None}
+        ligne.update(details)
+        self.lignes.append(ligne)
+        debit = f"{ligne['debit']:>12.1f} /s" if ligne["debit"] else " " * 14
+        duree = f"{duree:10.3f} s" if duree is not None else f"{'-':>12}"
+        print(f"{taille:>9} {format_ or '-':<13} {etape:<36} {duree} {debit}  {details.get('note', '')}")
+
+    def chronometrer(self, taille, format_, etape, fonction, elements=None, **details): # Fonction mesurant un appel ; renvoie son résultat
+        start = time.perf_counter()
+        resultat = fonction()
+        self.ajouter(taille, format_, etape, time.perf_counter() - start, elements, **details)
+        return resultat
+
+# Fonction mesurant le parcours et la lecture du corpus dans chaque format ; renvoie les textes et labels (lus dans le shard)
+def mesurer_lecture(mesures, n, chemins):
+    textes, labels = [], []
+    for format_, (chemin, _) in chemins.items():
+        if format_ == "arborescence": # Premier parcours : construction du manifeste ; second : manifeste réutilisé
+            manifeste = os.path.join(chemin, corpus.FICHIER_MANIFESTE)
+            if os.path.exists(manifeste):
+                os.remove(manifeste)
+            mesures.chronometrer(n, format_, "lecture (manifeste construit)", lambda: sum(1 for _ in corpus.iter_reviews(chemin)), n)
+            mesures.chronometrer(n, format_, "lecture (manifeste réutilisé)", lambda: sum(1 for _ in corpus.iter_reviews(chemin)), n)
+        else:
+            reviews = mesures.chronometrer(n, format_, "lecture", lambda: list(corpus.iter_reviews(chemin)), n)
+            if format_ == "shard":
+                textes = [review["texte"] for review in reviews]
+                labels = [review["label"] for review in reviews]
+    return textes, labels
+
+# Fonction mesurant l'écriture de la base SQLite (ingestion du shard, langues déjà connues)
+def mesurer_ecriture_sqlite(mesures, n, shard, dossier):
+    import BDD_reviews
+    db_path = os.path.join(dossier, "ecriture.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    mesures.chronometrer(n, "bdd", "écriture SQLite", lambda: BDD_reviews.ingerer(shard, db_path, langues=False), n)
+    os.remove(db_path)
+
+# Fonction mesurant la détection de langue et l'analyse de sentiment sur un échantillon (débit extrapolable au corpus)
+def mesurer_analyse(mesures, n, textes, echantillon=ECHANTILLON_DEFAUT):
+    import identification_langue
+    import moteur_sentiment
+    from langdetect import detect, DetectorFactory
+    echantillon = textes[:echantillon]
+    note = f"échantillon de {len(echantillon)}"
+
+    DetectorFactory.seed = 0
+    if not identification_langue.MOTEUR: # Coûts payés une fois par processus : première taille seulement
+        mesures.chronometrer(n, None, "chargement de langdetect", lambda: detect("warm up"))
+        mesures.chronometrer(n, None, "chargement des profils (par lots)", identification_langue.moteur)
+    start = time.perf_counter()
+    for texte in echantillon:
+        try:
+            detect(texte)
+        except Exception:
+            pass
+    mesures.ajouter(n, None, "détection de langue (langdetect)", time.perf_counter() - start, len(echantillon), note=note)
+    identification_langue.MOTEUR.pop("mots", None) # Cache des mots vidé : mesure à froid sur tout le corpus
+    identification_langue.MOTEUR.pop("scores_mots", None)
+    mesures.chronometrer(n, None, "identification de langue (par lots)", lambda: identification_langue.identifier(textes), n)
+
+    try:
+        if not moteur_sentiment.ANALYSEURS:
+            mesures.chronometrer(n, None, "chargement des analyseurs", moteur_sentiment.charger)
+        langues = identification_langue.identifier(echantillon)
+        mesures.chronometrer(n, None, "sentiment (moteur_sentiment)", lambda: moteur_sentiment.score(echantillon, langues),
+                             len(echantillon), note=note)
+    except RuntimeError as e:
+        mesures.ajouter(n, None, "sentiment (moteur_sentiment)", None, note=str(e))
+
+# Fonction mesurant la vectorisation, l'oversampling, l'entraînement et la prédiction de chaque modèle ; renvoie les matrices de confusion
+def mesurer_classification(mesures, n, textes, labels, names, registre, max_quadratique):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics import confusion_matrix
+    from sklearn.model_selection import train_test_split
+    from comparaison_classifieurs import MAX_FEATURES
+    from entrainement import oversample, fit_and_predict
+
+    vectorizer = TfidfVectorizer(max_features=MAX_FEATURES)
+    X = mesures.chronometrer(n, None, "vectorisation TF-IDF", lambda: vectorizer.fit_transform(textes), n)
+    X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=0.2, random_state=42, stratify=labels)
+    X_train, y_train = mesures.chronometrer(n, None, "oversampling", lambda: oversample(X_train, y_train), X_train.shape[0])
+
+    confusions = {}
+    for name in names:
+        if registre[name]["complexite"].startswith("quadratique") and X_train.shape[0] > max_quadratique:
+            mesures.ajouter(n, None, f"modèle {name} (fit)", None, note=f"ignoré au-delà de {max_quadratique} reviews")
+            continue
+        model = modeles.create_models([name], registre)[name]
+        _, y_pred, durees = fit_and_predict(name, model, X_train, y_train, X_test, dense=not registre[name]["creux"])
+        mesures.ajouter(n, None, f"modèle {name} (fit)", durees["fit"], X_train.shape[0])
+        mesures.ajouter(n, None, f"modèle {name} (predict)", durees["predict"], X_test.shape[0])
+        confusions[name] = confusion_matrix(y_test, y_pred, labels=[0, 1])
+    return confusions
+
+# Fonction mesurant le rendu hors écran des graphiques d'une comparaison (une matrice de confusion par modèle)
+def mesurer_rendu(mesures, n, confusions, dossier, n_workers):
+    import rendu_graphiques
+    from comparaison_classifieurs import confusion_matrix_spec
+    os.makedirs(dossier, exist_ok=True)
+    db_path = os.path.join(dossier, "graphiques.db")
+    specs = [confusion_matrix_spec(dossier, name, cm) for name, cm in confusions.items()]
+    fichiers = rendu_graphiques.store_specs(db_path, specs)
+    start = time.perf_counter()
+    dessines, _, _ = rendu_graphiques.render_charts(db_path, fichiers, n_workers, forcer=True)
+    mesures.ajouter(n, None, "rendu des graphiques", time.perf_counter() - start, dessines)
+
+# Fonction lançant toutes les mesures pour chaque taille de corpus ; renvoie le document JSON des résultats
+def lancer(tailles, dossier, names, registre=modeles.REGISTRE, echantillon=ECHANTILLON_DEFAUT,
+           max_quadratique=MAX_QUADRATIQUE_DEFAUT, n_workers=1, etapes=None):
+    mesures = Mesures()
+    etapes = set(etapes or ("lecture", "sqlite", "analyse", "classification", "rendu"))
+    debut = time.strftime("%Y-%m-%dT%H:%M:%S")
+    travail = tempfile.mkdtemp(prefix="benchmark_")
+    try:
+        for n in tailles:
+            chemins = corpus_synthetique.generer(dossier, n)
+            for format_, (chemin, duree) in chemins.items():
+                if duree is not None:
+                    mesures.ajouter(n, format_, "génération", duree, n)
+
+            textes, labels = mesurer_lecture(mesures, n, chemins) if "lecture" in etapes else ([], [])
+            if not textes:
+                from corpus_shard import iter_records
+                records = list(iter_records(chemins["shard"][0]))
+                textes, labels = [r["texte"] for r in records], [r["label"] for r in records]
+            if "sqlite" in etapes:
+                mesurer_ecriture_sqlite(mesures, n, chemins["shard"][0], travail)
+            if "analyse" in etapes:
+                mesurer_analyse(mesures, n, textes, echantillon)
+            if "classification" in etapes or "rendu" in etapes:
+                confusions = mesurer_classification(mesures, n, textes, labels, names, registre, max_quadratique)
+                if "rendu" in etapes:
+                    mesurer_rendu(mesures, n, confusions, os.path.join(travail, str(n)), n_workers)
+    finally:
+        shutil.rmtree(travail, ignore_errors=True)
+    return {"date": debut, "versions": versions(), "parametres": {"tailles": tailles, "modeles": names, "echantillon": echantillon,
+            "max_quadratique": max_quadratique, "workers": n_workers}, "mesures": mesures.lignes}
+
+# Fonction comparant deux fichiers de résultats : renvoie les étapes ralenties au-delà du seuil (rapport des durées)
+def comparer(resultats, reference, seuil=SEUIL_REGRESSION_DEFAUT):
+    cle = lambda ligne: (ligne["taille"], ligne["format"], ligne["etape"])
+    anciennes = {cle(ligne): ligne for ligne in reference["mesures"] if ligne["duree"] and ligne["duree"] >= DUREE_MIN_COMPARAISON}
+    regressions = []
+    for ligne in resultats["mesures"]:
+        ancienne = anciennes.get(cle(ligne))
+        if ancienne and ligne["duree"] and ligne["duree"] / ancienne["duree"] > seuil:
+            regressions.append((cle(ligne), ancienne["duree"], ligne["duree"], ligne["duree"] / ancienne["duree"]))
+    return regressions
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Mesures de performance de chaque étape sur des corpus synthétiques.")
+    parser.add_argument("--taille", type=int, action="append", help="Nombre de reviews (répétable ; 1000 et 10000 par défaut, jusqu'à 1000000)")
+    parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "corpus_synthetique"),
+                        help="Dossier des corpus synthétiques (réutilisés d'une exécution à l'autre)")
+    parser.add_argument("--sortie", default="benchmark.json", help="Fichier JSON des mesures")
+    parser.add_argument("--modeles", nargs="+", help="Modèles mesurés (sélection par défaut du registre)")
+    parser.add_argument("--config-modeles", help="Fichier JSON complétant le registre des modèles")
+    parser.add_argument("--etape", action="append", choices=["lecture", "sqlite", "analyse", "classification", "rendu"],
+                        help="Étape mesurée (répétable, toutes par défaut)")
+    parser.add_argument("--echantillon", type=int, default=ECHANTILLON_DEFAUT, help="Reviews analysées pour la langue et le sentiment")
+    parser.add_argument("--max-quadratique", type=int, default=MAX_QUADRATIQUE_DEFAUT,
+                        help="Taille d'entraînement au-delà de laquelle les modèles quadratiques (SVM) sont ignorés")
+    parser.add_argument("--workers", type=int, default=1, help="Processus pour le rendu des graphiques")
+    parser.add_argument("--reference", help="Fichier JSON d'une version précédente : signaler les étapes ralenties")
+    parser.add_argument("--seuil", type=float, default=SEUIL_REGRESSION_DEFAUT, help="Rapport des durées signalé comme régression")
+    args = parser.parse_args()
+
+    try:
+        registre, selection = modeles.load_registry(args.config_modeles)
+    except (OSError, ValueError, ImportError) as e:
+        sys.exit(f"Configuration des modèles invalide : {e}")
+    names = args.modeles or selection
+    unknown = [name for name in names if name not in registre]
+    if unknown:
+        sys.exit(f"Modèles inconnus : {', '.join(unknown)}")
+
+    resultats = lancer(args.taille or TAILLES_DEFAUT, args.corpus, names, registre, args.echantillon,
+                       args.max_quadratique, max(1, args.workers), args.etape)
+    with open(args.sortie, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, ensure_ascii=False, indent=2)
+    print(f"Mesures enregistrées dans {args.sortie}")
+
+    if args.reference:
+        with open(args.reference, "r", encoding="utf-8") as f:
+            regressions = comparer(resultats, json.load(f), args.seuil)
+        for (taille, format_, etape), avant, apres, rapport in regressions:
+            print(f"Régression : {taille} {format_ or '-'} {etape} : {avant:.3f} s -> {apres:.3f} s (x{rapport:.2f})")
+        if regressions:
+            sys.exit(1)
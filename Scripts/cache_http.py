@@ -0,0 +1,136 @@
+import os
+import sys
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+
+# Exception levée en mode hors ligne quand une page n'est pas dans le cache
+class CacheMissError(Exception):
+    pass
+
+# Cache disque des réponses de l'API des reviews Steam : une page JSON compressée par clé,
+# un index SQLite (taille, date de création, dernier accès) pour l'expiration (TTL) et l'éviction LRU bornée en taille.
+class ReviewCache:
+    def __init__(self, dossier, ttl=24 * 3600, taille_max=512 * 1024 * 1024, hors_ligne=False):
+        os.makedirs(dossier, exist_ok=True)
+        self.dossier = dossier
+        self.ttl = ttl
+        self.taille_max = taille_max
+        self.hors_ligne = hors_ligne
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(dossier, "index.db"), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entrees (
+                cle TEXT PRIMARY KEY,
+                taille INTEGER,
+                cree REAL,
+                acces REAL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(appid, params): # Fonction calculant la clé d'une page (AppID, langue, curseur, filtres...)
+        brut = json.dumps({"appid": str(appid), "params": {k: str(v) for k, v in params.items()}}, sort_keys=True)
+        return hashlib.sha256(brut.encode("utf-8")).hexdigest()
+
+    def path(self, cle):
+        return os.path.join(self.dossier, cle[:2], cle + ".json.gz")
+
+    def get(self, appid, params): # Fonction renvoyant la page en cache, ou None (absente ou expirée)
+        cle = self.make_key(appid, params)
+        with self.lock:
+            row = self.conn.execute("SELECT cree FROM entrees WHERE cle = ?", (cle,)).fetchone()
+            expired = row is not None and not self.hors_ligne and time.time() - row[0] > self.ttl
+            if row is None or expired or not os.path.exists(self.path(cle)):
+                self.misses += 1
+                if self.hors_ligne:
+                    raise CacheMissError(f"Page absente du cache (mode hors ligne) : AppID {appid}, curseur {params.get('cursor')}")
+                return None
+            self.conn.execute("UPDATE entrees SET acces = ? WHERE cle = ?", (time.time(), cle))
+            self.conn.commit()
+            self.hits += 1
+        try: # Lecture hors du verrou : la page peut avoir été évincée entre-temps par un autre thread
+            with gzip.open(self.path(cle), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, EOFError, ValueError):
+            with self.lock:
+                self.hits -= 1
+                self.misses += 1
+                self.conn.execute("DELETE FROM entrees WHERE cle = ?", (cle,))
+                self.conn.commit()
+            if self.hors_ligne:
+                raise CacheMissError(f"Page illisible dans le cache (mode hors ligne) : AppID {appid}, curseur {params.get('cursor')}")
+            return None
+
+    def put(self, appid, params, data): # Fonction enregistrant une page puis évinçant les entrées les moins récemment utilisées si besoin
+        cle = self.make_key(appid, params)
+        path = self.path(cle)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO entrees VALUES (?, ?, ?, ?)", (cle, os.path.getsize(path), now, now))
+            self.evict()
+            self.conn.commit()
+
+    def evict(self): # Fonction supprimant les entrées les plus anciennement utilisées jusqu'à repasser sous la taille maximale
+        total = self.conn.execute("SELECT COALESCE(SUM(taille), 0) FROM entrees").fetchone()[0]
+        if total <= self.taille_max:
+            return
+        for cle, taille in self.conn.execute("SELECT cle, taille FROM entrees ORDER BY acces").fetchall():
+            if total <= self.taille_max:
+                break
+            if os.path.exists(self.path(cle)):
+                os.remove(self.path(cle))
+            self.conn.execute("DELETE FROM entrees WHERE cle = ?", (cle,))
+            total -= taille
+            self.evictions += 1
+
+    def stats(self): # Fonction renvoyant les compteurs du cache
+        with self.lock:
+            entrees, taille = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM entrees").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entrees": entrees, "taille": taille}
+
+    def clear(self): # Fonction vidant entièrement le cache
+        with self.lock:
+            for (cle,) in self.conn.execute("SELECT cle FROM entrees").fetchall():
+                if os.path.exists(self.path(cle)):
+                    os.remove(self.path(cle))
+            self.conn.execute("DELETE FROM entrees")
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+# Fonction mettant en forme les compteurs du cache
+def format_stats(stats):
+    total = stats["hits"] + stats["misses"]
+    ratio = stats["hits"] / total if total else 0.0
+    return (f"Cache : {stats['hits']} hits, {stats['misses']} misses ({ratio:.0%} de hits), "
+            f"{stats['evictions']} évictions, {stats['entrees']} pages ({stats['taille'] / 1024 / 1024:.1f} Mo)")
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Gestion du cache disque de l'API des reviews Steam.")
+    parser.add_argument("dossier")
+    parser.add_argument("--vider", action="store_true", help="Supprimer toutes les pages en cache")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dossier):
+        sys.exit(f"{args.dossier} n'existe pas.")
+    cache = ReviewCache(args.dossier)
+    if args.vider:
+        cache.clear()
+    print(format_stats(cache.stats()))
+    cache.close()
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+
+import corpus
+import identification_langue
+
+# Cache persistant des langues détectées, partagé par l'analyse de sentiment et les mesures d'évaluation.
+# La langue d'une review est enregistrée sous l'empreinte de son texte, dans une base SQLite placée à côté du corpus
+# (<dossier>/.langues.db, ou <base>.langues.db pour une base de reviews) : une review inchangée n'est détectée qu'une fois.
+# Les langues manquantes sont détectées en une passe par lots (identification_langue.py), de façon déterministe.
+FICHIER_CACHE = ".langues.db"
+DETECTEUR = "ngrammes-1" # Changer de détecteur invalide les langues enregistrées par le précédent
+TAILLE_LOT = 10000
+
+# Fonction détectant la langue d'un texte ; None si indétectable
+def detecter_langue(texte):
+    return identification_langue.identifier_langue(texte)
+
+# Fonction détectant la langue d'un lot de textes
+def detecter_lot(textes):
+    return identification_langue.identifier(textes)
+
+# Fonction calculant la clé d'une review dans le cache (empreinte de son texte)
+def cle_texte(texte):
+    return hashlib.blake2b(texte.encode("utf-8"), digest_size=16).digest()
+
+# Fonction renvoyant le chemin d'un cache placé à côté d'un corpus (arborescence, corpus shard ou base de reviews)
+def chemin_cache(root, fichier=FICHIER_CACHE):
+    if os.path.isdir(root):
+        return os.path.join(root, fichier)
+    return os.path.splitext(root)[0] + fichier
+
+# Fonction ouvrant le cache des langues et créant sa table
+def ouvrir_cache(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS langues (
+            cle BLOB,
+            detecteur TEXT,
+            langue TEXT,
+            PRIMARY KEY (cle, detecteur)
+        ) WITHOUT ROWID
+    """)
+    return conn
+
+# Fonction renvoyant la langue de chaque review d'une sélection du corpus ({clé du texte: langue}, chaîne vide si indéterminable) :
+# les langues absentes du cache sont détectées par lots puis enregistrées. Renvoie aussi le nombre de reviews détectées.
+def langues_corpus(root, tranches=None, path=None):
+    conn = ouvrir_cache(path or chemin_cache(root))
+    langues = dict(conn.execute("SELECT cle, langue FROM langues WHERE detecteur = ?", (DETECTEUR,)))
+    selection = {}
+    manquantes = {}
+    for review in corpus.iter_reviews(root, tranches):
+        cle = cle_texte(review["texte"])
+        if cle in langues:
+            selection[cle] = langues[cle]
+        elif cle not in manquantes:
+            manquantes[cle] = review["texte"]
+
+    cles = list(manquantes)
+    for debut in range(0, len(cles), TAILLE_LOT): # Un lot par transaction : une passe interrompue garde les lots terminés
+        lot = cles[debut:debut + TAILLE_LOT]
+        detectees = detecter_lot([manquantes[cle] for cle in lot])
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO langues (cle, detecteur, langue) VALUES (?, ?, ?)",
+                             [(cle, DETECTEUR, langue) for cle, langue in zip(lot, detectees)])
+        selection.update(zip(lot, detectees))
+    conn.close()
+    for cle, langue in selection.items():
+        if langue is None:
+            selection[cle] = ""
+    return selection, len(cles)
+
+if __name__ == "__main__": # Lancement en ligne de commande : détection des langues manquantes d'un corpus
+    parser = argparse.ArgumentParser(description="Détection (une seule fois) des langues des reviews d'un corpus.")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, toutes par défaut)")
+    parser.add_argument("--cache", help=f"Base du cache (par défaut {FICHIER_CACHE} à côté du corpus)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    start = time.perf_counter()
+    langues, detectees = langues_corpus(args.corpus, args.tranche, args.cache)
+    repartition = {}
+    for langue in langues.values():
+        repartition[langue] = repartition.get(langue, 0) + 1
+    print(f"{len(langues)} reviews, {detectees} détectées, {len(langues) - detectees} lues dans le cache, en {time.perf_counter() - start:.2f} s")
+    print(", ".join(f"{langue or 'indéterminée'} : {nombre}" for langue, nombre in sorted(repartition.items(), key=lambda x: -x[1])))
@@ -0,0 +1,69 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+import cache_langues
+
+# Scores de sentiment de chaque review, conservés d'une analyse à l'autre dans une base SQLite placée à côté du corpus
+# (<dossier>/.sentiments.db, ou <base>.sentiments.db pour une base de reviews). Un score est enregistré sous l'empreinte
+# du texte de la review (cache_langues.cle_texte), le nom de l'analyseur qui l'a calculé et la version de celui-ci :
+# une nouvelle analyse ne calcule que les reviews nouvelles ou modifiées, et une mise à jour d'un analyseur
+# invalide ses seuls scores. Les moyennes par jeu sont recalculées à partir des scores enregistrés.
+FICHIER_CACHE = ".sentiments.db"
+
+# Fonction ouvrant le cache des scores et créant sa table
+def ouvrir_cache(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scores (
+            cle BLOB,
+            analyseur TEXT,
+            version TEXT,
+            langue TEXT,
+            score REAL,
+            PRIMARY KEY (cle, analyseur, version)
+        ) WITHOUT ROWID
+    """)
+    return conn
+
+# Fonction renvoyant les scores enregistrés par les versions courantes des analyseurs : {(clé du texte, analyseur): score}
+def lire_scores(conn, versions):
+    scores = {}
+    for cle, analyseur, version, score in conn.execute("SELECT cle, analyseur, version, score FROM scores"):
+        if versions.get(analyseur) == version:
+            scores[(cle, analyseur)] = score
+    return scores
+
+# Fonction enregistrant des scores [(clé du texte, analyseur, version, langue, score)]
+def enregistrer(conn, lignes):
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO scores (cle, analyseur, version, langue, score) VALUES (?, ?, ?, ?, ?)", lignes)
+
+# Fonction supprimant les scores calculés par d'anciennes versions des analyseurs ; renvoie le nombre de lignes supprimées
+def purger(conn, versions):
+    with conn:
+        supprimees = 0
+        for analyseur, version in conn.execute("SELECT DISTINCT analyseur, version FROM scores").fetchall():
+            if versions.get(analyseur) != version:
+                supprimees += conn.execute("DELETE FROM scores WHERE analyseur = ? AND version = ?", (analyseur, version)).rowcount
+    return supprimees
+
+if __name__ == "__main__": # Lancement en ligne de commande : état du cache des scores d'un corpus
+    import moteur_sentiment
+    parser = argparse.ArgumentParser(description="Cache des scores de sentiment par review (à côté du corpus).")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--purger", action="store_true", help="Supprimer les scores des anciennes versions des analyseurs")
+    args = parser.parse_args()
+
+    path = cache_langues.chemin_cache(args.corpus, FICHIER_CACHE)
+    if not os.path.exists(path):
+        sys.exit(f"Aucun score enregistré pour {args.corpus}.")
+    conn = ouvrir_cache(path)
+    versions = moteur_sentiment.versions_analyseurs()
+    if args.purger:
+        print(f"{purger(conn, versions)} scores d'anciennes versions supprimés")
+    for analyseur, version, nombre in conn.execute("SELECT analyseur, version, COUNT(*) FROM scores GROUP BY analyseur, version"):
+        etat = "courante" if versions.get(analyseur) == version else "ancienne"
+        print(f"{analyseur:<12} {version:<32} {nombre:>9} scores ({etat})")
+    conn.close()
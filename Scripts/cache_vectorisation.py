@@ -0,0 +1,100 @@
+import os
+import json
+import shutil
+import hashlib
+
+import corpus
+
+# Cache adressé par le contenu du TfidfVectorizer ajusté et de la matrice transformée :
+# la clé est l'empreinte de la sélection du corpus (fichiers, tranches, taille minimale) et des paramètres du vectoriseur.
+# Chaque entrée est un dossier <clé>/ (vectorizer.joblib, X.npz, y.npy, stats.json), évincé du moins récemment utilisé au plus récent.
+DOSSIER_CACHE_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "reviews", "vectorisation")
+TAILLE_MAX_DEFAUT = 2 * 1024 * 1024 * 1024
+
+class VectorizationCache:
+    def __init__(self, dossier=DOSSIER_CACHE_DEFAUT, taille_max=TAILLE_MAX_DEFAUT):
+        os.makedirs(dossier, exist_ok=True)
+        self.dossier = dossier
+        self.taille_max = taille_max
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(fingerprint, tranches, min_size, params): # Fonction calculant la clé d'une vectorisation
+        brut = json.dumps({
+            "corpus": fingerprint,
+            "tranches": sorted(tranches) if tranches is not None else None,
+            "min_size": min_size,
+            "params": {k: repr(v) for k, v in sorted(params.items())}
+        }, sort_keys=True)
+        return hashlib.sha256(brut.encode("utf-8")).hexdigest()
+
+    def load(self, key): # Fonction renvoyant (vectorizer, X, y, stats) ou None si la vectorisation n'est pas en cache
+        import joblib
+        import numpy as np
+        from scipy.sparse import load_npz
+        entry = os.path.join(self.dossier, key)
+        try:
+            vectorizer = joblib.load(os.path.join(entry, "vectorizer.joblib"))
+            X = load_npz(os.path.join(entry, "X.npz"))
+            y = np.load(os.path.join(entry, "y.npy"))
+            with open(os.path.join(entry, "stats.json"), "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, ValueError, EOFError):
+            self.misses += 1
+            return None
+        os.utime(entry) # Date d'accès pour l'éviction LRU
+        self.hits += 1
+        return vectorizer, X, y, stats
+
+    def store(self, key, vectorizer, X, y, stats): # Fonction enregistrant une vectorisation (écrite à part puis renommée)
+        import joblib
+        import numpy as np
+        from scipy.sparse import save_npz
+        entry = os.path.join(self.dossier, key)
+        tmp = entry + f".{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        joblib.dump(vectorizer, os.path.join(tmp, "vectorizer.joblib"))
+        save_npz(os.path.join(tmp, "X.npz"), X.tocsr())
+        np.save(os.path.join(tmp, "y.npy"), np.asarray(y))
+        with open(os.path.join(tmp, "stats.json"), "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self.evict()
+
+    def evict(self): # Fonction supprimant les entrées les moins récemment utilisées au-delà de la taille maximale
+        entries = []
+        for name in os.listdir(self.dossier):
+            path = os.path.join(self.dossier, name)
+            if not os.path.isdir(path) or name.endswith(".tmp"):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries)[:-1]: # La plus récente est toujours conservée
+            if total <= self.taille_max:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+# Fonction renvoyant (vectorizer, X_vect, y, stats, depuis_le_cache) pour une sélection du corpus,
+# en ne relisant et ne revectorisant les textes que si la sélection, les fichiers ou les paramètres ont changé.
+def vectorize_corpus(root, tranches, min_size, make_vectorizer, load_texts, cache=None):
+    import numpy as np
+    vectorizer = make_vectorizer()
+    key = None
+    if cache is not None:
+        key = cache.make_key(corpus.empreinte(root, tranches), tranches, min_size, vectorizer.get_params())
+        cached = cache.load(key)
+        if cached is not None:
+            return (*cached, True)
+
+    X, y, stats = load_texts()
+    if len(X) == 0:
+        return vectorizer, None, np.asarray(y), stats, False
+    X_vect = vectorizer.fit_transform(X)
+    if cache is not None:
+        cache.store(key, vectorizer, X_vect, y, stats)
+    return vectorizer, X_vect, np.asarray(y), stats, False
@@ -0,0 +1,368 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tracemalloc
+
+import corpus
+import modeles
+import rendu_graphiques
+
+# Comparaison des classifieurs sans interface graphique : utilisée par analyse_classifieurs.py et en ligne de commande.
+# Les bibliothèques lourdes (scikit-learn, scipy) ne sont importées que par l'étape qui s'en sert ;
+# les graphiques sont décrits dans la base de résultats et dessinés par rendu_graphiques.py.
+MAX_FEATURES = 5000
+
+# Fonction chargeant les données à classifier
+def load_data(root, tranches, min_size=1):
+    X, y = [], []
+    stats = corpus.nouvelles_stats()
+    for review in corpus.iter_reviews(root, tranches, min_size, stats):
+        X.append(review["texte"])
+        y.append(review["label"])
+    return X, y, stats
+
+# Fonction vectorisant la sélection par le TF-IDF (réutilisée depuis le cache si la sélection et les fichiers n'ont pas changé)
+def vectorize(root, tranches, min_size, cache=None):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from cache_vectorisation import vectorize_corpus
+    vectorizer, X_vect, y, stats, from_cache = vectorize_corpus(
+        root, tranches, min_size,
+        lambda: TfidfVectorizer(max_features=MAX_FEATURES),
+        lambda: load_data(root, tranches, min_size),
+        cache
+    )
+    stats["vectorisation"] = "cache" if from_cache else "calculée"
+    return vectorizer, X_vect, y, stats
+
+# Fonction entraînant les modèles sur la matrice TF-IDF complète en mémoire.
+# Renvoie les rapports, les matrices de confusion, les statistiques et ce qu'il faut pour enregistrer le meilleur pipeline.
+def run_in_memory(root, tranches, min_size, names, registre=modeles.REGISTRE, oversampling=True, n_workers=1, cache=None):
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import confusion_matrix
+    from entrainement import oversample, matrix_sizes, train_models
+
+    vectorizer, X_vect, y, stats = vectorize(root, tranches, min_size, cache)
+    if X_vect is None or X_vect.shape[0] < 10:
+        return None, None, stats, None
+    last_run = {"vectorizer": vectorizer, "X": X_vect, "y": y}
+
+    X_train, X_test, y_train, y_test = train_test_split(X_vect, y, test_size=0.2, random_state=42) # Séparation des données d'entrainement et de test. (ici, 80% train, 20% test)
+
+    if oversampling: # Oversampling (au cas où une classe à évaluer est clairement minoritaire, ici les avis négatifs)
+        tracemalloc.start() # Pic mémoire de l'oversampling seul (l'entraînement n'est pas tracé : durées non faussées, workers hors mesure)
+        X_train, y_train = oversample(X_train, y_train)
+        _, stats["pic_memoire"] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # Modèles évalués (pas de sur-allocation des cœurs par les modèles parallélisés en mode parallèle)
+    models = modeles.create_models(names, registre, n_jobs=1 if n_workers > 1 else None)
+
+    results, predictions, timings, wall_time, cpu_time = train_models(
+        models, X_train, y_train, X_test, y_test, n_workers, modeles.dense_models(names, registre)
+    )
+    stats["durees"], stats["duree_reelle"], stats["duree_cpu"] = timings, wall_time, cpu_time
+
+    stats["taille_creuse"], stats["taille_dense"] = matrix_sizes(X_train)
+
+    confusions = {name: confusion_matrix(y_test, y_pred, labels=[0, 1]) for name, y_pred in predictions.items()}
+    return results, confusions, stats, last_run
+
+# Fonction évaluant les modèles par validation croisée stratifiée (plis × modèles en parallèle)
+def run_cross_validation(root, tranches, min_size, names, n_folds, registre=modeles.REGISTRE, oversampling=True, n_workers=1, cache=None):
+    import numpy as np
+    from entrainement import cross_validate_models
+
+    vectorizer, X_vect, y, stats = vectorize(root, tranches, min_size, cache)
+    if X_vect is None or X_vect.shape[0] < 10 or np.bincount(y, minlength=2).min() < n_folds:
+        return None, None, stats, None
+    last_run = {"vectorizer": vectorizer, "X": X_vect, "y": y}
+
+    models = modeles.create_models(names, registre, n_jobs=1 if n_workers > 1 else None)
+    fold_results, summary, confusions, wall_time, cpu_time = cross_validate_models(
+        models, X_vect, y, n_folds, oversampling, n_workers, dense=modeles.dense_models(names, registre)
+    )
+    results = {name: {metric: mean for metric, (mean, _) in scores.items()} for name, scores in summary.items()}
+    stats["cv_k"], stats["cv_resume"], stats["cv_plis"] = n_folds, summary, fold_results
+    stats["durees"] = {name: {t: sum(r[t] for r in fold_results if r["modele"] == name) for t in ("fit", "predict", "cpu")} for name in models}
+    stats["duree_reelle"], stats["duree_cpu"] = wall_time, cpu_time
+    return results, confusions, stats, last_run
+
+# Fonction entraînant les modèles incrémentaux en lisant le corpus par paquets (mémoire bornée)
+def run_streaming(root, tranches, min_size, names, registre=modeles.REGISTRE, oversampling=True):
+    from sklearn.pipeline import Pipeline
+    from entrainement_flux import train_streaming, make_hashing_vectorizer
+
+    start = time.perf_counter()
+    models = modeles.create_models(modeles.streaming_capable(names, registre), registre)
+    results, confusions, timings, stats = train_streaming(root, tranches, min_size, oversampling, models=models)
+    stats["vectorisation"] = "HashingVectorizer (flux)"
+    if stats["train"] < 10 or stats["test"] == 0:
+        return None, None, stats, None
+    # Les modèles ont été entraînés sur tout le flux : ils sont enregistrables tels quels avec le vectoriseur sans état
+    last_run = {"pipelines": {name: Pipeline([("vectorisation", make_hashing_vectorizer()), ("modele", model)])
+                              for name, model in models.items()}}
+    for name, timing in timings.items():
+        timing["cpu"] = timing["fit"] + timing["predict"]
+    stats["durees"] = timings
+    stats["duree_reelle"] = time.perf_counter() - start
+    stats["duree_cpu"] = sum(t["cpu"] for t in timings.values())
+    return results, confusions, stats, last_run
+
+# Fonction réglant les modèles sur 80 % des reviews puis évaluant le meilleur réglage sur les 20 % restants
+# (n_jobs : processus de la recherche successive par moitiés, -1 = tous les cœurs)
+def run_tuning(root, tranches, min_size, names, registre=modeles.REGISTRE, n_jobs=-1):
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import classification_report, confusion_matrix
+    from recherche_hyperparametres import hyperparameter_search
+
+    X, y, stats = load_data(root, tranches, min_size)
+    stats["vectorisation"] = "TF-IDF réglé par modèle"
+    if len(X) < 30 or len(set(y)) < 2:
+        return None, None, stats, None
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    start = time.perf_counter()
+    best, trace, searches = hyperparameter_search(names, X_train, y_train, registre, n_jobs=n_jobs)
+
+    results, confusions = {}, {}
+    for name, search in searches.items():
+        y_pred = search.best_estimator_.predict(X_test)
+        results[name] = classification_report(y_test, y_pred, output_dict=True, zero_division=0)['weighted avg']
+        confusions[name] = confusion_matrix(y_test, y_pred, labels=[0, 1])
+    stats["reglage"], stats["reglage_trace"] = best, trace
+    last_run = {"pipelines": {name: search.best_estimator_.set_params(memory=None) for name, search in searches.items()}}
+    stats["durees"] = {name: {"fit": b["fit"], "predict": b["predict"], "cpu": b["fit"] + b["predict"]} for name, b in best.items()}
+    stats["duree_reelle"] = time.perf_counter() - start
+    stats["duree_cpu"] = sum(t["cpu"] for t in stats["durees"].values())
+    return results, confusions, stats, last_run
+
+# Fonction sauvegardant les informations dans une base de données ; renvoie son chemin
+def save_results_to_db(output_dir, results, stats=None):
+    db_path = os.path.join(output_dir, "resultats_classifieurs.db")
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS performances (
+            modele TEXT,
+            precision REAL,
+            rappel REAL,
+            f1 REAL
+        )
+    """)
+    c.execute("DELETE FROM performances")
+    for model, scores in results.items():
+        c.execute("INSERT INTO performances VALUES (?, ?, ?, ?)",
+                  (model, scores['precision'], scores['recall'], scores['f1-score']))
+    if stats and "cv_plis" in stats: # Validation croisée : moyenne ± écart-type et détail par pli
+        save_cross_validation_to_db(c, stats)
+    if stats and "reglage" in stats: # Réglage : meilleure configuration et trace de la recherche
+        from recherche_hyperparametres import save_search_to_db
+        save_search_to_db(c, stats["reglage"], stats["reglage_trace"])
+    conn.commit()
+    conn.close()
+    return db_path
+
+# Fonction enregistrant les résultats de la validation croisée
+def save_cross_validation_to_db(c, stats):
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS performances_cv (
+            modele TEXT,
+            plis INTEGER,
+            precision_moy REAL,
+            precision_std REAL,
+            rappel_moy REAL,
+            rappel_std REAL,
+            f1_moy REAL,
+            f1_std REAL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS plis_cv (
+            modele TEXT,
+            pli INTEGER,
+            precision REAL,
+            rappel REAL,
+            f1 REAL,
+            duree_fit REAL,
+            duree_predict REAL
+        )
+    """)
+    c.execute("DELETE FROM performances_cv")
+    c.execute("DELETE FROM plis_cv")
+    for model, scores in stats["cv_resume"].items():
+        c.execute("INSERT INTO performances_cv VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                  (model, stats["cv_k"], *scores["precision"], *scores["recall"], *scores["f1-score"]))
+    for r in stats["cv_plis"]:
+        c.execute("INSERT INTO plis_cv VALUES (?, ?, ?, ?, ?, ?, ?)",
+                  (r["modele"], r["pli"], r["precision"], r["recall"], r["f1-score"], r["fit"], r["predict"]))
+
+# Fonction sauvegardant les résultats dans un fichier txt.
+def save_results_to_txt(output_dir, results, stats):
+    txt_path = os.path.join(output_dir, "resultats_classifieurs.txt")
+    with open(txt_path, "w", encoding="utf-8") as f:
+        for model, scores in results.items():
+            f.write(f"Modèle : {model}\n")
+            for metric, value in scores.items():
+                f.write(f"  {metric} : {value:.4f}\n")
+            f.write("\n")
+        f.write("Statistiques sur les fichiers :\n")
+        f.write(f"  Fichiers totaux trouvés : {stats['total']}\n")
+        f.write(f"  Fichiers ignorés (pas de Note) : {stats['ignored_no_note']}\n")
+        f.write(f"  Fichiers ignorés (trop court) : {stats['ignored_short']}\n")
+        f.write(f"  Fichiers ignorés (pas 'review_') : {stats['ignored_not_review']}\n")
+        f.write(f"  Fichiers utilisés réellement : {stats['used']}\n")
+        if "vectorisation" in stats:
+            f.write(f"  Vectorisation : {stats['vectorisation']}\n")
+        if "taille_creuse" in stats:
+            f.write("\nMémoire :\n")
+            if "pic_memoire" in stats:
+                f.write(f"  Pic mémoire de l'oversampling (processus principal) : {stats['pic_memoire'] / 1024 / 1024:.1f} Mo\n")
+            f.write(f"  Matrice d'entraînement creuse (CSR) : {stats['taille_creuse'] / 1024 / 1024:.1f} Mo\n")
+            f.write(f"  Même matrice densifiée (float64) : {stats['taille_dense'] / 1024 / 1024:.1f} Mo\n")
+        if "cv_resume" in stats:
+            f.write(f"\nValidation croisée stratifiée ({stats['cv_k']} plis, moyenne ± écart-type) :\n")
+            for model, scores in stats["cv_resume"].items():
+                f.write(f"  {model} : " + ", ".join(f"{metric} {m:.4f} ± {sd:.4f}" for metric, (m, sd) in scores.items()) + "\n")
+        if "reglage" in stats:
+            f.write("\nRéglage des hyperparamètres (successive halving, f1 en validation croisée) :\n")
+            for model, best in stats["reglage"].items():
+                f.write(f"  {model} : f1 {best['f1']:.4f} ({best['candidats']} candidats, {best['tours']} tours, {best['duree']:.1f} s)\n")
+                f.write(f"    {best['parametres']}\n")
+        if "train" in stats:
+            f.write(f"  Reviews d'entraînement (flux) : {stats['train']}\n")
+            f.write(f"  Reviews de test (flux) : {stats['test']}\n")
+        if "durees" in stats:
+            f.write("\nTemps d'exécution :\n")
+            for model, durees in stats["durees"].items():
+                f.write(f"  {model} : entraînement {durees['fit']:.2f} s, prédiction {durees['predict']:.2f} s, CPU {durees['cpu']:.2f} s\n")
+            f.write(f"  Durée réelle totale : {stats['duree_reelle']:.2f} s\n")
+            f.write(f"  Temps CPU cumulé : {stats['duree_cpu']:.2f} s\n")
+    return txt_path
+
+# Fonction décrivant le graphique de la matrice de confusion d'un modèle (voir rendu_graphiques.py)
+def confusion_matrix_spec(output_dir, name, cm):
+    return {"type": "heatmap", "fichier": os.path.join(output_dir, f"matrice_confusion_{name}.png"), "taille": [6, 5],
+            "matrice": [[int(v) for v in row] for row in cm], "etiquettes": ['Négatif', 'Positif'],
+            "legende_barre": "Nombre de prédictions", "titre": f"Matrice de confusion - {name}", "axe_x": "Prédit", "axe_y": "Réel"}
+
+# Fonction décrivant le graphique comparant les mesures d'évaluations des modèles analysés
+def comparison_plot_spec(output_dir, results):
+    return {"type": "lignes", "fichier": os.path.join(output_dir, "comparaison_classifieurs.png"), "taille": [8, 5],
+            "etiquettes": list(results.keys()), "ylim": [0, 1], "titre": "Performance des classifieurs",
+            "series": {metric: [float(results[model][metric]) for model in results] for metric in ["precision", "recall", "f1-score"]}}
+
+# Fonction enregistrant le pipeline (vectoriseur + modèle) ayant le meilleur f1-score
+def save_best_pipeline(output_dir, results, stats, tranches, last_run, registre=modeles.REGISTRE, oversampling=True):
+    from sklearn.pipeline import Pipeline
+    from prediction import save_pipeline
+
+    best = max(results, key=lambda name: results[name]["f1-score"])
+    if "pipelines" in last_run:
+        pipeline = last_run["pipelines"][best]
+    else: # Modèle final réentraîné sur toutes les reviews sélectionnées, avec le vectoriseur déjà ajusté
+        from sklearn.preprocessing import FunctionTransformer
+        from entrainement import oversample
+        from recherche_hyperparametres import densify
+        X, y = last_run["X"], last_run["y"]
+        if oversampling:
+            X, y = oversample(X, y)
+        steps = [("vectorisation", last_run["vectorizer"])]
+        if best in modeles.dense_models([best], registre):
+            steps.append(("dense", FunctionTransformer(densify, accept_sparse=True)))
+        steps.append(("modele", modeles.create_models([best], registre)[best]))
+        pipeline = Pipeline(steps)
+        pipeline[1:].fit(X, y)
+
+    metadata = {"modele": best, "tranches": tranches, "reviews": stats["used"], "vectorisation": stats["vectorisation"],
+                "oversampling": oversampling, "labels": {"0": "négatif", "1": "positif"}}
+    metadata.update({metric: results[best][metric] for metric in ("precision", "recall", "f1-score")})
+    if "reglage" in stats:
+        metadata["parametres"] = stats["reglage"][best]["parametres"]
+    return save_pipeline(pipeline, output_dir, metadata)
+
+# Fonction lançant une comparaison complète (mode réglage, flux, validation croisée ou découpage 80/20)
+# et écrivant ses résultats (base, txt, graphiques, meilleur pipeline) dans output_dir.
+# Renvoie (None, None, stats, None) s'il n'y a pas assez de données. Le mode réglage a son propre parallélisme (n_jobs_reglage).
+def compare(root, tranches, output_dir, names, registre=modeles.REGISTRE, min_size=1, oversampling=True, n_workers=1,
+            n_folds=0, streaming=False, tuning=False, cache=None, n_jobs_reglage=-1):
+    if tuning:
+        results, confusions, stats, last_run = run_tuning(root, tranches, min_size, names, registre, n_jobs_reglage)
+    elif streaming:
+        results, confusions, stats, last_run = run_streaming(root, tranches, min_size, names, registre, oversampling)
+    elif n_folds >= 2:
+        results, confusions, stats, last_run = run_cross_validation(root, tranches, min_size, names, n_folds, registre, oversampling, n_workers, cache)
+    else:
+        results, confusions, stats, last_run = run_in_memory(root, tranches, min_size, names, registre, oversampling, n_workers, cache)
+    if results is None:
+        return None, None, stats, None
+
+    os.makedirs(output_dir, exist_ok=True)
+    db_path = save_results_to_db(output_dir, results, stats) # Enregistrement des résultats dans la DB
+    save_results_to_txt(output_dir, results, stats) # Enregistrement des résultats dans le fichier txt
+    # Matrices de confusion et graphique de comparaison, dessinés hors écran en parallèle (inchangés : non redessinés)
+    specs = [confusion_matrix_spec(output_dir, name, cm) for name, cm in confusions.items()]
+    specs.append(comparison_plot_spec(output_dir, results))
+    stats["graphiques"] = rendu_graphiques.render(db_path, specs)
+    pipeline_path = save_best_pipeline(output_dir, results, stats, tranches, last_run, registre, oversampling) # Voir prediction.py
+    return results, confusions, stats, pipeline_path
+
+# Fonction résumant une analyse (fichiers utilisés, mémoire, durées)
+def format_summary(stats):
+    message = f"Fichiers utilisés : {stats['used']} (vectorisation : {stats['vectorisation']})\nIgnorés (trop courts) : {stats['ignored_short']}\nIgnorés (pas de Note) : {stats['ignored_no_note']}\nIgnorés (pas 'review_') : {stats['ignored_not_review']}"
+    if "taille_creuse" in stats:
+        message += f"\nMatrice d'entraînement : {stats['taille_creuse'] / 1024 / 1024:.1f} Mo (densifiée : {stats['taille_dense'] / 1024 / 1024:.1f} Mo)"
+    if "pic_memoire" in stats:
+        message += f"\nPic mémoire de l'oversampling : {stats['pic_memoire'] / 1024 / 1024:.1f} Mo"
+    message += f"\nDurée réelle : {stats['duree_reelle']:.2f} s / temps CPU cumulé : {stats['duree_cpu']:.2f} s"
+    if "graphiques" in stats:
+        dessines, inchanges, duree = stats["graphiques"]
+        message += f"\nGraphiques : {dessines} dessinés, {inchanges} inchangés ({duree:.2f} s)"
+    return message
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Comparaison de classifieurs sur les reviews (sans interface graphique).")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, toutes par défaut)")
+    parser.add_argument("--sortie", default=".", help="Dossier des résultats")
+    parser.add_argument("--taille-min", type=int, default=1, help="Taille minimale des reviews")
+    parser.add_argument("--modeles", help="Modèles comparés, séparés par des virgules (sélection par défaut du registre)")
+    parser.add_argument("--config-modeles", help="Fichier JSON complétant le registre des modèles")
+    parser.add_argument("--workers", type=int, default=1, help="Processus parallèles (1 = séquentiel)")
+    parser.add_argument("--plis", type=int, default=0, help="Validation croisée stratifiée (nombre de plis, 0 = découpage 80/20)")
+    parser.add_argument("--sans-oversampling", action="store_true")
+    parser.add_argument("--flux", action="store_true", help="Mode flux (HashingVectorizer + partial_fit)")
+    parser.add_argument("--reglage", action="store_true", help="Mode réglage des hyperparamètres")
+    parser.add_argument("--jobs-reglage", type=int, default=-1, help="Processus de la recherche d'hyperparamètres (-1 = tous les cœurs)")
+    parser.add_argument("--sans-cache", action="store_true", help="Ne pas utiliser le cache des vectorisations")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    try:
+        registre, selection = modeles.load_registry(args.config_modeles)
+    except (OSError, ValueError, ImportError, AttributeError) as e:
+        sys.exit(f"Configuration des modèles invalide : {e}")
+    names = args.modeles.split(",") if args.modeles else selection
+    unknown = [name for name in names if name not in registre]
+    if unknown:
+        sys.exit(f"Modèles inconnus : {', '.join(unknown)}")
+    if args.flux and not args.reglage and not modeles.streaming_capable(names, registre):
+        sys.exit("Aucun des modèles sélectionnés ne supporte l'entraînement par paquets (partial_fit sur matrices creuses).")
+
+    tranches = args.tranche or sorted(corpus.compter_par_tranche(args.corpus))
+    cache = None
+    if not args.sans_cache:
+        from cache_vectorisation import VectorizationCache
+        cache = VectorizationCache()
+    results, _, stats, pipeline_path = compare(
+        args.corpus, tranches, args.sortie, names, registre, args.taille_min, not args.sans_oversampling,
+        max(1, args.workers), args.plis, args.flux, args.reglage, cache, args.jobs_reglage
+    )
+    if results is None:
+        sys.exit("Pas assez de données pour entraîner les modèles.")
+    for name, scores in results.items():
+        print(f"{name:<24} precision {scores['precision']:.4f}  recall {scores['recall']:.4f}  f1 {scores['f1-score']:.4f}")
+    print(format_summary(stats))
+    print(f"Résultats dans {args.sortie} ; meilleur pipeline : {pipeline_path}")
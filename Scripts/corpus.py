@@ -0,0 +1,229 @@
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+from collections import Counter
+
+import corpus_shard
+
+# Manifeste du corpus : un seul parcours (os.scandir) de data/<tranche>/<jeu>/*.txt, enregistré dans le dossier racine.
+# Lors des chargements suivants, chaque dossier de jeu est parcouru mais seuls les fichiers dont la taille ou la date de
+# modification a changé sont relus (une review réécrite sur place ne change pas la date de son dossier).
+FICHIER_MANIFESTE = ".manifeste_corpus.json"
+VERSION_MANIFESTE = 2
+MOTIF_TRANCHE = re.compile(r"^\d{1,3}-\d{1,3}$")
+
+# Fonction lisant une review : renvoie (label, longueur du contenu) sans garder le texte
+def analyser_fichier(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        entete = f.readline()
+        contenu = f.read().strip()
+    if not entete.startswith("Note"):
+        return None, len(contenu)
+    return (1 if "👍" in entete else 0), len(contenu)
+
+# Fonction (re)construisant les entrées d'un dossier de jeu, en réutilisant celles des fichiers inchangés
+def scanner_jeu(root, tranche, jeu, jeu_path, anciennes):
+    anciennes = {e["fichier"]: e for e in anciennes}
+    entrees = []
+    with os.scandir(jeu_path) as it:
+        for entry in it:
+            if not entry.name.endswith(".txt") or not entry.is_file():
+                continue
+            st = entry.stat()
+            ancienne = anciennes.get(entry.name)
+            if ancienne and ancienne["taille"] == st.st_size and ancienne["mtime"] == st.st_mtime_ns:
+                entrees.append(ancienne)
+                continue
+
+            est_review = entry.name.startswith("review_")
+            label, longueur = analyser_fichier(entry.path) if est_review else (None, 0)
+            entrees.append({
+                "chemin": os.path.relpath(entry.path, root),
+                "tranche": tranche,
+                "jeu": jeu,
+                "fichier": entry.name,
+                "review": est_review,
+                "label": label,
+                "longueur": longueur,
+                "taille": st.st_size,
+                "mtime": st.st_mtime_ns
+            })
+    return entrees
+
+# Fonction chargeant le manifeste d'un corpus (revalidé dossier par dossier) et le réenregistrant s'il a changé
+def charger_manifeste(root):
+    manifest_path = os.path.join(root, FICHIER_MANIFESTE)
+    dossiers = {}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == VERSION_MANIFESTE:
+                dossiers = data["dossiers"]
+        except (OSError, ValueError, KeyError):
+            dossiers = {}
+
+    nouveaux, modifie = {}, False
+    with os.scandir(root) as tranches:
+        for tranche in tranches:
+            if not MOTIF_TRANCHE.match(tranche.name) or not tranche.is_dir():
+                continue
+            nouveaux.setdefault(tranche.name, {})
+            with os.scandir(tranche.path) as jeux:
+                for jeu in jeux:
+                    if not jeu.is_dir():
+                        continue
+                    cle = f"{tranche.name}/{jeu.name}"
+                    anciennes = dossiers.get(cle, {}).get("fichiers", [])
+                    entrees = scanner_jeu(root, tranche.name, jeu.name, jeu.path, anciennes)
+                    nouveaux[cle] = {"fichiers": entrees}
+                    modifie = modifie or entrees != anciennes
+
+    # Les clés "tranche" seules (sans "/") gardent la trace des tranches vides
+    if modifie or set(nouveaux) != set(dossiers):
+        try:
+            tmp_path = manifest_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": VERSION_MANIFESTE, "dossiers": nouveaux}, f, ensure_ascii=False)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            print(f"Impossible d'enregistrer le manifeste : {e}")
+
+    return nouveaux
+
+# Fonction renvoyant toutes les entrées (fichiers .txt) du manifeste, éventuellement filtrées par tranche
+def lister_entrees(root, tranches=None):
+    tranches = set(tranches) if tranches is not None else None
+    entrees = []
+    for cle, dossier in sorted(charger_manifeste(root).items()):
+        if "/" not in cle:
+            continue
+        for entree in dossier["fichiers"]:
+            if tranches is None or entree["tranche"] in tranches:
+                entrees.append(entree)
+    return entrees
+
+# Fonction indiquant si la source est une base SQLite remplie par BDD_reviews.py
+def est_bdd_reviews(root):
+    return os.path.isfile(root) and root.endswith(".db")
+
+# Fonction comptant les reviews par tranche Metacritic (arborescence, corpus shard ou base SQLite)
+def compter_par_tranche(root):
+    if est_bdd_reviews(root):
+        import BDD_reviews
+        return Counter(BDD_reviews.compter_par_tranche(root))
+    if corpus_shard.est_corpus_shard(root):
+        return corpus_shard.compter_par_tranche(root)
+    counts = Counter({cle: 0 for cle in charger_manifeste(root) if "/" not in cle})
+    for entree in lister_entrees(root):
+        if entree["review"]:
+            counts[entree["tranche"]] += 1
+    return counts
+
+# Fonction calculant l'empreinte du contenu d'une sélection du corpus : chemin, taille et date de chaque fichier (relevées à
+# chaque appel, voir charger_manifeste), label et longueur de chaque review. Elle change dès qu'un fichier de la sélection est
+# ajouté, supprimé ou modifié, même réécrit sur place.
+def empreinte(root, tranches=None):
+    h = hashlib.sha256()
+    if est_bdd_reviews(root) or corpus_shard.est_corpus_shard(root):
+        fichiers = [root] if est_bdd_reviews(root) else corpus_shard.lister_shards(root)
+        for path in fichiers:
+            st = os.stat(path)
+            h.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+        h.update(json.dumps(sorted(tranches) if tranches is not None else None).encode("utf-8"))
+    else:
+        for entree in lister_entrees(root, tranches):
+            h.update(f"{entree['chemin']}|{entree['taille']}|{entree['mtime']}|{entree['label']}|{entree['longueur']}\n".encode("utf-8"))
+    return h.hexdigest()
+
+# Fonction renvoyant un dictionnaire de statistiques de lecture vide
+def nouvelles_stats():
+    return {"total": 0, "ignored_no_note": 0, "ignored_short": 0, "ignored_not_review": 0, "used": 0}
+
+# Fonction générant les reviews (tranche, jeu, label, texte, chemin...) d'un corpus, quel que soit son format.
+# Les fichiers ignorés (pas "review_", pas de Note, trop courts) sont comptés dans "stats" si fourni.
+def iter_reviews(root, tranches=None, min_size=0, stats=None):
+    stats = stats if stats is not None else nouvelles_stats()
+
+    if est_bdd_reviews(root): # Base SQLite : le filtrage est fait par la requête
+        import BDD_reviews
+        for row in BDD_reviews.selectionner(root, tranches, min_size):
+            stats["total"] += 1
+            stats["used"] += 1
+            yield {k: row[k] for k in ("tranche", "jeu", "label", "texte", "chemin", "recommendationid", "langue", "timestamp")}
+        return
+
+    if corpus_shard.est_corpus_shard(root):
+        for record in corpus_shard.iter_records(root, tranches):
+            stats["total"] += 1
+            if len(record["texte"]) < min_size:
+                stats["ignored_short"] += 1
+                continue
+            stats["used"] += 1
+            yield {"tranche": record["tranche"], "jeu": record["jeu"], "label": record["label"],
+                   "texte": record["texte"], "chemin": None, "recommendationid": record["recommendationid"],
+                   "langue": record["langue"], "timestamp": record["timestamp"]}
+        return
+
+    yield from lire_entrees(root, lister_entrees(root, tranches), min_size, stats)
+
+# Fonction indiquant si un dossier contient des reviews téléchargées hors de l'arborescence <tranche>/<jeu>/ du corpus :
+# <dossier>/review_*.txt (un jeu) ou <dossier>/<jeu>/review_*.txt (lot téléchargé sans rangement par tranche)
+def est_dossier_reviews(root):
+    if not os.path.isdir(root) or corpus_shard.est_corpus_shard(root):
+        return False
+    with os.scandir(root) as it:
+        return not any(MOTIF_TRANCHE.match(entry.name) and entry.is_dir() for entry in it)
+
+# Fonction générant les reviews d'un dossier téléchargé (voir est_dossier_reviews), sans manifeste ; la tranche est inconnue (None)
+def iter_reviews_dossier(root, min_size=0, stats=None):
+    stats = stats if stats is not None else nouvelles_stats()
+    with os.scandir(root) as it:
+        dossiers = [(entry.name, entry.path) for entry in it if entry.is_dir()]
+    dossiers = [(os.path.basename(os.path.abspath(root)), root)] + sorted(dossiers)
+    for jeu, path in dossiers:
+        entrees = sorted(scanner_jeu(root, None, jeu, path, []), key=lambda e: (len(e["fichier"]), e["fichier"]))
+        yield from lire_entrees(root, entrees, min_size, stats)
+
+# Fonction lisant les reviews de fichiers texte décrits par des entrées de manifeste (filtrées sans ouvrir les fichiers)
+def lire_entrees(root, entrees, min_size, stats):
+    for entree in entrees:
+        stats["total"] += 1
+        if not entree["review"]:
+            stats["ignored_not_review"] += 1
+            continue
+        if entree["label"] is None:
+            stats["ignored_no_note"] += 1
+            continue
+        if entree["longueur"] < min_size: # Filtre appliqué sans ouvrir le fichier
+            stats["ignored_short"] += 1
+            continue
+        path = os.path.join(root, entree["chemin"])
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                f.readline()
+                texte = f.read().strip()
+        except OSError as e:
+            print(f"Erreur lecture fichier {path}: {e}")
+            continue
+        stats["used"] += 1
+        yield {"tranche": entree["tranche"], "jeu": entree["jeu"], "label": entree["label"],
+               "texte": texte, "chemin": entree["chemin"], "recommendationid": None,
+               "langue": None, "timestamp": entree["mtime"] // 10**9}
+
+if __name__ == "__main__": # Lancement en ligne de commande : construction / revalidation du manifeste
+    parser = argparse.ArgumentParser(description="Indexation du corpus de reviews (manifeste partagé par les outils d'analyse).")
+    parser.add_argument("root", help="Dossier racine du corpus (ex : data)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        sys.exit(f"{args.root} n'existe pas.")
+    debut = time.perf_counter()
+    counts = compter_par_tranche(args.root)
+    for tranche in sorted(counts):
+        print(f"Tranche {tranche} : {counts[tranche]} reviews")
+    print(f"TOTAL : {sum(counts.values())} reviews ({time.perf_counter() - debut:.3f} s)")
@@ -0,0 +1,221 @@
+import os
+import re
+import sys
+import json
+import zlib
+import glob
+import struct
+import argparse
+import threading
+from collections import Counter
+
+# Format "shard" du corpus : les reviews sont regroupées en blocs compressés (zlib) ajoutés les uns à la suite des autres
+# dans des fichiers corpus_XXXX.shard. Chaque shard a un index corpus_XXXX.idx contenant, pour chaque bloc,
+# son offset, sa taille compressée et son nombre de reviews, ce qui permet un accès direct à n'importe quelle review.
+PREFIXE_SHARD = "corpus_"
+EXTENSION_SHARD = ".shard"
+EXTENSION_INDEX = ".idx"
+ENTREE_INDEX = struct.Struct("<QII") # offset du bloc, taille compressée, nombre de reviews
+REVIEWS_PAR_BLOC = 512
+TAILLE_SHARD_MAX = 64 * 1024 * 1024
+CHAMPS = ("tranche", "jeu", "label", "recommendationid", "langue", "timestamp", "texte")
+
+# Fonction indiquant si un dossier contient un corpus au format shard
+def est_corpus_shard(dossier):
+    return bool(dossier) and bool(glob.glob(os.path.join(glob.escape(dossier), PREFIXE_SHARD + "*" + EXTENSION_SHARD)))
+
+# Fonction renvoyant la liste triée des shards d'un dossier
+def lister_shards(dossier):
+    return sorted(glob.glob(os.path.join(glob.escape(dossier), PREFIXE_SHARD + "*" + EXTENSION_SHARD)))
+
+# Fonction lisant l'index d'un shard : liste de (offset, taille, nombre de reviews)
+def lire_index(shard_path):
+    index_path = shard_path[:-len(EXTENSION_SHARD)] + EXTENSION_INDEX
+    with open(index_path, "rb") as f:
+        data = f.read()
+    n = len(data) // ENTREE_INDEX.size # Une entrée incomplète (écriture interrompue) est ignorée
+    return [ENTREE_INDEX.unpack_from(data, i * ENTREE_INDEX.size) for i in range(n)]
+
+# Fonction décompressant un bloc de reviews
+def lire_bloc(f, offset, taille):
+    f.seek(offset)
+    lignes = zlib.decompress(f.read(taille)).decode("utf-8").splitlines()
+    return [json.loads(ligne) for ligne in lignes]
+
+# Fonction ramenant un shard à son dernier bloc complet avant d'y ajouter des reviews (après une écriture interrompue) :
+# l'index est tronqué à un nombre entier d'entrées et le shard à la fin du dernier bloc indexé. Sans cela, les entrées
+# ajoutées derrière une entrée incomplète seraient décalées et tout l'index deviendrait illisible.
+def reparer_shard(shard_path):
+    index_path = shard_path[:-len(EXTENSION_SHARD)] + EXTENSION_INDEX
+    if not os.path.exists(index_path):
+        if os.path.exists(shard_path):
+            os.truncate(shard_path, 0)
+        return
+    taille_index = os.path.getsize(index_path)
+    if taille_index % ENTREE_INDEX.size:
+        os.truncate(index_path, taille_index - taille_index % ENTREE_INDEX.size)
+    index = lire_index(shard_path)
+    fin = index[-1][0] + index[-1][1] if index else 0
+    if os.path.exists(shard_path) and os.path.getsize(shard_path) > fin:
+        os.truncate(shard_path, fin)
+
+# Écriture en ajout seul d'un corpus shard (un même writer peut être partagé par plusieurs threads de téléchargement)
+class ShardWriter:
+    def __init__(self, dossier, reviews_par_bloc=REVIEWS_PAR_BLOC, taille_shard_max=TAILLE_SHARD_MAX):
+        os.makedirs(dossier, exist_ok=True)
+        self.dossier = dossier
+        self.reviews_par_bloc = reviews_par_bloc
+        self.taille_shard_max = taille_shard_max
+        self.buffer = []
+        self.written = 0
+        self.lock = threading.Lock()
+
+        shards = lister_shards(dossier)
+        self.numero = len(shards) - 1 if shards else 0
+        self.open_shard()
+
+    def open_shard(self): # Fonction ouvrant (en ajout) le shard courant et son index
+        base = os.path.join(self.dossier, f"{PREFIXE_SHARD}{self.numero:04d}")
+        reparer_shard(base + EXTENSION_SHARD)
+        self.shard = open(base + EXTENSION_SHARD, "ab")
+        self.index = open(base + EXTENSION_INDEX, "ab")
+
+    def write(self, record): # Fonction ajoutant une review (dictionnaire avec les champs de CHAMPS)
+        with self.lock:
+            self.buffer.append({champ: record.get(champ) for champ in CHAMPS})
+            if len(self.buffer) >= self.reviews_par_bloc:
+                self.flush()
+
+    def flush(self): # Fonction compressant et écrivant le bloc en cours
+        if not self.buffer:
+            return
+        if self.shard.tell() >= self.taille_shard_max:
+            self.close_files()
+            self.numero += 1
+            self.open_shard()
+
+        data = "\n".join(json.dumps(r, ensure_ascii=False) for r in self.buffer).encode("utf-8")
+        bloc = zlib.compress(data, 6)
+        offset = self.shard.tell()
+        self.shard.write(bloc)
+        self.shard.flush()
+        # L'entrée d'index est écrite après le bloc : un bloc sans entrée d'index est simplement ignoré à la lecture
+        self.index.write(ENTREE_INDEX.pack(offset, len(bloc), len(self.buffer)))
+        self.index.flush()
+        self.written += len(self.buffer)
+        self.buffer = []
+
+    def close_files(self):
+        self.shard.close()
+        self.index.close()
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Fonction générant toutes les reviews d'un corpus shard (éventuellement filtrées par tranche)
+def iter_records(dossier, tranches=None):
+    tranches = set(tranches) if tranches is not None else None
+    for shard_path in lister_shards(dossier):
+        index = lire_index(shard_path)
+        with open(shard_path, "rb") as f:
+            for offset, taille, _ in index:
+                for record in lire_bloc(f, offset, taille):
+                    if tranches is None or record["tranche"] in tranches:
+                        yield record
+
+# Fonction renvoyant la n-ième review du corpus sans décompresser les autres blocs
+def lire_record(dossier, numero):
+    for shard_path in lister_shards(dossier):
+        with open(shard_path, "rb") as f:
+            for offset, taille, count in lire_index(shard_path):
+                if numero < count:
+                    return lire_bloc(f, offset, taille)[numero]
+                numero -= count
+    raise IndexError("Review hors du corpus")
+
+# Fonction renvoyant les identifiants Steam (recommendationid) des reviews déjà présentes dans un corpus shard
+def recommendationids(dossier):
+    return {str(record["recommendationid"]) for record in iter_records(dossier) if record["recommendationid"] is not None}
+
+# Fonction comptant les reviews par tranche Metacritic
+def compter_par_tranche(dossier):
+    return Counter(record["tranche"] for record in iter_records(dossier))
+
+# Fonction lisant un fichier review_N.txt : renvoie (label, texte) ou None si la ligne "Note" est absente
+def lire_review_txt(path):
+    with open(path, "r", encoding="utf-8") as f:
+        entete = f.readline()
+        texte = f.read().strip()
+    if not entete.startswith("Note"):
+        return None
+    label = 1 if "👍" in entete else 0
+    return label, texte
+
+# Fonction convertissant l'arborescence data/<tranche>/<jeu>/review_*.txt en corpus shard
+def convertir_arborescence(data_dir, dossier_sortie):
+    numero_review = re.compile(r"^review_(\d+)\.txt$")
+    ignored = 0
+    with ShardWriter(dossier_sortie) as writer:
+        for tranche in sorted(os.listdir(data_dir)):
+            tranche_path = os.path.join(data_dir, tranche)
+            if not re.match(r"^\d{1,3}-\d{1,3}$", tranche) or not os.path.isdir(tranche_path):
+                continue
+            for jeu in sorted(os.listdir(tranche_path)):
+                jeu_path = os.path.join(tranche_path, jeu)
+                if not os.path.isdir(jeu_path):
+                    continue
+                fichiers = [f for f in os.listdir(jeu_path) if numero_review.match(f)]
+                for fichier in sorted(fichiers, key=lambda f: int(numero_review.match(f).group(1))):
+                    path = os.path.join(jeu_path, fichier)
+                    review = lire_review_txt(path)
+                    if review is None:
+                        ignored += 1
+                        continue
+                    label, texte = review
+                    writer.write({
+                        "tranche": tranche,
+                        "jeu": jeu,
+                        "label": label,
+                        "timestamp": int(os.path.getmtime(path)),
+                        "texte": texte
+                    })
+    return writer.written, ignored
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Gestion du corpus de reviews au format shard.")
+    sub = parser.add_subparsers(dest="commande", required=True)
+    p_conv = sub.add_parser("convertir", help="Convertir une arborescence data/<tranche>/<jeu>/review_*.txt")
+    p_conv.add_argument("data_dir")
+    p_conv.add_argument("dossier_sortie")
+    p_info = sub.add_parser("info", help="Afficher le nombre de reviews par tranche")
+    p_info.add_argument("dossier")
+    p_lire = sub.add_parser("lire", help="Afficher une review à partir de son numéro (accès direct par l'index)")
+    p_lire.add_argument("dossier")
+    p_lire.add_argument("numero", type=int, help="Numéro de la review dans le corpus (à partir de 0)")
+    args = parser.parse_args()
+
+    if args.commande == "convertir":
+        if est_corpus_shard(args.dossier_sortie):
+            sys.exit(f"{args.dossier_sortie} contient déjà un corpus shard.")
+        written, ignored = convertir_arborescence(args.data_dir, args.dossier_sortie)
+        print(f"{written} reviews converties ({ignored} ignorées, pas de Note) dans {args.dossier_sortie}")
+    elif args.commande == "lire":
+        try:
+            record = lire_record(args.dossier, args.numero)
+        except IndexError as e:
+            sys.exit(str(e))
+        print(f"Tranche {record['tranche']} | {record['jeu']} | {'👍' if record['label'] else '👎'} | "
+              f"recommendationid {record['recommendationid']} | langue {record['langue']}\n\n{record['texte']}")
+    else:
+        counts = compter_par_tranche(args.dossier)
+        for tranche in sorted(counts):
+            print(f"Tranche {tranche} : {counts[tranche]} reviews")
+        print(f"TOTAL : {sum(counts.values())} reviews")
@@ -0,0 +1,146 @@
+import os
+import sys
+import math
+import time
+import random
+import argparse
+
+import corpus_shard
+
+# Corpus synthétique pour les mesures de performance au-delà des reviews réelles de data/.
+# Les paramètres reproduisent le corpus réel (1275 reviews) : longueur log-normale (médiane ~230 caractères, 5 % sous 15,
+# 1 % au-delà de 5000), environ 20 reviews par jeu, part d'avis positifs croissante avec la tranche Metacritic,
+# 54 % d'anglais, 40 % de français et 6 % d'autres langues. Le générateur est déterministe pour une graine donnée.
+# Formats écrits : arborescence data/<tranche>/<jeu>/review_N.txt, corpus shard, base SQLite (BDD_reviews.py).
+LONGUEUR_MU = 5.39
+LONGUEUR_SIGMA = 1.53
+LONGUEUR_MAX = 8000
+REVIEWS_PAR_JEU = 20
+PART_POSITIVE = { # Part d'avis positifs par tranche (mesurée sur data/, extrapolée pour 0-10 et 10-20)
+    "0-10": 0.40, "10-20": 0.45, "20-30": 0.49, "30-40": 0.46, "40-50": 0.48,
+    "50-60": 0.57, "60-70": 0.69, "70-80": 0.88, "80-90": 0.92, "90-100": 0.93
+}
+REPARTITION_TRANCHES = { # Les tranches extrêmes sont rares sur Steam
+    "0-10": 0.01, "10-20": 0.01, "20-30": 0.06, "30-40": 0.12, "40-50": 0.12,
+    "50-60": 0.13, "60-70": 0.14, "70-80": 0.14, "80-90": 0.14, "90-100": 0.13
+}
+LANGUES = {"en": 0.54, "fr": 0.40, "de": 0.02, "es": 0.02, "no": 0.02}
+PART_MOTS_POLARISES = 0.15
+BRUIT_POLARITE = 0.2 # Part des mots polarisés de sens contraire au label (avis nuancés)
+FORMATS = ("arborescence", "shard", "bdd")
+
+VOCABULAIRE = {
+    "en": {
+        1: "great fun love amazing masterpiece recommend beautiful enjoyable best excellent addictive polished brilliant charming".split(),
+        0: "boring bad broken crash waste refund terrible buggy worst disappointing repetitive unplayable overpriced lazy".split(),
+        None: ("the a and is it this game play story hours graphics but was really very gameplay level character music price "
+               "with for on after before time friends online mode developers update content first still just").split()
+    },
+    "fr": {
+        1: "génial super excellent magnifique recommande adore chef-d'œuvre prenant beau réussi incroyable drôle".split(),
+        0: "nul ennuyeux bugs décevant injouable cher mauvais répétitif horrible lent remboursé raté".split(),
+        None: ("le la les un une et est ce jeu jouer histoire heures graphismes mais vraiment très niveau personnage "
+               "musique prix avec pour sur après avant temps amis en ligne mode développeurs contenu encore").split()
+    },
+    "de": {1: "gut toll super spaß".split(), 0: "schlecht langweilig fehler".split(),
+           None: "das spiel ist und nicht sehr mit ein der die zeit".split()},
+    "es": {1: "bueno genial divertido increíble".split(), 0: "malo aburrido errores".split(),
+           None: "el juego es y no muy con un la de tiempo".split()},
+    "no": {1: "bra gøy flott".split(), 0: "dårlig kjedelig".split(),
+           None: "spillet er og ikke veldig med en det tid".split()}
+}
+
+# Fonction générant le texte d'une review d'environ longueur caractères, dans la langue donnée et orientée selon le label
+def generer_texte(rng, longueur, label, langue):
+    vocabulaire = VOCABULAIRE[langue]
+    phrases, taille = [], 0
+    while taille < longueur:
+        mots = []
+        for _ in range(rng.randint(4, 14)):
+            if rng.random() < PART_MOTS_POLARISES:
+                polarite = label if rng.random() >= BRUIT_POLARITE else 1 - label
+                mots.append(rng.choice(vocabulaire[polarite]))
+            else:
+                mots.append(rng.choice(vocabulaire[None]))
+        phrase = " ".join(mots).capitalize() + rng.choice(".!.")
+        phrases.append(phrase)
+        taille += len(phrase) + 1
+    return " ".join(phrases)[:longueur].rstrip()
+
+# Fonction générant n reviews synthétiques (dictionnaires avec les champs de corpus_shard.CHAMPS), jeu par jeu
+def iter_synthetique(n, graine=0):
+    rng = random.Random(graine)
+    tranches, poids = zip(*REPARTITION_TRANCHES.items())
+    langues, poids_langues = zip(*LANGUES.items())
+    produites, numero_jeu = 0, 0
+    while produites < n:
+        tranche = rng.choices(tranches, poids)[0]
+        jeu = f"jeu_{numero_jeu:06d}"
+        numero_jeu += 1
+        for _ in range(min(n - produites, max(1, int(rng.expovariate(1 / REVIEWS_PAR_JEU))))):
+            label = 1 if rng.random() < PART_POSITIVE[tranche] else 0
+            langue = rng.choices(langues, poids_langues)[0]
+            longueur = min(LONGUEUR_MAX, max(1, int(math.exp(rng.gauss(LONGUEUR_MU, LONGUEUR_SIGMA)))))
+            produites += 1
+            yield {"tranche": tranche, "jeu": jeu, "label": label, "recommendationid": str(produites),
+                   "langue": langue, "timestamp": 1600000000 + produites, "texte": generer_texte(rng, longueur, label, langue)}
+
+# Fonction écrivant des reviews dans une arborescence <dossier>/<tranche>/<jeu>/review_N.txt (format de SteamReviewDownloader.py)
+def ecrire_arborescence(dossier, reviews):
+    compteurs = {}
+    for review in reviews:
+        jeu_path = os.path.join(dossier, review["tranche"], review["jeu"])
+        if review["jeu"] not in compteurs:
+            os.makedirs(jeu_path, exist_ok=True)
+        compteurs[review["jeu"]] = compteurs.get(review["jeu"], 0) + 1
+        with open(os.path.join(jeu_path, f"review_{compteurs[review['jeu']]}.txt"), "w", encoding="utf-8") as f:
+            f.write(f"Note : {'👍' if review['label'] else '👎'}\n\n{review['texte']}")
+    return sum(compteurs.values())
+
+# Fonction écrivant des reviews dans un corpus shard
+def ecrire_shard(dossier, reviews):
+    with corpus_shard.ShardWriter(dossier) as writer:
+        for review in reviews:
+            writer.write(review)
+    return writer.written
+
+# Fonction générant un corpus synthétique de n reviews dans les formats demandés, sous <dossier>/<n>/.
+# Renvoie {format: (chemin, durée d'écriture)} ; un format déjà généré n'est pas réécrit.
+def generer(dossier, n, formats=FORMATS, graine=0):
+    base = os.path.join(dossier, str(n))
+    chemins = {"arborescence": os.path.join(base, "data"), "shard": os.path.join(base, "shard"), "bdd": os.path.join(base, "reviews.db")}
+    resultats = {}
+    for format_ in formats:
+        chemin = chemins[format_]
+        if os.path.exists(chemin):
+            resultats[format_] = (chemin, None)
+            continue
+        start = time.perf_counter()
+        tmp = chemin + ".tmp"
+        if format_ == "arborescence":
+            ecrire_arborescence(tmp, iter_synthetique(n, graine))
+        elif format_ == "shard":
+            ecrire_shard(tmp, iter_synthetique(n, graine))
+        else: # Base SQLite remplie depuis le shard (généré au besoin), langues comprises
+            import BDD_reviews
+            source = generer(dossier, n, ("shard",), graine)["shard"][0]
+            BDD_reviews.ingerer(source, tmp, langues=False)
+        os.replace(tmp, chemin)
+        resultats[format_] = (chemin, time.perf_counter() - start)
+    return resultats
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Génération d'un corpus synthétique de reviews (mesures de performance).")
+    parser.add_argument("dossier", help="Dossier de sortie (le corpus est écrit dans <dossier>/<taille>/)")
+    parser.add_argument("--taille", type=int, action="append", help="Nombre de reviews (répétable, 1000 par défaut)")
+    parser.add_argument("--format", action="append", choices=FORMATS, help="Format écrit (répétable, tous par défaut)")
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.taille or [1000]:
+        for format_, (chemin, duree) in generer(args.dossier, n, args.format or FORMATS, args.graine).items():
+            if duree is None:
+                print(f"{n} reviews ({format_}) : déjà généré dans {chemin}")
+            else:
+                print(f"{n} reviews ({format_}) : {chemin} écrit en {duree:.2f} s")
+    sys.exit(0)
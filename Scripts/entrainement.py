@@ -0,0 +1,164 @@
+import os
+import time
+import tempfile
+import numpy as np
+from scipy.sparse import csr_matrix
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.base import clone
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedKFold
+from sklearn.utils import resample
+
+# Fonction d'oversampling de la classe minoritaire par indexation des lignes de la matrice CSR (la matrice reste creuse)
+def oversample(X_train, y_train, random_state=42):
+    y_train_array = np.asarray(y_train)
+
+    class_0_indices = np.where(y_train_array == 0)[0]
+    class_1_indices = np.where(y_train_array == 1)[0]
+
+    if len(class_0_indices) == 0 or len(class_1_indices) == 0:
+        return X_train, y_train_array
+
+    if len(class_0_indices) > len(class_1_indices):
+        maj, min_ = class_0_indices, class_1_indices
+    else:
+        maj, min_ = class_1_indices, class_0_indices
+
+    min_upsampled = resample(min_, replace=True, n_samples=len(maj), random_state=random_state)
+    indices_final = np.concatenate((maj, min_upsampled))
+    return X_train[indices_final], y_train_array[indices_final]
+
+# Fonction renvoyant la taille en mémoire d'une matrice creuse, et celle qu'elle aurait une fois densifiée (float64)
+def matrix_sizes(X):
+    sparse_bytes = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    dense_bytes = X.shape[0] * X.shape[1] * np.dtype(np.float64).itemsize
+    return sparse_bytes, dense_bytes
+
+# Fonction écrivant une matrice CSR en fichiers .npy, relus en mémoire partagée (mmap) par les processus.
+# La matrice est écrite sous forme canonique (indices triés, sans doublons) : les modèles qui la trient avant l'entraînement
+# (SVC...) n'ont alors rien à réécrire dans les tableaux partagés.
+def share_matrix(X, folder, name):
+    X = csr_matrix(X)
+    X.sum_duplicates()
+    paths = {}
+    for part in ("data", "indices", "indptr"):
+        paths[part] = os.path.join(folder, f"{name}_{part}.npy")
+        np.save(paths[part], getattr(X, part))
+    return {"paths": paths, "shape": X.shape}
+
+# Fonction écrivant un vecteur de labels en .npy
+def share_vector(y, folder, name):
+    path = os.path.join(folder, f"{name}.npy")
+    np.save(path, np.asarray(y))
+    return path
+
+# Fonction reconstruisant (sans copie) une matrice CSR à partir de ses fichiers .npy projetés en mémoire.
+# Projection en copie sur écriture : une modification en place reste propre au processus au lieu d'échouer.
+def load_shared_matrix(meta):
+    parts = [np.load(meta["paths"][part], mmap_mode="c") for part in ("data", "indices", "indptr")]
+    return csr_matrix(tuple(parts), shape=meta["shape"], copy=False)
+
+# Fonction entraînant et évaluant un modèle (exécutée dans un processus du pool, ou directement en mode séquentiel).
+# Les matrices ne sont densifiées que pour les modèles qui n'acceptent pas les matrices creuses (dense=True).
+def fit_and_predict(name, model, X_train, y_train, X_test, dense=False):
+    cpu_start = time.process_time()
+    if dense:
+        X_train, X_test = X_train.toarray(), X_test.toarray()
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+    return name, y_pred, {"fit": fit_time, "predict": predict_time, "cpu": time.process_time() - cpu_start}
+
+# Point d'entrée des processus : les matrices sont relues depuis la mémoire partagée plutôt que sérialisées
+def fit_and_predict_shared(name, model, X_train_meta, y_train_path, X_test_meta, dense=False):
+    X_train = load_shared_matrix(X_train_meta)
+    y_train = np.load(y_train_path, mmap_mode="r")
+    X_test = load_shared_matrix(X_test_meta)
+    return fit_and_predict(name, model, X_train, y_train, X_test, dense)
+
+# Fonction entraînant tous les modèles, en parallèle si n_workers > 1.
+# dense contient les noms des modèles à entraîner sur les matrices densifiées.
+# Renvoie les rapports (moyenne pondérée), les prédictions, les durées par modèle, la durée réelle et le temps CPU cumulé.
+def train_models(models, X_train, y_train, X_test, y_test, n_workers=1, dense=()):
+    outputs = []
+    start = time.perf_counter()
+
+    if n_workers <= 1:
+        for name, model in models.items():
+            outputs.append(fit_and_predict(name, model, X_train, y_train, X_test, name in dense))
+    else:
+        with tempfile.TemporaryDirectory(prefix="classifieurs_") as folder:
+            X_train_meta = share_matrix(X_train, folder, "X_train")
+            y_train_path = share_vector(y_train, folder, "y_train")
+            X_test_meta = share_matrix(X_test, folder, "X_test")
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(models))) as pool:
+                futures = [pool.submit(fit_and_predict_shared, name, model, X_train_meta, y_train_path, X_test_meta, name in dense)
+                           for name, model in models.items()]
+                outputs = [future.result() for future in futures]
+
+    wall_time = time.perf_counter() - start
+    results, predictions, timings = {}, {}, {}
+    for name, y_pred, timing in outputs:
+        report = classification_report(y_test, y_pred, output_dict=True, zero_division=0)
+        results[name] = report['weighted avg']
+        predictions[name] = y_pred
+        timings[name] = timing
+    cpu_time = sum(t["cpu"] for t in timings.values())
+    return results, predictions, timings, wall_time, cpu_time
+
+# Fonction évaluant un modèle sur un pli de validation croisée (oversampling appliqué uniquement au pli d'entraînement)
+def evaluate_fold(name, model, fold, X, y, train_idx, test_idx, oversampling, dense=False):
+    X_train, y_train = X[train_idx], y[train_idx]
+    if oversampling:
+        X_train, y_train = oversample(X_train, y_train)
+    _, y_pred, timing = fit_and_predict(name, model, X_train, y_train, X[test_idx], dense)
+    y_test = np.asarray(y[test_idx])
+    report = classification_report(y_test, y_pred, output_dict=True, zero_division=0)['weighted avg']
+    return {"modele": name, "pli": fold, "precision": report["precision"], "recall": report["recall"],
+            "f1-score": report["f1-score"], "fit": timing["fit"], "predict": timing["predict"], "cpu": timing["cpu"],
+            "confusion": confusion_matrix(y_test, y_pred, labels=[0, 1])}
+
+# Point d'entrée des processus pour un pli : X et y sont relus depuis la mémoire partagée
+def evaluate_fold_shared(name, model, fold, X_meta, y_path, train_idx, test_idx, oversampling, dense=False):
+    X = load_shared_matrix(X_meta)
+    y = np.load(y_path, mmap_mode="r")
+    return evaluate_fold(name, model, fold, X, y, train_idx, test_idx, oversampling, dense)
+
+# Fonction évaluant une liste de tâches (modèle, pli, indices d'entraînement, indices de test, oversampling) sur les lignes de X,
+# en parallèle si n_workers > 1 (X et y sont alors partagés une seule fois entre tous les processus).
+def run_fold_tasks(tasks, X, y, n_workers=1, dense=()):
+    X = csr_matrix(X)
+    y = np.asarray(y)
+    if n_workers <= 1:
+        return [evaluate_fold(name, model, fold, X, y, tr, te, ov, name in dense) for name, model, fold, tr, te, ov in tasks]
+    with tempfile.TemporaryDirectory(prefix="evaluation_") as folder:
+        X_meta = share_matrix(X, folder, "X")
+        y_path = share_vector(y, folder, "y")
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as pool:
+            futures = [pool.submit(evaluate_fold_shared, name, model, fold, X_meta, y_path, tr, te, ov, name in dense)
+                       for name, model, fold, tr, te, ov in tasks]
+            return [future.result() for future in futures]
+
+# Fonction de validation croisée stratifiée à k plis : chaque couple (pli, modèle) est une tâche du pool de processus.
+# Renvoie le détail par pli, la moyenne et l'écart-type des mesures par modèle, et la somme des matrices de confusion.
+def cross_validate_models(models, X, y, n_folds=5, oversampling=True, n_workers=1, random_state=42, dense=()):
+    y = np.asarray(y)
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state).split(np.zeros(len(y)), y))
+    tasks = [(name, clone(model), fold, train_idx, test_idx, oversampling)
+             for fold, (train_idx, test_idx) in enumerate(folds, start=1) for name, model in models.items()]
+
+    start = time.perf_counter()
+    fold_results = run_fold_tasks(tasks, X, y, n_workers, dense)
+    wall_time = time.perf_counter() - start
+
+    summary, confusions = {}, {}
+    for name in models:
+        rows = [r for r in fold_results if r["modele"] == name]
+        summary[name] = {metric: (float(np.mean([r[metric] for r in rows])), float(np.std([r[metric] for r in rows])))
+                         for metric in ("precision", "recall", "f1-score")}
+        confusions[name] = sum(r["confusion"] for r in rows)
+    cpu_time = sum(r["cpu"] for r in fold_results)
+    return fold_results, summary, confusions, wall_time, cpu_time
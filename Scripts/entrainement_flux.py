@@ -0,0 +1,95 @@
+import zlib
+import time
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+import corpus
+import modeles
+
+# Entraînement "out-of-core" : le corpus est lu par paquets, chaque paquet est vectorisé par un HashingVectorizer
+# (sans état, donc sans passe d'ajustement) puis sert à mettre à jour les modèles via partial_fit.
+# La mémoire reste bornée par la taille d'un paquet, quelle que soit la taille du corpus.
+TAILLE_PAQUET = 5000
+CLASSES = np.array([0, 1])
+
+# Fonction renvoyant le vectoriseur sans état (valeurs positives pour rester compatible avec MultinomialNB)
+def make_hashing_vectorizer(n_features=2 ** 20):
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm="l2")
+
+# Fonction renvoyant les modèles entraînables de manière incrémentale (ceux du registre qui déclarent partial_fit)
+def streaming_models(names=None, registre=modeles.REGISTRE):
+    names = modeles.streaming_capable(names if names is not None else list(registre), registre)
+    return modeles.create_models(names, registre)
+
+# Fonction répartissant de manière déterministe une review dans le flux de test (~ test_ratio des reviews)
+def is_test(texte, test_ratio=0.2):
+    return zlib.crc32(texte.encode("utf-8")) % 1000 < test_ratio * 1000
+
+# Fonction générant les paquets (textes, labels) du flux d'entraînement ou du flux de test
+def iter_batches(root, tranches, min_size, test, batch_size=TAILLE_PAQUET, stats=None, test_ratio=0.2):
+    textes, labels = [], []
+    for review in corpus.iter_reviews(root, tranches, min_size, stats):
+        if is_test(review["texte"], test_ratio) != test:
+            continue
+        textes.append(review["texte"])
+        labels.append(review["label"])
+        if len(textes) >= batch_size:
+            yield textes, np.array(labels)
+            textes, labels = [], []
+    if textes:
+        yield textes, np.array(labels)
+
+# Fonction calculant les mesures (moyenne pondérée, comme classification_report) à partir d'une matrice de confusion 2x2
+def report_from_confusion(cm):
+    cm = np.asarray(cm, dtype=float)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    tp = np.diag(cm)
+    precision = np.divide(tp, predicted, out=np.zeros(2), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros(2), where=support > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(2), where=(precision + recall) > 0)
+    total = support.sum()
+    weights = support / total if total else np.zeros(2)
+    return {
+        "precision": float((precision * weights).sum()),
+        "recall": float((recall * weights).sum()),
+        "f1-score": float((f1 * weights).sum()),
+        "support": float(total)
+    }
+
+# Fonction entraînant les modèles sur le flux d'entraînement puis les évaluant sur le flux de test.
+# Avec oversampling, la classe minoritaire est repondérée (sample_weight) d'après les effectifs vus jusque-là.
+def train_streaming(root, tranches, min_size=0, oversampling=True, batch_size=TAILLE_PAQUET, models=None):
+    models = models or streaming_models()
+    vectorizer = make_hashing_vectorizer()
+    stats = corpus.nouvelles_stats()
+    class_counts = np.zeros(2)
+    timings = {name: {"fit": 0.0, "predict": 0.0} for name in models}
+    n_train = n_test = 0
+
+    for textes, labels in iter_batches(root, tranches, min_size, False, batch_size, stats):
+        X = vectorizer.transform(textes)
+        class_counts += np.bincount(labels, minlength=2)
+        weights = None
+        if oversampling and class_counts.min() > 0:
+            weights = (class_counts.max() / class_counts)[labels]
+        for name, model in models.items():
+            start = time.perf_counter()
+            model.partial_fit(X, labels, classes=CLASSES, sample_weight=weights)
+            timings[name]["fit"] += time.perf_counter() - start
+        n_train += len(labels)
+
+    confusions = {name: np.zeros((2, 2), dtype=np.int64) for name in models}
+    if n_train:
+        for textes, labels in iter_batches(root, tranches, min_size, True, batch_size):
+            X = vectorizer.transform(textes)
+            for name, model in models.items():
+                start = time.perf_counter()
+                y_pred = model.predict(X)
+                timings[name]["predict"] += time.perf_counter() - start
+                np.add.at(confusions[name], (labels, y_pred), 1)
+            n_test += len(labels)
+
+    results = {name: report_from_confusion(cm) for name, cm in confusions.items()}
+    stats["train"], stats["test"] = n_train, n_test
+    return results, confusions, timings, stats
@@ -1,30 +1,49 @@
-import matplotlib.pyplot as plt
-import numpy as np
-
-tranches = ['30-40', '90-100', 'Toutes'] # Les tranches étudiés
-models = ['Naive Bayes', 'SVM', 'Random Forest', 'Logistic Regression'] # Les modèles analysés
-
-# F1-scores
-f1_scores = {
-    'Naive Bayes': [0.6801, 0.8431, 0.8029],
-    'SVM': [0.6358, 0.9218, 0.7294],
-    'Random Forest': [0.6969, 0.9218, 0.7298],
-    'Logistic Regression': [0.7474, 0.9084, 0.7775]
-}
-
-x = np.arange(len(tranches))  # positions des tranches
-width = 0.2  # largeur des barres
-
-fig, ax = plt.subplots(figsize=(10, 6))
-for i, model in enumerate(models):
-    ax.bar(x + i * width, f1_scores[model], width, label=model)
-
-ax.set_ylabel('F1-score')
-ax.set_title('F1-score des modèles par tranche Metacritic')
-ax.set_xticks(x + width * 1.5)
-ax.set_xticklabels(tranches)
-ax.legend()
-ax.grid(axis='y', linestyle='--', alpha=0.7)
-
-plt.tight_layout()
-plt.show()
+import sys
+import sqlite3
+import argparse
+
+import rendu_graphiques
+
+# Fonction lisant les scores du balayage des tranches (voir balayage_tranches.py) : {modèle: [score par sous-ensemble]}
+def lire_scores(db_path, oversampling=True, mesure="f1-score"):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT sous_ensemble, modele, valeur FROM balayage_tranches WHERE oversampling = ? AND mesure = ? ORDER BY rowid",
+        (int(oversampling), mesure)
+    ).fetchall()
+    conn.close()
+
+    tranches, models = [], [] # Les tranches étudiées et les modèles analysés, dans l'ordre du balayage
+    for tranche, model, _ in rows:
+        if tranche not in tranches:
+            tranches.append(tranche)
+        if model not in models:
+            models.append(model)
+    valeurs = {(tranche, model): valeur for tranche, model, valeur in rows}
+    scores = {model: [valeurs.get((tranche, model), 0.0) for tranche in tranches] for model in models}
+    return tranches, models, scores
+
+# Fonction décrivant le graphique en barres des scores par tranche (voir rendu_graphiques.py)
+def fscore_spec(fichier, tranches, models, scores, oversampling=True, mesure="f1-score"):
+    return {"type": "barres_groupees", "fichier": fichier, "taille": [10, 6], "etiquettes": tranches,
+            "series": {model: scores[model] for model in models}, "axe_y": mesure.capitalize(), "grille": True,
+            "titre": f"{mesure.capitalize()} des modèles par tranche Metacritic ({'avec' if oversampling else 'sans'} oversampling)"}
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Graphique des scores des modèles par tranche Metacritic (dessiné hors écran).")
+    parser.add_argument("bdd", nargs="?", default="resultats_classifieurs.db", help="Base de résultats contenant le balayage des tranches")
+    parser.add_argument("--sans-oversampling", action="store_true", help="Afficher les résultats obtenus sans oversampling")
+    parser.add_argument("--mesure", default="f1-score", choices=["precision", "recall", "f1-score"])
+    parser.add_argument("--sortie", default="fscore_graph.png", help="Fichier du graphique")
+    args = parser.parse_args()
+
+    try:
+        tranches, models, f1_scores = lire_scores(args.bdd, not args.sans_oversampling, args.mesure)
+    except sqlite3.OperationalError:
+        sys.exit(f"Pas de balayage des tranches dans {args.bdd} (lancer balayage_tranches.py).")
+    if not tranches:
+        sys.exit(f"Aucun résultat pour ce réglage dans {args.bdd}.")
+
+    spec = fscore_spec(args.sortie, tranches, models, f1_scores, not args.sans_oversampling, args.mesure)
+    dessines, _, duree = rendu_graphiques.render(args.bdd, [spec], n_workers=1)
+    print(f"{args.sortie} {'dessiné' if dessines else 'inchangé'} ({duree:.2f} s)")
@@ -0,0 +1,161 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+import corpus
+
+# Identification de la langue des reviews par lots, sans appel de langdetect review par review.
+# Les profils de n-grammes de caractères (1 à 3) fournis avec langdetect (55 langues) forment une matrice de
+# log-probabilités (n-gramme x langue). Les n-grammes étant pris mot par mot (comme langdetect), le score d'un texte
+# est la somme des scores de ses mots : chaque mot distinct n'est décomposé et évalué qu'une fois (scores gardés en
+# mémoire), puis un lot de textes est classé par un produit matriciel creux (texte x mot) x (mot x langue).
+# Le lissage reprend celui de langdetect (alpha / BASE_FREQ), mais tous les n-grammes sont comptés (langdetect en tire
+# un échantillon aléatoire) : le résultat est déterministe.
+# Seuls l'anglais et le français sont utilisés par les analyses ; les autres codes servent à écarter les reviews.
+LISSAGE = 0.5 / 10000
+LONGUEUR_MAX = 10000 # Comme langdetect : au-delà, le texte n'apporte plus rien à la décision
+TAILLE_LOT = 2000
+MOTS_MAX = 500000 # Mots distincts gardés en mémoire (environ 110 Mo de scores) avant de repartir de zéro
+MOTIF_URL = re.compile(r"https?://\S+|\S+@\S+\.\S+")
+MOTIF_NON_LETTRE = re.compile(r"[\W\d_]+")
+MOTEUR = {}
+
+# Fonction normalisant un texte comme langdetect (adresses retirées, tout ce qui n'est pas une lettre remplacé par un espace)
+def normaliser(texte):
+    return MOTIF_NON_LETTRE.sub(" ", MOTIF_URL.sub(" ", texte[:LONGUEUR_MAX]))
+
+# Fonction renvoyant le dossier des profils de langues fournis avec langdetect
+def dossier_profils():
+    import langdetect
+    return os.path.join(os.path.dirname(langdetect.__file__), "profiles")
+
+# Fonction construisant le moteur (compteur de n-grammes des mots, matrice de log-probabilités, codes des langues), une seule fois
+def moteur(dossier=None):
+    if "compteur" not in MOTEUR:
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        dossier = dossier or dossier_profils()
+        profils = []
+        for nom in sorted(os.listdir(dossier)):
+            with open(os.path.join(dossier, nom), "r", encoding="utf-8") as f:
+                profils.append(json.load(f))
+        vocabulaire = {}
+        for profil in profils:
+            for ngramme in profil["freq"]:
+                vocabulaire.setdefault(ngramme, len(vocabulaire))
+
+        poids = np.zeros((len(vocabulaire), len(profils)), dtype=np.float32)
+        for j, profil in enumerate(profils):
+            probas = np.zeros(len(vocabulaire), dtype=np.float64)
+            for ngramme, freq in profil["freq"].items():
+                probas[vocabulaire[ngramme]] = freq / profil["n_words"][len(ngramme) - 1]
+            poids[:, j] = np.log(probas + LISSAGE)
+
+        MOTEUR["compteur"] = CountVectorizer(analyzer="char_wb", ngram_range=(1, 3), lowercase=False,
+                                             vocabulary=vocabulaire, dtype=np.float32)
+        MOTEUR["poids"] = poids
+        MOTEUR["codes"] = [profil["name"] for profil in profils]
+    return MOTEUR["compteur"], MOTEUR["poids"], MOTEUR["codes"]
+
+# Fonction ajoutant au cache des mots les scores (par langue) des mots encore inconnus
+def evaluer_mots(nouveaux):
+    import numpy as np
+    compteur, poids, _ = moteur()
+    if "scores_mots" not in MOTEUR:
+        MOTEUR["mots"] = {}
+        MOTEUR["scores_mots"] = np.empty((max(1024, len(nouveaux)), poids.shape[1] + 1), dtype=np.float32)
+    mots, scores_mots = MOTEUR["mots"], MOTEUR["scores_mots"]
+    debut = len(mots)
+    if debut + len(nouveaux) > len(scores_mots): # Capacité doublée plutôt qu'agrandie à chaque lot
+        scores_mots = np.resize(scores_mots, (max(2 * len(scores_mots), debut + len(nouveaux)), scores_mots.shape[1]))
+        MOTEUR["scores_mots"] = scores_mots
+    X = compteur.transform(nouveaux)
+    scores_mots[debut:debut + len(nouveaux), :-1] = (X @ poids) if X.nnz else 0
+    scores_mots[debut:debut + len(nouveaux), -1] = np.diff(X.indptr) > 0 # Dernière colonne : le mot a des n-grammes connus
+    for i, mot in enumerate(nouveaux, debut):
+        mots[mot] = i
+
+# Fonction identifiant la langue de chaque texte d'une liste (code ISO, ou None sans aucun n-gramme connu), par lots
+def identifier(textes):
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    _, _, codes = moteur()
+    langues = []
+    for debut in range(0, len(textes), TAILLE_LOT):
+        lot = [normaliser(texte).split() for texte in textes[debut:debut + TAILLE_LOT]]
+        mots = MOTEUR.get("mots", {})
+        nouveaux = list({mot for texte in lot for mot in texte if mot not in mots})
+        if len(mots) + len(nouveaux) > MOTS_MAX: # Cache plein : vidé, les mots du lot sont tous réévalués
+            MOTEUR.pop("scores_mots", None)
+            mots = {}
+            nouveaux = list({mot for texte in lot for mot in texte})
+        if nouveaux or "scores_mots" not in MOTEUR:
+            evaluer_mots(nouveaux)
+            mots = MOTEUR["mots"]
+        indices = [mots[mot] for texte in lot for mot in texte]
+        indptr = np.cumsum([0] + [len(texte) for texte in lot])
+        D = csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(lot), len(mots)))
+        scores = D @ MOTEUR["scores_mots"][:len(mots)]
+        meilleures = scores[:, :-1].argmax(axis=1)
+        langues.extend(codes[i] if connu > 0 else None for i, connu in zip(meilleures, scores[:, -1]))
+    return langues
+
+# Fonction identifiant la langue d'un seul texte
+def identifier_langue(texte):
+    return identifier([texte])[0]
+
+# Fonction ramenant un code de langue aux trois classes utilisées par les analyses
+def classe(langue):
+    return langue if langue in ("en", "fr") else "autre"
+
+# Fonction comparant l'identification par lots à langdetect (graine 0) sur un corpus :
+# renvoie l'accord sur en/fr/autre, la matrice de confusion et les débits (reviews/s) des deux méthodes
+def comparer(root, tranches=None, limite=None):
+    from langdetect import detect, DetectorFactory
+    textes = [review["texte"] for review in corpus.iter_reviews(root, tranches)][:limite]
+
+    moteur() # Profils chargés hors mesure, comme ceux de langdetect ci-dessous
+    DetectorFactory.seed = 0
+    detect("warm up")
+    start = time.perf_counter()
+    references = []
+    for texte in textes:
+        try:
+            references.append(detect(texte))
+        except Exception:
+            references.append(None)
+    duree_langdetect = time.perf_counter() - start
+
+    start = time.perf_counter()
+    identifiees = identifier(textes)
+    duree_lots = time.perf_counter() - start
+
+    confusion = {}
+    for reference, identifiee in zip(references, identifiees):
+        cle = (classe(reference), classe(identifiee))
+        confusion[cle] = confusion.get(cle, 0) + 1
+    accord = sum(n for (a, b), n in confusion.items() if a == b) / max(1, len(textes))
+    return {"reviews": len(textes), "accord": accord, "confusion": confusion,
+            "debit_langdetect": len(textes) / duree_langdetect if duree_langdetect else None,
+            "debit_lots": len(textes) / duree_lots if duree_lots else None}
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Identification de la langue des reviews par lots (n-grammes de caractères).")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, toutes par défaut)")
+    parser.add_argument("--limite", type=int, help="Nombre maximal de reviews comparées")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    resultat = comparer(args.corpus, args.tranche, args.limite)
+    print(f"{resultat['reviews']} reviews, accord avec langdetect (en/fr/autre) : {resultat['accord']:.2%}")
+    print(f"langdetect : {resultat['debit_langdetect']:.0f} reviews/s ; par lots : {resultat['debit_lots']:.0f} reviews/s "
+          f"(x{resultat['debit_lots'] / resultat['debit_langdetect']:.1f})")
+    print("langdetect -> par lots :")
+    for (reference, identifiee), n in sorted(resultat["confusion"].items()):
+        print(f"  {reference:<6} -> {identifiee:<6} {n}")
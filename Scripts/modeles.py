@@ -0,0 +1,148 @@
+import sys
+import json
+import argparse
+import importlib
+
+# Registre des classifieurs comparables. Chaque entrée déclare :
+#   - "fabrique" : fonction créant un modèle neuf
+#   - "creux" : le modèle accepte une matrice creuse (sinon elle est densifiée pour lui seul)
+#   - "partial_fit" : le modèle peut être entraîné par paquets (mode flux)
+#   - "complexite" : coût de l'entraînement en fonction du nombre de reviews
+#   - "defaut" : le modèle fait partie de la sélection par défaut
+#   - "hyperparametres" : espace exploré par le mode réglage (listes de valeurs ou {"loguniform": [min, max]},
+#     voir recherche_hyperparametres.py)
+# scikit-learn n'est importé qu'à la création du premier modèle : le registre peut être listé sans lui.
+
+# Fonction important une classe à partir de son chemin complet (ex : "sklearn.svm.LinearSVC")
+def import_class(path):
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+# Fonction créant un modèle à partir du chemin de sa classe et de ses paramètres
+def build(path, **params):
+    return import_class(path)(**params)
+
+# Fonction créant un pipeline à partir d'étapes (chemin de la classe, paramètres)
+def build_steps(*steps):
+    from sklearn.pipeline import make_pipeline
+    return make_pipeline(*(build(path, **params) for path, params in steps))
+
+REGISTRE = {
+    "Naive Bayes": {
+        "fabrique": lambda: build("sklearn.naive_bayes.MultinomialNB"),
+        "creux": True, "partial_fit": True, "complexite": "linéaire", "defaut": True,
+        "hyperparametres": {"alpha": {"loguniform": [1e-3, 1]}}
+    },
+    "SVM": {
+        "fabrique": lambda: build("sklearn.svm.SVC"),
+        "creux": True, "partial_fit": False, "complexite": "quadratique à cubique", "defaut": True,
+        "hyperparametres": {"C": {"loguniform": [1e-1, 1e2]}, "gamma": ["scale", 0.1, 1.0]}
+    },
+    "Random Forest": {
+        "fabrique": lambda: build("sklearn.ensemble.RandomForestClassifier", n_jobs=-1),
+        "creux": True, "partial_fit": False, "complexite": "n log n", "defaut": True,
+        "hyperparametres": {"n_estimators": [100, 300], "max_depth": [None, 50, 200], "min_samples_leaf": [1, 2, 5]}
+    },
+    "Logistic Regression": {
+        "fabrique": lambda: build("sklearn.linear_model.LogisticRegression", max_iter=1000),
+        "creux": True, "partial_fit": False, "complexite": "linéaire", "defaut": True,
+        "hyperparametres": {"C": {"loguniform": [1e-2, 1e2]}}
+    },
+    "Linear SVM": {
+        "fabrique": lambda: build("sklearn.svm.LinearSVC"),
+        "creux": True, "partial_fit": False, "complexite": "linéaire", "defaut": False,
+        "hyperparametres": {"C": {"loguniform": [1e-2, 1e2]}}
+    },
+    "SGD (log)": {
+        "fabrique": lambda: build("sklearn.linear_model.SGDClassifier", loss="log_loss", random_state=42),
+        "creux": True, "partial_fit": True, "complexite": "linéaire", "defaut": False,
+        "hyperparametres": {"alpha": {"loguniform": [1e-6, 1e-2]}}
+    },
+    "SGD (hinge)": {
+        "fabrique": lambda: build("sklearn.linear_model.SGDClassifier", loss="hinge", random_state=42),
+        "creux": True, "partial_fit": True, "complexite": "linéaire", "defaut": False,
+        "hyperparametres": {"alpha": {"loguniform": [1e-6, 1e-2]}}
+    },
+    "Passive Aggressive": { # Équivalent de PassiveAggressiveClassifier (déprécié depuis scikit-learn 1.8)
+        "fabrique": lambda: build("sklearn.linear_model.SGDClassifier", loss="hinge", penalty=None, learning_rate="pa1", eta0=1.0, random_state=42),
+        "creux": True, "partial_fit": True, "complexite": "linéaire", "defaut": False,
+        "hyperparametres": {"eta0": {"loguniform": [1e-2, 1e1]}}
+    },
+    "Nystroem + Linear SVM": { # Approximation du noyau RBF du SVM, en temps linéaire
+        "fabrique": lambda: build_steps(("sklearn.kernel_approximation.Nystroem", {"kernel": "rbf", "n_components": 300, "random_state": 42}),
+                                       ("sklearn.svm.LinearSVC", {})),
+        "creux": True, "partial_fit": False, "complexite": "linéaire", "defaut": False,
+        "hyperparametres": {"nystroem__gamma": {"loguniform": [1e-2, 1e1]}, "linearsvc__C": {"loguniform": [1e-2, 1e2]}}
+    },
+    "RBFSampler + SGD": {
+        "fabrique": lambda: build_steps(("sklearn.kernel_approximation.RBFSampler", {"n_components": 500, "random_state": 42}),
+                                       ("sklearn.linear_model.SGDClassifier", {"loss": "hinge", "random_state": 42})),
+        "creux": True, "partial_fit": False, "complexite": "linéaire", "defaut": False,
+        "hyperparametres": {"rbfsampler__gamma": {"loguniform": [1e-2, 1e1]}, "sgdclassifier__alpha": {"loguniform": [1e-6, 1e-2]}}
+    }
+}
+
+# Fonction chargeant le registre, complété par un fichier de configuration JSON de la forme :
+# {"modeles": {"Nom": {"classe": "sklearn.svm.LinearSVC", "params": {"C": 0.5}, "creux": true, "partial_fit": false,
+#                       "hyperparametres": {"C": [0.1, 1, 10]}}},
+#  "selection": ["Naive Bayes", "Nom"]}
+def load_registry(config_path=None):
+    registre = dict(REGISTRE)
+    selection = default_selection(registre)
+    if not config_path:
+        return registre, selection
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    for name, entry in config.get("modeles", {}).items():
+        cls = import_class(entry["classe"])
+        params = entry.get("params", {})
+        registre[name] = {
+            "fabrique": lambda path=entry["classe"], params=params: build(path, **params),
+            "creux": entry.get("creux", True),
+            "partial_fit": entry.get("partial_fit", hasattr(cls, "partial_fit")),
+            "complexite": entry.get("complexite", "inconnue"),
+            "defaut": entry.get("defaut", False),
+            "hyperparametres": entry.get("hyperparametres", {})
+        }
+    selection = config.get("selection", selection)
+    unknown = [name for name in selection if name not in registre]
+    if unknown:
+        raise ValueError(f"Modèles inconnus dans la configuration : {', '.join(unknown)}")
+    return registre, selection
+
+# Fonction renvoyant les noms des modèles sélectionnés par défaut
+def default_selection(registre=REGISTRE):
+    return [name for name, entry in registre.items() if entry["defaut"]]
+
+# Fonction créant les modèles demandés ; n_jobs ne remplace que celui des modèles déjà parallélisés par leur fabrique
+def create_models(names, registre=REGISTRE, n_jobs=None):
+    models = {}
+    for name in names:
+        model = registre[name]["fabrique"]()
+        if n_jobs is not None and model.get_params().get("n_jobs") is not None:
+            model.set_params(n_jobs=n_jobs)
+        models[name] = model
+    return models
+
+# Fonction renvoyant les modèles à densifier (ceux qui ne déclarent pas accepter les matrices creuses)
+def dense_models(names, registre=REGISTRE):
+    return {name for name in names if not registre[name]["creux"]}
+
+# Fonction renvoyant les modèles utilisables en mode flux (partial_fit, sur les matrices creuses du HashingVectorizer)
+def streaming_capable(names, registre=REGISTRE):
+    return [name for name in names if registre[name]["partial_fit"] and registre[name]["creux"]]
+
+if __name__ == "__main__": # Lancement en ligne de commande : affichage du registre
+    parser = argparse.ArgumentParser(description="Registre des classifieurs comparés.")
+    parser.add_argument("--config-modeles", help="Fichier JSON complétant le registre")
+    args = parser.parse_args()
+
+    try:
+        registre, selection = load_registry(args.config_modeles)
+    except (OSError, ValueError, ImportError, AttributeError) as e:
+        sys.exit(f"Configuration invalide : {e}")
+    print(f"{'Modèle':<26} {'Creux':>6} {'partial_fit':>12} {'Sélection':>10}  Complexité")
+    for name, entry in registre.items():
+        print(f"{name:<26} {'oui' if entry['creux'] else 'non':>6} {'oui' if entry['partial_fit'] else 'non':>12} "
+              f"{'x' if name in selection else '':>10}  {entry['complexite']}")
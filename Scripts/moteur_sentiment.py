@@ -0,0 +1,78 @@
+import sys
+import argparse
+
+import identification_langue
+
+# Moteur de sentiment partagé par l'analyse de sentiment (sentiment_reviews.py) et les mesures d'évaluation (scores_evaluation.py) :
+# VADER de NLTK pour l'anglais, analyseur Pattern de textblob-fr pour le français, sentiment nul pour les autres langues.
+# Le lexique VADER et l'analyseur français sont chargés une seule fois, au premier texte à analyser ; le lexique n'est jamais
+# téléchargé ici (étape d'installation explicite : python requirements.py --donnees).
+ANALYSEURS = {}
+ANALYSEUR_PAR_LANGUE = {"en": "vader", "fr": "textblob-fr"} # Sentiment nul ("aucun") pour les autres langues
+
+# Fonction renvoyant l'analyseur VADER de NLTK (chargé une seule fois)
+def vader():
+    if "vader" not in ANALYSEURS:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        try:
+            ANALYSEURS["vader"] = SentimentIntensityAnalyzer()
+        except LookupError:
+            raise RuntimeError("Lexique VADER absent : lancer « python requirements.py --donnees » (ou --depuis <archive> hors ligne).") from None
+    return ANALYSEURS["vader"]
+
+# Fonction renvoyant l'analyseur du français de textblob-fr (créé une seule fois ; son lexique est lu au premier texte)
+def analyseur_fr():
+    if "textblob-fr" not in ANALYSEURS:
+        from textblob_fr import PatternAnalyzer
+        ANALYSEURS["textblob-fr"] = PatternAnalyzer()
+    return ANALYSEURS["textblob-fr"]
+
+# Fonction chargeant tous les analyseurs et leurs lexiques (préparation d'un processus de travail)
+def charger():
+    vader()
+    analyseur_fr().analyze("Un très bon jeu")
+
+# Fonction renvoyant le nom de l'analyseur utilisé pour une langue
+def analyseur(langue):
+    return ANALYSEUR_PAR_LANGUE.get(langue, "aucun")
+
+# Fonction renvoyant la version de chaque analyseur : les scores enregistrés par une autre version sont recalculés
+def versions_analyseurs():
+    from importlib import metadata
+    def version(paquet):
+        try:
+            return metadata.version(paquet)
+        except metadata.PackageNotFoundError:
+            return "absent"
+    return {"vader": f"nltk {version('nltk')}", "textblob-fr": f"textblob {version('textblob')} textblob-fr {version('textblob-fr')}",
+            "aucun": "1"}
+
+# Fonction calculant le sentiment d'un texte dont la langue est connue (compound VADER, polarité textblob-fr, 0 sinon)
+def score_texte(texte, langue):
+    if langue == "en":
+        return vader().polarity_scores(texte)["compound"]
+    if langue == "fr":
+        return analyseur_fr().analyze(texte)[0]
+    return 0.0
+
+# Fonction calculant le sentiment d'une liste de textes ; les langues sont identifiées par lots si elles ne sont pas fournies.
+# Renvoie un tableau numpy (float64) de même longueur que textes.
+def score(textes, langues=None):
+    import numpy as np
+    if langues is None:
+        langues = identification_langue.identifier(textes)
+    return np.fromiter((score_texte(texte, langue) for texte, langue in zip(textes, langues)), dtype=np.float64, count=len(textes))
+
+if __name__ == "__main__": # Lancement en ligne de commande : sentiment de textes passés en argument ou lus sur l'entrée standard
+    parser = argparse.ArgumentParser(description="Sentiment de textes (VADER pour l'anglais, textblob-fr pour le français).")
+    parser.add_argument("textes", nargs="*", help="Textes analysés (une ligne de l'entrée standard par texte sinon)")
+    args = parser.parse_args()
+
+    textes = args.textes or [ligne.rstrip("\n") for ligne in sys.stdin if ligne.strip()]
+    langues = identification_langue.identifier(textes)
+    try:
+        scores = score(textes, langues)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    for texte, langue, valeur in zip(textes, langues, scores):
+        print(f"{valeur:+.4f}  {langue or '-':<6} {texte[:80]}")
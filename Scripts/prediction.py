@@ -0,0 +1,134 @@
+import os
+import sys
+import csv
+import json
+import time
+import platform
+import argparse
+import warnings
+from datetime import datetime
+
+import corpus
+
+# Pipeline de classification persistant : le vectoriseur ajusté et le modèle retenu sont enregistrés ensemble
+# (<nom>.joblib) avec un fichier de métadonnées (<nom>.json) décrivant l'entraînement et les versions utilisées.
+# Ce module n'importe pas Qt : il sert au score en ligne de commande des reviews nouvellement téléchargées.
+VERSION_FORMAT = 1
+NOM_PIPELINE = "modele_classifieur"
+TAILLE_LOT = 2000
+
+# Fonction enregistrant un pipeline ajusté et ses métadonnées ; renvoie le chemin du fichier .joblib
+def save_pipeline(pipeline, folder, metadata, name=NOM_PIPELINE):
+    import numpy as np
+    import joblib
+    import sklearn
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name + ".joblib")
+    metadata = dict(metadata, **{
+        "format": VERSION_FORMAT,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "sklearn": sklearn.__version__,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "probabilites": hasattr(pipeline, "predict_proba")
+    })
+    tmp = path + ".tmp"
+    joblib.dump(pipeline, tmp)
+    os.replace(tmp, path)
+    with open(os.path.join(folder, name + ".json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    return path
+
+# Fonction chargeant un pipeline et ses métadonnées (avertit si la version de scikit-learn diffère de celle de l'entraînement)
+def load_pipeline(path):
+    import joblib
+    import sklearn
+    with open(os.path.splitext(path)[0] + ".json", "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("format") != VERSION_FORMAT:
+        raise ValueError(f"Format de pipeline non pris en charge : {metadata.get('format')}")
+    if metadata.get("sklearn") != sklearn.__version__:
+        warnings.warn(f"Pipeline entraîné avec scikit-learn {metadata.get('sklearn')}, chargé avec {sklearn.__version__}")
+    return joblib.load(path), metadata
+
+# Fonction renvoyant les labels prédits et la probabilité d'un avis positif (None si le modèle ne la fournit pas)
+def predict_batch(pipeline, textes):
+    if hasattr(pipeline, "predict_proba"):
+        proba = pipeline.predict_proba(textes)[:, 1]
+        return (proba >= 0.5).astype(int), proba
+    return pipeline.predict(textes), None
+
+# Fonction générant les paquets de reviews d'un corpus (arborescence, shard ou base SQLite) ou d'un dossier
+# téléchargé par SteamReviewDownloader.py / telechargement_lot.py (<dossier>/review_*.txt ou <dossier>/<jeu>/review_*.txt)
+def iter_batches(source, tranches=None, batch_size=TAILLE_LOT, stats=None):
+    batch = []
+    if corpus.est_dossier_reviews(source):
+        reviews = corpus.iter_reviews_dossier(source, 0, stats)
+    else:
+        reviews = corpus.iter_reviews(source, tranches, 0, stats)
+    for review in reviews:
+        batch.append(review)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# Fonction classant toutes les reviews d'un corpus par paquets et écrivant les prédictions par review et par jeu (CSV).
+# Renvoie le nombre de reviews classées, la durée, et le taux d'accord avec la Note Steam des reviews.
+def predict_corpus(pipeline, source, output_folder, tranches=None, batch_size=TAILLE_LOT):
+    os.makedirs(output_folder, exist_ok=True)
+    jeux = {}
+    total = accord = 0
+    start = time.perf_counter()
+
+    with open(os.path.join(output_folder, "predictions_reviews.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["tranche", "jeu", "chemin", "recommendationid", "label", "label_predit", "probabilite_positive"])
+        for batch in iter_batches(source, tranches, batch_size):
+            labels, proba = predict_batch(pipeline, [review["texte"] for review in batch])
+            for i, review in enumerate(batch):
+                p = float(proba[i]) if proba is not None else None
+                writer.writerow([review["tranche"], review["jeu"], review["chemin"] or "", review["recommendationid"] or "",
+                                 review["label"], int(labels[i]), f"{p:.4f}" if p is not None else ""])
+                jeu = jeux.setdefault((review["tranche"], review["jeu"]), {"n": 0, "positifs": 0, "reels": 0, "proba": 0.0})
+                jeu["n"] += 1
+                jeu["positifs"] += int(labels[i])
+                jeu["reels"] += review["label"]
+                jeu["proba"] += p if p is not None else 0.0
+                accord += int(labels[i]) == review["label"]
+            total += len(batch)
+
+    with open(os.path.join(output_folder, "predictions_jeux.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["tranche", "jeu", "reviews", "part_positive_predite", "probabilite_positive_moyenne", "part_positive_steam"])
+        for (tranche, nom), jeu in sorted(jeux.items()):
+            writer.writerow([tranche, nom, jeu["n"], f"{jeu['positifs'] / jeu['n']:.4f}",
+                             f"{jeu['proba'] / jeu['n']:.4f}" if hasattr(pipeline, "predict_proba") else "",
+                             f"{jeu['reels'] / jeu['n']:.4f}"])
+
+    return total, time.perf_counter() - start, (accord / total if total else 0.0)
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Classement de reviews avec un pipeline enregistré par analyse_classifieurs.py.")
+    parser.add_argument("modele", help="Pipeline enregistré (ex : resultats/modele_classifieur.joblib)")
+    parser.add_argument("source", help="Reviews à classer (arborescence data/, corpus shard, base de reviews ou dossier téléchargé)")
+    parser.add_argument("--sortie", default="predictions", help="Dossier des fichiers CSV")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, toutes par défaut)")
+    parser.add_argument("--taille-lot", type=int, default=TAILLE_LOT, help="Nombre de reviews classées par paquet")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        sys.exit(f"{args.source} n'existe pas.")
+    try:
+        pipeline, metadata = load_pipeline(args.modele)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Impossible de charger le pipeline : {e}")
+
+    print(f"Modèle : {metadata['modele']} (f1 {metadata['f1-score']:.4f}, entraîné le {metadata['date']})")
+    total, duree, accord = predict_corpus(pipeline, args.source, args.sortie, args.tranche, args.taille_lot)
+    if not total:
+        sys.exit(f"Aucune review à classer dans {args.source} (fichiers review_*.txt avec une ligne « Note » attendus).")
+    print(f"{total} reviews classées en {duree:.2f} s ({total / duree if duree else 0:.0f} reviews/s)")
+    print(f"Accord avec la Note Steam : {accord:.2%}")
+    print(f"Résultats : {os.path.join(args.sortie, 'predictions_reviews.csv')}, {os.path.join(args.sortie, 'predictions_jeux.csv')}")
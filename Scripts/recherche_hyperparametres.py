@@ -0,0 +1,173 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+
+import corpus
+import modeles
+
+# Réglage des hyperparamètres par "successive halving" : chaque candidat (vectoriseur + modèle) est d'abord évalué
+# sur un petit échantillon de reviews, seul le meilleur tiers passe au tour suivant avec trois fois plus de reviews.
+# Les vectorisations TF-IDF communes à plusieurs candidats (mêmes paramètres, mêmes reviews) sont mises en cache (Pipeline(memory=)).
+DOSSIER_CACHE_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "reviews", "recherche")
+TAILLE_CACHE_MAX = 2 * 1024 * 1024 * 1024
+N_CANDIDATS = 24
+FACTEUR = 3
+
+# Espace exploré pour le vectoriseur, commun à tous les modèles
+ESPACE_VECTORISEUR = {
+    "tfidf__ngram_range": [(1, 1), (1, 2)],
+    "tfidf__min_df": [1, 2, 5],
+    "tfidf__max_features": [5000, 20000, None],
+    "tfidf__sublinear_tf": [False, True]
+}
+
+# Fonction densifiant la matrice TF-IDF (uniquement pour les modèles qui n'acceptent pas les matrices creuses)
+def densify(X):
+    return X.toarray()
+
+# Fonction convertissant les valeurs d'un hyperparamètre du registre en distribution (liste ou loi log-uniforme)
+def distribution(values):
+    if isinstance(values, dict) and "loguniform" in values:
+        from scipy.stats import loguniform
+        return loguniform(*values["loguniform"])
+    return values
+
+# Fonction construisant le pipeline vectoriseur + modèle et l'espace de recherche associé
+def build_pipeline(name, registre=modeles.REGISTRE, cache_dir=None):
+    from joblib import Memory
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import FunctionTransformer
+    from sklearn.pipeline import Pipeline
+    entry = registre[name]
+    steps = [("tfidf", TfidfVectorizer())]
+    if not entry["creux"]:
+        steps.append(("dense", FunctionTransformer(densify, accept_sparse=True)))
+    steps.append(("clf", modeles.create_models([name], registre, n_jobs=1)[name])) # Les cœurs sont répartis entre les candidats
+    space = dict(ESPACE_VECTORISEUR)
+    space.update({f"clf__{param}": distribution(values) for param, values in entry.get("hyperparametres", {}).items()})
+    memory = Memory(cache_dir, verbose=0) if cache_dir else None
+    return Pipeline(steps, memory=memory), space
+
+# Fonction réglant un modèle ; renvoie la recherche ajustée (best_params_, best_score_, cv_results_, best_estimator_)
+def search_model(name, X, y, registre=modeles.REGISTRE, n_candidates=N_CANDIDATS, n_jobs=-1, cache_dir=DOSSIER_CACHE_DEFAUT, random_state=42):
+    import numpy as np
+    from sklearn.experimental import enable_halving_search_cv # noqa: F401 (active HalvingRandomSearchCV)
+    from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold
+    pipeline, space = build_pipeline(name, registre, cache_dir)
+    search = HalvingRandomSearchCV(
+        pipeline, space, n_candidates=n_candidates, factor=FACTEUR, resource="n_samples", min_resources="exhaust",
+        cv=StratifiedKFold(n_splits=3, shuffle=True, random_state=random_state), scoring="f1_weighted",
+        n_jobs=n_jobs, random_state=random_state, error_score=np.nan
+    )
+    search.fit(np.asarray(X, dtype=object), np.asarray(y))
+    if pipeline.memory is not None:
+        pipeline.memory.reduce_size(bytes_limit=TAILLE_CACHE_MAX) # Éviction des vectorisations les moins récemment utilisées
+    return search
+
+# Fonction renvoyant la trace d'une recherche : une ligne par candidat et par tour
+def search_trace(name, search):
+    cv = search.cv_results_
+    return [{
+        "modele": name, "tour": int(cv["iter"][i]), "n_reviews": int(cv["n_resources"][i]),
+        "parametres": format_params(cv["params"][i]), "f1_moy": float(cv["mean_test_score"][i]),
+        "f1_std": float(cv["std_test_score"][i]), "duree_fit": float(cv["mean_fit_time"][i])
+    } for i in range(len(cv["params"]))]
+
+# Fonction sérialisant un jeu de paramètres (les tuples et objets numpy sont convertis pour JSON)
+def format_params(params):
+    import numpy as np
+    return json.dumps({k: v.item() if isinstance(v, np.generic) else v for k, v in sorted(params.items())}, default=str)
+
+# Fonction réglant tous les modèles demandés.
+# Renvoie le meilleur réglage par modèle, la trace complète et les recherches ajustées.
+def hyperparameter_search(names, X, y, registre=modeles.REGISTRE, n_candidates=N_CANDIDATS, n_jobs=-1, cache_dir=DOSSIER_CACHE_DEFAUT):
+    best, trace, searches = {}, [], {}
+    for name in names:
+        start = time.perf_counter()
+        search = search_model(name, X, y, registre, n_candidates, n_jobs, cache_dir)
+        n_splits = search.cv.get_n_splits()
+        best[name] = {"f1": float(search.best_score_), "parametres": format_params(search.best_params_),
+                      "candidats": int(search.n_candidates_[0]), "tours": int(search.n_iterations_),
+                      "duree": time.perf_counter() - start,
+                      # Temps cumulés de tous les candidats, sur tous les plis et tous les tours
+                      "fit": float(search.cv_results_["mean_fit_time"].sum() * n_splits),
+                      "predict": float(search.cv_results_["mean_score_time"].sum() * n_splits)}
+        trace.extend(search_trace(name, search))
+        searches[name] = search
+    return best, trace, searches
+
+# Fonction enregistrant le meilleur réglage et la trace de la recherche dans la base de résultats
+def save_search_to_db(c, best, trace):
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS reglage_meilleur (
+            modele TEXT,
+            f1_cv REAL,
+            parametres TEXT,
+            candidats INTEGER,
+            tours INTEGER,
+            duree REAL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS reglage_trace (
+            modele TEXT,
+            tour INTEGER,
+            n_reviews INTEGER,
+            parametres TEXT,
+            f1_moy REAL,
+            f1_std REAL,
+            duree_fit REAL
+        )
+    """)
+    c.execute("DELETE FROM reglage_meilleur")
+    c.execute("DELETE FROM reglage_trace")
+    for name, b in best.items():
+        c.execute("INSERT INTO reglage_meilleur VALUES (?, ?, ?, ?, ?, ?)",
+                  (name, b["f1"], b["parametres"], b["candidats"], b["tours"], b["duree"]))
+    c.executemany("INSERT INTO reglage_trace VALUES (?, ?, ?, ?, ?, ?, ?)",
+                  [(t["modele"], t["tour"], t["n_reviews"], t["parametres"], t["f1_moy"], t["f1_std"], t["duree_fit"]) for t in trace])
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Réglage des hyperparamètres (vectoriseur + modèles) par successive halving.")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, toutes par défaut)")
+    parser.add_argument("--taille-min", type=int, default=1, help="Taille minimale des reviews")
+    parser.add_argument("--modeles", help="Modèles réglés, séparés par des virgules (sélection par défaut du registre)")
+    parser.add_argument("--config-modeles", help="Fichier JSON complétant le registre des modèles")
+    parser.add_argument("--candidats", type=int, default=N_CANDIDATS, help="Nombre de configurations tirées au premier tour")
+    parser.add_argument("--jobs", type=int, default=-1, help="Processus parallèles (-1 = tous les cœurs)")
+    parser.add_argument("--cache", default=DOSSIER_CACHE_DEFAUT, help="Dossier du cache des vectorisations")
+    parser.add_argument("--bdd", default="resultats_classifieurs.db", help="Base de résultats")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    try:
+        registre, selection = modeles.load_registry(args.config_modeles)
+    except (OSError, ValueError, ImportError, AttributeError) as e:
+        sys.exit(f"Configuration des modèles invalide : {e}")
+    names = args.modeles.split(",") if args.modeles else selection
+    unknown = [name for name in names if name not in registre]
+    if unknown:
+        sys.exit(f"Modèles inconnus : {', '.join(unknown)}")
+
+    X, y = [], []
+    for review in corpus.iter_reviews(args.corpus, args.tranche, args.taille_min):
+        X.append(review["texte"])
+        y.append(review["label"])
+    if len(X) < 30 or len(set(y)) < 2:
+        sys.exit("Pas assez de données pour régler les modèles.")
+
+    best, trace, _ = hyperparameter_search(names, X, y, registre, args.candidats, args.jobs, args.cache)
+    conn = sqlite3.connect(args.bdd)
+    with conn:
+        save_search_to_db(conn.cursor(), best, trace)
+    conn.close()
+
+    for name, b in best.items():
+        print(f"{name} : f1 (validation croisée) {b['f1']:.4f} en {b['duree']:.1f} s "
+              f"({b['candidats']} candidats, {b['tours']} tours)\n  {b['parametres']}")
+    print(f"Réglages et trace enregistrés dans {args.bdd}")
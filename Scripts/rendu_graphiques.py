@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Étape de rendu des graphiques : chaque analyse enregistre la description de ses graphiques (type, données, titres)
+# dans la table "graphiques" de sa base de résultats, puis les images sont produites hors écran (Agg, sans fenêtre)
+# par un pool de processus. Un graphique dont la description n'a pas changé depuis son dernier rendu n'est pas redessiné.
+#
+# Description d'un graphique (JSON) :
+#   {"type": "heatmap" | "lignes" | "barres" | "barres_h" | "barres_groupees", "fichier": "chemin.png",
+#    "titre": ..., "taille": [largeur, hauteur], "axe_x": ..., "axe_y": ..., "ylim": [min, max],
+#    "etiquettes": [...], "series": {"nom": [valeurs]} (ou "matrice" pour heatmap), options propres au type}
+
+# Fonction calculant l'empreinte d'une description de graphique (données comprises)
+def empreinte(spec):
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+# Fonction ouvrant la base de résultats et créant la table des graphiques
+def ouvrir_bdd(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS graphiques (
+            fichier TEXT PRIMARY KEY,
+            type TEXT,
+            spec TEXT,
+            empreinte TEXT,
+            empreinte_rendue TEXT,
+            duree REAL
+        )
+    """)
+    return conn
+
+# Fonction enregistrant (ou remplaçant) des descriptions de graphiques ; renvoie les chemins absolus des fichiers
+def store_specs(db_path, specs):
+    fichiers = []
+    conn = ouvrir_bdd(db_path)
+    with conn:
+        for spec in specs:
+            spec = dict(spec, fichier=os.path.abspath(spec["fichier"]))
+            conn.execute("""
+                INSERT INTO graphiques (fichier, type, spec, empreinte) VALUES (?, ?, ?, ?)
+                ON CONFLICT(fichier) DO UPDATE SET type = excluded.type, spec = excluded.spec, empreinte = excluded.empreinte
+            """, (spec["fichier"], spec["type"], json.dumps(spec, ensure_ascii=False), empreinte(spec)))
+            fichiers.append(spec["fichier"])
+    conn.close()
+    return fichiers
+
+# Fonction dessinant une matrice annotée (matrices de confusion)
+def draw_heatmap(ax, spec):
+    import seaborn as sns
+    sns.heatmap(spec["matrice"], annot=True, fmt=spec.get("format", "d"), cmap=spec.get("palette", "Blues"),
+                xticklabels=spec["etiquettes"], yticklabels=spec.get("etiquettes_y", spec["etiquettes"]),
+                cbar_kws={"label": spec.get("legende_barre", "")}, ax=ax)
+
+# Fonction dessinant une courbe par série sur des abscisses catégorielles
+def draw_lines(ax, spec):
+    x = range(len(spec["etiquettes"]))
+    marqueurs = spec.get("marqueurs", [None] * len(spec["series"]))
+    for (nom, valeurs), marqueur in zip(spec["series"].items(), marqueurs):
+        ax.plot(x, valeurs, label=nom, marker=marqueur)
+    ax.set_xticks(x)
+    ax.set_xticklabels(spec["etiquettes"], rotation=spec.get("rotation", 0))
+
+# Fonction dessinant une série en barres verticales
+def draw_bars(ax, spec):
+    (valeurs,) = spec["series"].values()
+    ax.bar(spec["etiquettes"], valeurs, color=spec.get("couleur"))
+
+# Fonction dessinant une série en barres horizontales (une par jeu)
+def draw_horizontal_bars(ax, spec):
+    (valeurs,) = spec["series"].values()
+    ax.barh(spec["etiquettes"], valeurs, color=spec.get("couleur"))
+
+# Fonction dessinant les séries en barres groupées par étiquette
+def draw_grouped_bars(ax, spec):
+    n = len(spec["series"])
+    width = 0.8 / n
+    for i, (nom, valeurs) in enumerate(spec["series"].items()):
+        ax.bar([p + i * width for p in range(len(spec["etiquettes"]))], valeurs, width, label=nom)
+    ax.set_xticks([p + width * (n - 1) / 2 for p in range(len(spec["etiquettes"]))])
+    ax.set_xticklabels(spec["etiquettes"])
+
+DESSINS = {
+    "heatmap": draw_heatmap,
+    "lignes": draw_lines,
+    "barres": draw_bars,
+    "barres_h": draw_horizontal_bars,
+    "barres_groupees": draw_grouped_bars
+}
+
+# Fonction produisant l'image d'un graphique avec le moteur Agg (aucune fenêtre, utilisable dans un processus de travail).
+# Renvoie (fichier, durée).
+def render_spec(spec):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    start = time.perf_counter()
+    fig = Figure(figsize=spec.get("taille", (8, 5)))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    DESSINS[spec["type"]](ax, spec)
+    ax.set_title(spec.get("titre", ""))
+    ax.set_xlabel(spec.get("axe_x", ""))
+    ax.set_ylabel(spec.get("axe_y", ""))
+    if "ylim" in spec:
+        ax.set_ylim(*spec["ylim"])
+    if spec.get("grille"):
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+    if spec.get("legende", spec["type"] in ("lignes", "barres_groupees")):
+        ax.legend()
+    fig.tight_layout()
+    os.makedirs(os.path.dirname(spec["fichier"]), exist_ok=True)
+    tmp = spec["fichier"] + ".tmp.png"
+    fig.savefig(tmp)
+    os.replace(tmp, spec["fichier"])
+    return spec["fichier"], time.perf_counter() - start
+
+# Fonction produisant les images des graphiques enregistrés dont la description a changé (ou dont l'image manque),
+# en parallèle sur n_workers processus (tous les cœurs par défaut). fichiers limite le rendu à ces graphiques ; forcer redessine tout.
+# Renvoie (nombre de graphiques dessinés, nombre de graphiques inchangés, durée réelle).
+def render_charts(db_path, fichiers=None, n_workers=None, forcer=False):
+    start = time.perf_counter()
+    conn = ouvrir_bdd(db_path)
+    rows = conn.execute("SELECT fichier, spec, empreinte, empreinte_rendue FROM graphiques").fetchall()
+    if fichiers is not None:
+        fichiers = {os.path.abspath(f) for f in fichiers}
+        rows = [row for row in rows if row[0] in fichiers]
+    pending = [(json.loads(spec), hash_) for fichier, spec, hash_, rendered in rows
+               if forcer or hash_ != rendered or not os.path.exists(fichier)]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers <= 1 or len(pending) <= 1:
+        outputs = [render_spec(spec) for spec, _ in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(pending))) as pool:
+            outputs = list(pool.map(render_spec, [spec for spec, _ in pending]))
+
+    with conn:
+        for (spec, hash_), (fichier, duree) in zip(pending, outputs):
+            conn.execute("UPDATE graphiques SET empreinte_rendue = ?, duree = ? WHERE fichier = ?", (hash_, duree, fichier))
+    conn.close()
+    return len(pending), len(rows) - len(pending), time.perf_counter() - start
+
+# Fonction enregistrant des descriptions de graphiques puis produisant ceux qui ont changé ; renvoie (dessinés, inchangés, durée)
+def render(db_path, specs, n_workers=None):
+    return render_charts(db_path, store_specs(db_path, specs), n_workers)
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Rendu hors écran des graphiques enregistrés dans une base de résultats.")
+    parser.add_argument("bdd", help="Base de résultats (table 'graphiques')")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processus parallèles (1 = séquentiel)")
+    parser.add_argument("--forcer", action="store_true", help="Redessiner aussi les graphiques inchangés")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.bdd):
+        sys.exit(f"{args.bdd} n'existe pas.")
+    dessines, inchanges, duree = render_charts(args.bdd, n_workers=max(1, args.workers), forcer=args.forcer)
+    print(f"{dessines} graphiques dessinés, {inchanges} inchangés, en {duree:.2f} s")
@@ -1,42 +1,73 @@
-import importlib
-import subprocess
-import sys
-
-# Liste des modules à vérifier et à installer si besoin
-modules = {
-    "requests": "requests",
-    "PySide6": "PySide6",
-    "pandas": "pandas",
-    "matplotlib": "matplotlib",
-    "scipy": "scipy",
-    "langdetect": "langdetect",
-    "textblob": "textblob",
-    "textblob_fr": "textblob-fr",
-    "nltk": "nltk",
-    "vaderSentiment": "vaderSentiment",
-    "sklearn": "scikit-learn",
-    "seaborn": "seaborn",
-    "numpy": "numpy"
-}
-
-# Fonction de vérification et d'installation des modules requis pour le projet
-def installer_module(module_name, pip_name):
-    try:
-        importlib.import_module(module_name)
-        print(f"{module_name} est déjà installé.")
-    except ImportError:
-        print(f"Installation de {module_name}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name])
-
-if __name__ == "__main__":
-    for module_name, pip_name in modules.items():
-        installer_module(module_name, pip_name)
-
-    # Téléchargement des données NLTK si nécessaire
-    try:
-        import nltk
-        nltk.download("vader_lexicon")
-        nltk.download("punkt") # Pas nécessairement obligatoire pour le projet mais peut l'être pour certaines machines
-        print("Téléchargement des données NLTK terminé.")
-    except ImportError:
-        print("NLTK n'a pas été trouvé pour le téléchargement des données.")
+import os
+import sys
+import shutil
+import argparse
+import importlib
+import subprocess
+
+# Liste des modules à vérifier et à installer si besoin
+modules = {
+    "requests": "requests",
+    "PySide6": "PySide6",
+    "pandas": "pandas",
+    "matplotlib": "matplotlib",
+    "scipy": "scipy",
+    "langdetect": "langdetect",
+    "textblob": "textblob",
+    "textblob_fr": "textblob-fr",
+    "nltk": "nltk",
+    "sklearn": "scikit-learn",
+    "seaborn": "seaborn",
+    "numpy": "numpy"
+}
+
+# Données NLTK utilisées par le projet (paquet -> sous-dossier de nltk_data). Elles ne sont plus téléchargées à l'import des scripts :
+# cette étape les installe une fois, depuis Internet ou depuis les archives .zip déjà téléchargées (machines hors ligne).
+donnees_nltk = {
+    "vader_lexicon": "sentiment",
+    "punkt": "tokenizers" # Pas nécessairement obligatoire pour le projet mais peut l'être pour certaines machines
+}
+
+# Fonction de vérification et d'installation des modules requis pour le projet
+def installer_module(module_name, pip_name):
+    try:
+        importlib.import_module(module_name)
+        print(f"{module_name} est déjà installé.")
+    except ImportError:
+        print(f"Installation de {module_name}...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name])
+
+# Fonction installant les données NLTK dans dossier (nltk_data de l'utilisateur par défaut),
+# en copiant <paquet>.zip depuis le dossier depuis s'il est fourni, sinon par téléchargement
+def installer_donnees(depuis=None, dossier=None):
+    dossier = dossier or os.path.join(os.path.expanduser("~"), "nltk_data")
+    for paquet, categorie in donnees_nltk.items():
+        if depuis:
+            archive = os.path.join(depuis, paquet + ".zip")
+            if not os.path.exists(archive):
+                print(f"{archive} introuvable : {paquet} non installé.")
+                continue
+            os.makedirs(os.path.join(dossier, categorie), exist_ok=True)
+            shutil.copy(archive, os.path.join(dossier, categorie, paquet + ".zip"))
+            print(f"{paquet} installé depuis {archive}.")
+        else:
+            import nltk
+            nltk.download(paquet, download_dir=dossier)
+    print(f"Données NLTK installées dans {dossier}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Installation des modules et des données NLTK du projet.")
+    parser.add_argument("--donnees", action="store_true", help="N'installer que les données NLTK (lexique VADER, punkt)")
+    parser.add_argument("--depuis", help="Dossier contenant vader_lexicon.zip et punkt.zip (installation hors ligne)")
+    parser.add_argument("--dossier-donnees", help="Dossier nltk_data de destination (~/nltk_data par défaut)")
+    args = parser.parse_args()
+
+    if not args.donnees:
+        for module_name, pip_name in modules.items():
+            installer_module(module_name, pip_name)
+
+    # Installation des données NLTK
+    try:
+        installer_donnees(args.depuis, args.dossier_donnees)
+    except ImportError:
+        print("NLTK n'a pas été trouvé pour le téléchargement des données.")
@@ -0,0 +1,263 @@
+import os
+import re
+import json
+import hashlib
+import requests
+
+# Téléchargement des reviews Steam sans interface graphique : utilisé par SteamReviewDownloader.py et telechargement_lot.py.
+STEAM_REVIEWS_URL = "https://store.steampowered.com/appreviews/{appid}"
+TAILLE_PAGE_MAX = 100 # Limite imposée par l'API Steam sur "num_per_page"
+FICHIER_CURSEUR = ".curseur_steam.json"
+FICHIER_SYNC = ".sync_steam.json"
+
+# Exception levée quand une page de l'API ne peut pas être récupérée (le curseur enregistré permet de reprendre plus tard)
+class SteamAPIError(Exception):
+    pass
+
+# Fonction générant les reviews Steam page par page, en suivant le curseur de l'API (reprise possible via un fichier de curseur).
+def iter_reviews(appid, count=20, language="all", checkpoint_path=None, session=None, base_url=STEAM_REVIEWS_URL, review_filter="recent", cache=None):
+    cursor, fetched = "*", 0
+
+    etat = load_checkpoint(checkpoint_path, appid, language)
+    if etat:
+        cursor, fetched = etat["cursor"], etat["recuperees"]
+
+    while fetched < count:
+        params = {
+            "json": 1,
+            # Avec un cache, on demande toujours des pages complètes pour qu'elles soient réutilisables quel que soit "count"
+            "num_per_page": TAILLE_PAGE_MAX if cache else min(TAILLE_PAGE_MAX, count - fetched),
+            "language": language,
+            "purchase_type": "all",
+            "filter": review_filter,
+            "cursor": cursor
+        }
+
+        # En synchronisation (filter=updated), la première page contient les dernières reviews : elle n'est pas lue dans le cache
+        data = fetch_page(appid, params, session, base_url, cache, rafraichir=review_filter == "updated" and cursor == "*")
+        reviews = data.get("reviews", [])
+        if not reviews:
+            break
+
+        for review in reviews[:count - fetched]:
+            yield review
+        fetched += min(len(reviews), count - fetched)
+
+        # Le lecteur a consommé toute la page : on peut enregistrer le curseur suivant
+        next_cursor = data.get("cursor")
+        if not next_cursor or next_cursor == cursor:
+            break
+        cursor = next_cursor
+        save_checkpoint(checkpoint_path, appid, language, cursor, fetched)
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+# Fonction récupérant une page de l'API, en passant par le cache disque s'il est fourni (voir cache_http.py).
+# Avec rafraichir=True, la page est redemandée à l'API (sauf en mode hors ligne) puis remplacée dans le cache.
+# Lève SteamAPIError si la page n'a pas pu être récupérée (erreur réseau, statut HTTP, réponse invalide ou refusée).
+def fetch_page(appid, params, session=None, base_url=STEAM_REVIEWS_URL, cache=None, rafraichir=False):
+    if cache and (not rafraichir or cache.hors_ligne):
+        data = cache.get(appid, params)
+        if data is not None:
+            return data
+
+    http = session or requests
+    try:
+        response = http.get(base_url.format(appid=appid), params=params, timeout=30)
+    except requests.RequestException as e:
+        raise SteamAPIError(f"AppID {appid} : erreur réseau ({e})") from e
+    if response.status_code != 200:
+        raise SteamAPIError(f"AppID {appid} : réponse HTTP {response.status_code} (curseur {params.get('cursor')})")
+    try:
+        data = response.json()
+    except ValueError as e:
+        raise SteamAPIError(f"AppID {appid} : réponse JSON invalide (curseur {params.get('cursor')})") from e
+    if not isinstance(data, dict) or not data.get("success", 1):
+        raise SteamAPIError(f"AppID {appid} : page refusée par l'API (curseur {params.get('cursor')})")
+
+    if cache:
+        cache.put(appid, params, data)
+    return data
+
+# Fonction lisant le fichier de curseur d'un téléchargement interrompu (ignoré s'il concerne un autre jeu ou une autre langue)
+def load_checkpoint(checkpoint_path, appid, language):
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            etat = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if str(etat.get("appid")) != str(appid) or etat.get("language") != language:
+        return None
+    return etat
+
+# Fonction enregistrant le curseur courant (écriture atomique pour survivre à un arrêt brutal)
+def save_checkpoint(checkpoint_path, appid, language, cursor, fetched):
+    if not checkpoint_path:
+        return
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"appid": str(appid), "language": language, "cursor": cursor, "recuperees": fetched}, f)
+    os.replace(tmp_path, checkpoint_path)
+
+# Fonction permettant de récupérér les reviews Steam par son API.
+def get_reviews(appid, count=20, language="all"):
+    return list(iter_reviews(appid, count, language))
+
+# Fonction écrivant un fichier review_N.txt via un fichier temporaire (os.replace) : un fichier n'est jamais à moitié écrit,
+# et la date de modification du dossier change, ce qui signale au manifeste du corpus (corpus.py) que le dossier est à relire
+def write_review_file(path, rating, content):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"Note : {rating}\n\n{content}")
+    os.replace(tmp_path, path)
+
+# Fonction sauvegardant les reviews collectés en fichiers texte (au fil de l'eau, sans garder les reviews en mémoire)
+def save_reviews_to_txt(reviews, output_folder, start_index=0):
+    os.makedirs(output_folder, exist_ok=True)
+    saved = 0
+
+    for i, review in enumerate(reviews, start=start_index):
+        content = review.get('review', '').strip()
+        voted_up = review.get('voted_up', None)
+        if not content:
+            continue
+
+        rating = "👍" if voted_up else "👎"
+
+        write_review_file(os.path.join(output_folder, f"review_{i+1}.txt"), rating, content)
+        saved += 1
+
+    return saved
+
+# Fonction ajoutant les reviews collectées à un corpus shard ouvert (alternative aux fichiers texte, voir corpus_shard.py).
+# Les reviews dont le recommendationid est dans "connues" (déjà présentes dans le corpus) sont ignorées.
+def save_reviews_to_shard(reviews, writer, tranche, jeu, connues=None):
+    saved = 0
+    for review in reviews:
+        content = review.get('review', '').strip()
+        if not content:
+            continue
+        rid = review.get('recommendationid')
+        if connues is not None and rid is not None:
+            if str(rid) in connues:
+                continue
+            connues.add(str(rid))
+        writer.write({
+            "tranche": tranche,
+            "jeu": jeu,
+            "label": 1 if review.get('voted_up') else 0,
+            "recommendationid": rid,
+            "langue": review.get('language'),
+            "timestamp": review.get('timestamp_updated'),
+            "texte": content
+        })
+        saved += 1
+    return saved
+
+# Fonction téléchargeant les reviews d'un jeu directement dans son dossier, en reprenant un téléchargement interrompu si besoin
+def download_reviews(appid, output_folder, count=20, language="all", session=None, base_url=STEAM_REVIEWS_URL, cache=None):
+    os.makedirs(output_folder, exist_ok=True)
+    checkpoint_path = os.path.join(output_folder, FICHIER_CURSEUR)
+
+    etat = load_checkpoint(checkpoint_path, appid, language)
+    start_index = etat["recuperees"] if etat else 0
+
+    reviews = iter_reviews(appid, count, language, checkpoint_path, session, base_url, cache=cache)
+    return save_reviews_to_txt(reviews, output_folder, start_index)
+
+# Fonction téléchargeant les reviews d'un jeu dans un corpus shard ouvert (writer partagé entre les jeux d'un lot)
+def download_reviews_to_shard(appid, writer, tranche, jeu, count=20, language="all", session=None, base_url=STEAM_REVIEWS_URL, cache=None, connues=None):
+    reviews = iter_reviews(appid, count, language, session=session, base_url=base_url, cache=cache)
+    return save_reviews_to_shard(reviews, writer, tranche, jeu, connues)
+
+# Fonction calculant l'empreinte du contenu d'une review (pour reconnaître les fichiers téléchargés avant la synchronisation)
+def content_hash(content):
+    return hashlib.sha1(content.strip().encode("utf-8")).hexdigest()
+
+# Fonction chargeant l'état de synchronisation d'un dossier de jeu (ou en créant un à partir des fichiers existants)
+def load_sync_state(output_folder, appid, language):
+    state_path = os.path.join(output_folder, FICHIER_SYNC)
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            etat = json.load(f)
+        if str(etat.get("appid")) == str(appid) and etat.get("language") == language:
+            etat["legacy"] = {}
+            return etat
+
+    # Première synchronisation : les fichiers déjà présents sont indexés par contenu pour ne pas être dupliqués
+    legacy, numero_max = {}, 0
+    if os.path.isdir(output_folder):
+        for fname in os.listdir(output_folder):
+            match = re.match(r"^review_(\d+)\.txt$", fname)
+            if not match:
+                continue
+            numero_max = max(numero_max, int(match.group(1)))
+            with open(os.path.join(output_folder, fname), "r", encoding="utf-8") as f:
+                f.readline()
+                legacy[content_hash(f.read())] = fname
+
+    return {"appid": str(appid), "language": language, "timestamp_updated": 0,
+            "prochain_numero": numero_max + 1, "reviews": {}, "legacy": legacy}
+
+# Fonction enregistrant l'état de synchronisation (écriture atomique)
+def save_sync_state(output_folder, etat):
+    state_path = os.path.join(output_folder, FICHIER_SYNC)
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({k: v for k, v in etat.items() if k != "legacy"}, f)
+    os.replace(tmp_path, state_path)
+
+# Fonction synchronisant un dossier de jeu : seules les reviews nouvelles ou modifiées depuis la dernière synchronisation sont téléchargées.
+# Limite : à la première synchronisation d'un dossier téléchargé sans état (pas de .sync_steam.json), les fichiers existants
+# ne sont reconnus que par leur texte ; une review modifiée depuis leur téléchargement est donc ajoutée comme nouvelle
+# et son ancienne version reste dans le dossier.
+def sync_reviews(appid, output_folder, language="all", max_count=100000, session=None, base_url=STEAM_REVIEWS_URL, cache=None):
+    os.makedirs(output_folder, exist_ok=True)
+    etat = load_sync_state(output_folder, appid, language)
+    known, legacy = etat["reviews"], etat["legacy"]
+    since = etat["timestamp_updated"]
+    newest = since
+    seen = set()
+    added = updated = 0
+
+    # filter=updated : les reviews arrivent de la plus récemment modifiée à la plus ancienne
+    for review in iter_reviews(appid, max_count, language, session=session, base_url=base_url, review_filter="updated", cache=cache):
+        timestamp = int(review.get("timestamp_updated", 0))
+        if timestamp <= since:
+            break
+
+        rid = str(review.get("recommendationid"))
+        if rid in seen: # Une review peut réapparaître d'une page à l'autre si elle est modifiée pendant le parcours
+            continue
+        seen.add(rid)
+        newest = max(newest, timestamp)
+
+        content = review.get('review', '').strip()
+        if not content:
+            continue
+
+        fname = known.get(rid) or legacy.pop(content_hash(content), None)
+        if fname and rid not in known: # Review déjà présente avant la première synchronisation
+            known[rid] = fname
+            continue
+        if fname:
+            updated += 1
+        else:
+            fname = f"review_{etat['prochain_numero']}.txt"
+            etat["prochain_numero"] += 1
+            known[rid] = fname
+            added += 1
+
+        rating = "👍" if review.get('voted_up') else "👎"
+        write_review_file(os.path.join(output_folder, fname), rating, content)
+
+        if (added + updated) % 100 == 0: # Sauvegarde régulière des identifiants connus (sans avancer la date)
+            save_sync_state(output_folder, etat)
+
+    # La date n'avance qu'une fois le parcours terminé, pour qu'un arrêt en cours de route ne fasse rien manquer
+    etat["timestamp_updated"] = newest
+    save_sync_state(output_folder, etat)
+    return added, updated
@@ -0,0 +1,105 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+import corpus
+import cache_langues
+import moteur_sentiment
+import rendu_graphiques
+
+# Mesures d'évaluation (précision, rappel, f-mesure) de la polarité prédite par l'analyse de sentiment face à la Note Steam,
+# sans interface graphique : utilisées par analyse_eval_score.py et en ligne de commande. La polarité est celle du moteur
+# partagé avec l'analyse de sentiment (moteur_sentiment.py) : les deux outils donnent les mêmes scores pour une review.
+TRANCHES_DEFAUT = [f"{i}-{i+10}" for i in range(0, 100, 10)]
+TAILLE_LOT = 1000
+
+# Fonction prédisant la polarité (1 positif, 0 négatif) d'une review selon sa langue (identifiée si elle n'est pas fournie)
+def predict_review(review_text, lang=None):
+    return predict_batch([review_text], None if lang is None else [lang])[0]
+
+# Fonction prédisant la polarité d'une liste de reviews en un seul appel au moteur de sentiment
+def predict_batch(textes, langues=None):
+    return [1 if score > 0 else 0 for score in moteur_sentiment.score(textes, langues)]
+
+# Fonction ajoutant les labels et les polarités prédites d'un lot de reviews [(tranche, label, texte, langue)] à leurs tranches
+def add_predictions(labels_par_tranche, lot):
+    if not lot:
+        return
+    tranches, labels, textes, langues = zip(*lot)
+    for tranche, label, prediction in zip(tranches, labels, predict_batch(textes, langues)):
+        y_true, y_pred = labels_par_tranche[tranche]
+        y_true.append(label)
+        y_pred.append(prediction)
+
+# Fonction calculant les mesures d'évaluation de chaque tranche puis de toutes les tranches réunies : {tranche: (précision, rappel, f1)}
+def evaluate(root, tranches=TRANCHES_DEFAUT):
+    from sklearn.metrics import precision_score, recall_score, f1_score
+
+    global_y_true, global_y_pred = [], []
+    scores_par_tranche = {}
+    labels_par_tranche = {tranche: ([], []) for tranche in tranches}
+
+    langues, _ = cache_langues.langues_corpus(root, tranches) # Langues partagées avec sentiment_reviews.py
+    lot = []
+    for review in corpus.iter_reviews(root, tranches): # Texte brut, comme sentiment_reviews.py : même score pour une même review
+        lot.append((review["tranche"], review["label"], review["texte"], langues[cache_langues.cle_texte(review["texte"])]))
+        if len(lot) >= TAILLE_LOT:
+            add_predictions(labels_par_tranche, lot)
+            lot = []
+    add_predictions(labels_par_tranche, lot)
+
+    for tranche, (y_true, y_pred) in labels_par_tranche.items():
+        if y_true and y_pred:
+            scores_par_tranche[tranche] = (precision_score(y_true, y_pred), recall_score(y_true, y_pred), f1_score(y_true, y_pred))
+            global_y_true.extend(y_true)
+            global_y_pred.extend(y_pred)
+
+    # Résultats globaux
+    if global_y_true and global_y_pred:
+        scores_par_tranche["Global"] = (precision_score(global_y_true, global_y_pred), recall_score(global_y_true, global_y_pred),
+                                        f1_score(global_y_true, global_y_pred))
+    return scores_par_tranche
+
+# Fonction ajoutant les mesures d'évaluation à la base de résultats
+def save_scores_to_db(db_path, scores_par_tranche):
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute("CREATE TABLE IF NOT EXISTS resultats (tranche TEXT, precision REAL, rappel REAL, f_mesure REAL)")
+    for tranche, (precision, recall, f1) in scores_par_tranche.items():
+        c.execute("INSERT INTO resultats VALUES (?, ?, ?, ?)", (tranche, precision, recall, f1))
+    conn.commit()
+    conn.close()
+
+# Fonction dessinant hors écran le graphique des mesures d'évaluation par tranche (décrit dans la base de résultats,
+# voir rendu_graphiques.py) ; renvoie (dessinés, inchangés, durée)
+def save_scores_chart(db_path, img_path, scores_par_tranche):
+    tranches = list(scores_par_tranche.keys())
+    spec = {"type": "lignes", "fichier": img_path, "taille": [10, 6], "etiquettes": tranches, "rotation": 45,
+            "series": {"Précision": [scores_par_tranche[t][0] for t in tranches], "Rappel": [scores_par_tranche[t][1] for t in tranches],
+                       "F-mesure": [scores_par_tranche[t][2] for t in tranches]},
+            "marqueurs": ["o", "s", "^"], "ylim": [0, 1.05], "titre": "Mesures d'évaluations par tranche Metacritic",
+            "axe_y": "Score", "axe_x": "Tranche Metacritic"}
+    return rendu_graphiques.render(db_path, [spec])
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Mesures d'évaluation de l'analyse de sentiment par tranche Metacritic (sans interface graphique).")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, 0-10 à 90-100 par défaut)")
+    parser.add_argument("--bdd", default="resultats_scores_evaluation.db", help="Base de résultats")
+    parser.add_argument("--graphique", help="Enregistrer le graphique (ex : graphique_scores_eval.png)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    try:
+        scores_par_tranche = evaluate(args.corpus, args.tranche or TRANCHES_DEFAUT)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    if not scores_par_tranche:
+        sys.exit("Aucune review trouvée pour ces tranches.")
+    save_scores_to_db(args.bdd, scores_par_tranche)
+    if args.graphique:
+        save_scores_chart(args.bdd, args.graphique, scores_par_tranche)
+    for tranche, (precision, recall, f1) in scores_par_tranche.items():
+        print(f"{tranche:<8} précision {precision:.4f}  rappel {recall:.4f}  f-mesure {f1:.4f}")
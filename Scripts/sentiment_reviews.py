@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import corpus
+import cache_langues
+import cache_sentiments
+import moteur_sentiment
+import rendu_graphiques
+
+# Analyse de sentiment des reviews sans interface graphique : utilisée par analyse_sentiment.py et en ligne de commande.
+# Les scores sont calculés par le moteur partagé avec scores_evaluation.py (moteur_sentiment.py). Les langues des reviews
+# sont lues dans le cache partagé (cache_langues.py) : seules les reviews nouvelles ou modifiées sont identifiées.
+# Les reviews sont analysées par paquets, répartis sur un pool de processus dont chacun charge ses analyseurs une fois.
+# Les scores de chaque review sont conservés à côté du corpus (cache_sentiments.py) : une nouvelle analyse ne calcule que les autres.
+TAILLE_PAQUET = 200
+
+# Fonction calculant le sentiment d'une review selon sa langue (VADER pour l'anglais, textblob-fr pour le français, 0 sinon).
+# La langue est identifiée si elle n'est pas fournie (lue dans le cache des langues par analyze_corpus).
+def analyze_review(text, lang=None):
+    return float(moteur_sentiment.score([text], None if lang is None else [lang])[0])
+
+# Fonction calculant le sentiment d'un paquet de reviews [(texte, langue)] (exécutée dans un processus du pool)
+def analyze_chunk(paquet):
+    textes, langues = zip(*paquet)
+    return moteur_sentiment.score(textes, langues).tolist()
+
+# Fonction parcourant les reviews non vides du corpus : chaque review est ajoutée à "reviews" ((tranche, jeu), (clé du texte, analyseur)),
+# et celles dont le score n'est pas encore connu sont regroupées en paquets : génère ([(clé du texte, analyseur, langue)], [(texte, langue)])
+def iter_chunks(root, tranches, langues, scores, reviews, taille=TAILLE_PAQUET):
+    cles, paquet, en_attente = [], [], set()
+    for review in corpus.iter_reviews(root, tranches):
+        if not review["texte"]:
+            continue
+        cle = cache_langues.cle_texte(review["texte"])
+        langue = langues[cle]
+        cle_score = (cle, moteur_sentiment.analyseur(langue))
+        reviews.append(((review["tranche"], review["jeu"]), cle_score))
+        if cle_score in scores or cle_score in en_attente:
+            continue
+        en_attente.add(cle_score)
+        cles.append(cle_score + (langue,))
+        paquet.append((review["texte"], langue))
+        if len(paquet) >= taille:
+            yield cles, paquet
+            cles, paquet = [], []
+    if paquet:
+        yield cles, paquet
+
+# Fonction analysant les paquets, en parallèle sur n_workers processus : au plus deux paquets en attente par processus,
+# les résultats sont rendus dans l'ordre du corpus (moyennes identiques au calcul séquentiel). Génère (clés, sentiments).
+def score_chunks(chunks, n_workers=1):
+    chunks = iter(chunks)
+    premier = next(chunks, None)
+    if premier is None: # Tout est déjà calculé : les analyseurs ne sont pas chargés
+        return
+    moteur_sentiment.vader() # Erreur explicite (lexique manquant) avant de lancer les processus
+    chunks = itertools.chain([premier], chunks)
+    if n_workers <= 1:
+        for cles, paquet in chunks:
+            yield cles, analyze_chunk(paquet)
+        return
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=moteur_sentiment.charger) as pool:
+        en_cours = deque()
+        for cles, paquet in chunks:
+            en_cours.append((cles, pool.submit(analyze_chunk, paquet)))
+            if len(en_cours) >= 2 * n_workers:
+                cles, future = en_cours.popleft()
+                yield cles, future.result()
+        while en_cours:
+            cles, future = en_cours.popleft()
+            yield cles, future.result()
+
+# Fonction calculant le sentiment moyen de chaque jeu d'un corpus. Seules les reviews nouvelles ou modifiées (ou dont l'analyseur
+# a changé de version) sont analysées, sur n_workers processus ; les moyennes sont recalculées à partir des scores enregistrés.
+# Renvoie {jeu: {tranche, sentiment_moyen, nombre_reviews, ecart}} et {tranche: [sentiment moyen de chaque jeu]} ;
+# stats (si fourni) reçoit le nombre de reviews, le nombre de reviews analysées, la durée et le débit (reviews/s).
+def analyze_corpus(root, tranches=None, n_workers=1, stats=None):
+    results = {}
+    tranche_sentiments = {}
+    sentiments_par_jeu = {}
+
+    start = time.perf_counter()
+    langues, _ = cache_langues.langues_corpus(root, tranches)
+    versions = moteur_sentiment.versions_analyseurs()
+    conn = cache_sentiments.ouvrir_cache(cache_langues.chemin_cache(root, cache_sentiments.FICHIER_CACHE))
+    scores = cache_sentiments.lire_scores(conn, versions)
+    reviews, calculees = [], 0
+    for cles, sentiments in score_chunks(iter_chunks(root, tranches, langues, scores, reviews), n_workers):
+        cache_sentiments.enregistrer(conn, [(cle, analyseur, versions[analyseur], langue, sentiment)
+                                            for (cle, analyseur, langue), sentiment in zip(cles, sentiments)])
+        scores.update(((cle, analyseur), sentiment) for (cle, analyseur, _), sentiment in zip(cles, sentiments))
+        calculees += len(cles)
+    conn.close()
+
+    for cle_jeu, cle_score in reviews:
+        sentiments_par_jeu.setdefault(cle_jeu, []).append(scores[cle_score])
+    if stats is not None:
+        stats["reviews"] = len(reviews)
+        stats["calculees"] = calculees
+        stats["workers"] = n_workers
+        stats["duree"] = time.perf_counter() - start
+        stats["debit"] = stats["reviews"] / stats["duree"] if stats["duree"] else None
+
+    for (tranche, game), sentiments in sentiments_par_jeu.items():
+        if sentiments:
+            avg_sentiment = sum(sentiments) / len(sentiments)
+            nb_reviews = len(sentiments)
+            try:
+                metacritic_score = int(tranche.split("-")[0]) + 5
+            except:
+                metacritic_score = 0
+            ecart = round(metacritic_score / 100 - avg_sentiment, 4)
+            results[game] = {
+                "tranche": tranche,
+                "sentiment_moyen": round(avg_sentiment, 4),
+                "nombre_reviews": nb_reviews,
+                "ecart": ecart
+            }
+            tranche_sentiments.setdefault(tranche, []).append(avg_sentiment)
+    return results, tranche_sentiments
+
+# Fonction enregistrant les sentiments moyens par jeu dans la base de résultats
+def save_sentiment_to_db(db_path, results):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resultats_sentiment (
+            jeu TEXT PRIMARY KEY,
+            tranche TEXT,
+            sentiment_moyen REAL,
+            nombre_reviews INTEGER,
+            ecart_metacritic_sentiment REAL
+        )
+    """)
+    for jeu, data in results.items():
+        cur.execute("""
+            INSERT OR REPLACE INTO resultats_sentiment
+            (jeu, tranche, sentiment_moyen, nombre_reviews, ecart_metacritic_sentiment)
+            VALUES (?, ?, ?, ?, ?)
+        """, (jeu, data['tranche'], data['sentiment_moyen'], data['nombre_reviews'], data['ecart']))
+    conn.commit()
+    conn.close()
+
+# Fonction décrivant le graphique des sentiments moyens par jeu (voir rendu_graphiques.py)
+def game_graph_spec(data, output_dir):
+    jeux = list(data.keys())
+    return {"type": "barres_h", "fichier": os.path.join(output_dir, "graphique_sentiment_par_jeu.png"),
+            "taille": [14, max(5, 0.4 * len(jeux))], "etiquettes": jeux, "couleur": "mediumseagreen",
+            "series": {"sentiment_moyen": [data[j]["sentiment_moyen"] for j in jeux]},
+            "axe_x": "Sentiment moyen", "titre": "Sentiment moyen par jeu"}
+
+# Fonction décrivant le graphique des sentiments moyens par tranche Metacritic
+def tranche_graph_spec(tranche_sentiments, output_dir):
+    return {"type": "barres", "fichier": os.path.join(output_dir, "graphique_sentiment_par_tranche.png"), "taille": [12, 6],
+            "etiquettes": list(tranche_sentiments.keys()), "couleur": "cornflowerblue",
+            "series": {"sentiment_moyen": [sum(lst)/len(lst) for lst in tranche_sentiments.values()]},
+            "axe_x": "Tranche Metacritic", "axe_y": "Sentiment moyen", "titre": "Sentiment moyen par tranche Metacritic"}
+
+# Fonction dessinant hors écran les graphiques d'une analyse (par tranche si tranche_sentiments est fourni) ;
+# renvoie les chemins des images et (dessinés, inchangés, durée)
+def render_graphs(db_path, output_dir, results, tranche_sentiments=None):
+    specs = [game_graph_spec(results, output_dir)]
+    if tranche_sentiments is not None:
+        specs.append(tranche_graph_spec(tranche_sentiments, output_dir))
+    return [spec["fichier"] for spec in specs], rendu_graphiques.render(db_path, specs)
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Analyse de sentiment des reviews par jeu (sans interface graphique).")
+    parser.add_argument("corpus", help="Dossier du corpus (arborescence data/, corpus shard ou base de reviews)")
+    parser.add_argument("--tranche", action="append", help="Tranche Metacritic (répétable, toutes par défaut)")
+    parser.add_argument("--sortie", default=".", help="Dossier des résultats")
+    parser.add_argument("--par-tranche", action="store_true", help="Ajouter le graphique des sentiments par tranche Metacritic")
+    parser.add_argument("--sans-graphique", action="store_true", help="N'écrire que la base de résultats")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processus parallèles (1 = séquentiel)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        sys.exit(f"{args.corpus} n'existe pas.")
+    stats = {}
+    try:
+        results, tranche_sentiments = analyze_corpus(args.corpus, args.tranche, max(1, args.workers), stats)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    if not results:
+        sys.exit("Aucune review valide trouvée.")
+
+    os.makedirs(args.sortie, exist_ok=True)
+    db_path = os.path.join(args.sortie, "resultat_analyse_nlp.db")
+    save_sentiment_to_db(db_path, results)
+    if not args.sans_graphique:
+        render_graphs(db_path, args.sortie, results, tranche_sentiments if args.par_tranche else None)
+    print(f"{len(results)} jeux analysés ({stats['reviews']} reviews dont {stats['calculees']} analysées, en {stats['duree']:.2f} s, "
+          f"{stats['debit']:.0f} reviews/s sur {stats['workers']} processus) ; résultats dans {db_path}")
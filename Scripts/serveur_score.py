@@ -0,0 +1,188 @@
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+
+from prediction import load_pipeline, predict_batch
+
+# Serveur local de score : le pipeline de classification (voir prediction.py) et les analyseurs de sentiment
+# (voir moteur_sentiment.py) sont chargés une seule fois. Les requêtes simultanées sont regroupées en micro-lots :
+# le premier texte arrivé attend au plus ATTENTE_MS que d'autres le rejoignent, puis le lot est classé en un seul appel.
+PORT = 8765
+LOT_MAX = 64
+ATTENTE_MS = 2.0
+FENETRE_LATENCES = 10000
+
+class MicroBatcher:
+    def __init__(self, pipeline, sentiment=None, lot_max=LOT_MAX, attente_ms=ATTENTE_MS):
+        self.pipeline = pipeline
+        self.sentiment = sentiment
+        self.lot_max = lot_max
+        self.attente = attente_ms / 1000
+        self.file = queue.Queue()
+        self.lock = threading.Lock()
+        self.lots = 0
+        self.textes = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, texte): # Fonction ajoutant un texte au prochain lot ; renvoie un Future rempli par le thread de classement
+        future = Future()
+        self.file.put((texte, future))
+        return future
+
+    def run(self): # Boucle du thread de classement : constitution des lots puis classement
+        while True:
+            lot = [self.file.get()]
+            limite = time.perf_counter() + self.attente
+            while len(lot) < self.lot_max:
+                reste = limite - time.perf_counter()
+                if reste <= 0:
+                    break
+                try:
+                    lot.append(self.file.get(timeout=reste))
+                except queue.Empty:
+                    break
+            self.process(lot)
+
+    def process(self, lot): # Fonction classant un lot et transmettant les résultats aux requêtes en attente
+        with self.lock: # Compté avant les réponses : un client qui lit /stats après sa réponse y voit son lot
+            self.lots += 1
+            self.textes += len(lot)
+        textes = [texte for texte, _ in lot]
+        try:
+            labels, proba = predict_batch(self.pipeline, textes)
+            sentiments = self.sentiment(textes) if self.sentiment is not None else None # Un seul appel pour tout le lot
+            for i, (texte, future) in enumerate(lot):
+                resultat = {"label": int(labels[i]), "probabilite_positive": float(proba[i]) if proba is not None else None}
+                if sentiments is not None:
+                    resultat["sentiment"] = float(sentiments[i])
+                future.set_result(resultat)
+        except Exception as e:
+            for _, future in lot:
+                if not future.done():
+                    future.set_exception(e)
+
+    def counters(self): # Fonction renvoyant une copie cohérente des compteurs (lus par les threads des requêtes)
+        with self.lock:
+            return {"lots": self.lots, "textes": self.textes}
+
+class LatencyStats:
+    def __init__(self, fenetre=FENETRE_LATENCES):
+        self.lock = threading.Lock()
+        self.latences = deque(maxlen=fenetre)
+        self.requetes = 0
+        self.erreurs = 0
+
+    def add(self, duree, erreur=False): # Fonction enregistrant la latence d'une requête (en secondes)
+        with self.lock:
+            self.latences.append(duree)
+            self.requetes += 1
+            self.erreurs += erreur
+
+    def summary(self): # Fonction renvoyant les compteurs et les percentiles des latences récentes (en millisecondes)
+        with self.lock:
+            latences = np.array(self.latences) * 1000
+            requetes, erreurs = self.requetes, self.erreurs
+        if len(latences) == 0:
+            return {"requetes": requetes, "erreurs": erreurs}
+        return {"requetes": requetes, "erreurs": erreurs, "p50_ms": float(np.percentile(latences, 50)),
+                "p99_ms": float(np.percentile(latences, 99)), "max_ms": float(latences.max())}
+
+class ScoreServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # File d'attente des connexions (5 par défaut : insuffisant pour des clients simultanés)
+
+class ScoreHandler(BaseHTTPRequestHandler):
+    # POST /predire {"texte": "..."} ou {"textes": ["...", ...]} ; GET /stats ; GET /sante
+    def do_POST(self):
+        start = time.perf_counter()
+        if self.path != "/predire":
+            self.send_json(404, {"erreur": "route inconnue"})
+            return
+        try:
+            requete = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            textes = requete["textes"] if "textes" in requete else [requete["texte"]]
+            if not all(isinstance(texte, str) for texte in textes):
+                raise ValueError("les textes doivent être des chaînes")
+        except (ValueError, KeyError, TypeError) as e:
+            self.server.latences.add(time.perf_counter() - start, erreur=True)
+            self.send_json(400, {"erreur": f"requête invalide : {e}"})
+            return
+
+        try:
+            futures = [self.server.batcher.submit(texte) for texte in textes]
+            resultats = [future.result() for future in futures]
+        except Exception as e:
+            self.server.latences.add(time.perf_counter() - start, erreur=True)
+            self.send_json(500, {"erreur": str(e)})
+            return
+        self.server.latences.add(time.perf_counter() - start)
+        self.send_json(200, resultats[0] if "texte" in requete else {"resultats": resultats})
+
+    def do_GET(self):
+        if self.path == "/stats":
+            stats = self.server.latences.summary()
+            stats.update(self.server.batcher.counters())
+            stats["modele"] = self.server.metadata.get("modele")
+            self.send_json(200, stats)
+        elif self.path == "/sante":
+            self.send_json(200, {"statut": "ok"})
+        else:
+            self.send_json(404, {"erreur": "route inconnue"})
+
+    def send_json(self, code, data): # Fonction envoyant une réponse JSON
+        corps = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args): # Pas de journal par requête (coûteux en latence)
+        pass
+
+# Fonction créant le serveur (non démarré) : chargement du pipeline, des analyseurs de sentiment, et préchauffage
+def create_server(model_path, host="127.0.0.1", port=PORT, sentiment=True, lot_max=LOT_MAX, attente_ms=ATTENTE_MS):
+    pipeline, metadata = load_pipeline(model_path)
+    analyzer = None
+    if sentiment:
+        import moteur_sentiment # Lexique VADER et analyseur textblob-fr chargés une fois pour toutes, sans Qt
+        analyzer = moteur_sentiment.score
+        moteur_sentiment.charger()
+        analyzer(["warm up"])
+    predict_batch(pipeline, ["warm up"])
+
+    server = ScoreServer((host, port), ScoreHandler)
+    server.batcher = MicroBatcher(pipeline, analyzer, lot_max, attente_ms)
+    server.latences = LatencyStats()
+    server.metadata = metadata
+    return server
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Serveur local de score des reviews (classifieur + sentiment), modèles gardés en mémoire.")
+    parser.add_argument("modele", help="Pipeline enregistré par analyse_classifieurs.py (ex : modele_classifieur.joblib)")
+    parser.add_argument("--hote", default="127.0.0.1", help="Adresse d'écoute (locale par défaut)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--lot-max", type=int, default=LOT_MAX, help="Nombre maximal de textes par micro-lot")
+    parser.add_argument("--attente-ms", type=float, default=ATTENTE_MS, help="Attente maximale pour compléter un micro-lot")
+    parser.add_argument("--sans-sentiment", action="store_true", help="Ne pas charger les analyseurs de sentiment")
+    args = parser.parse_args()
+
+    try:
+        server = create_server(args.modele, args.hote, args.port, not args.sans_sentiment, args.lot_max, args.attente_ms)
+    except (OSError, ValueError, RuntimeError) as e:
+        sys.exit(f"Impossible de démarrer le serveur : {e}")
+    print(f"Serveur de score prêt sur http://{args.hote}:{args.port} (modèle : {server.metadata.get('modele')})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,97 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+# Statistiques de la table "jeux" (notes Metacritic, évaluations Steam, ratio de reviews positives par tranche),
+# sans interface graphique : utilisées par analyse_stat.py et en ligne de commande. pandas et scipy sont chargés à la lecture.
+STEAM_EVAL_MAP = {
+    "extrêmement négatives": -4,
+    "très négatives": -3,
+    "négatives": -2,
+    "plutôt négatives": -1,
+    "moyennes": 0,
+    "positives": 1,
+    "plutôt positives": 2,
+    "très positives": 3,
+    "extrêmement positives": 4
+}
+
+# Fonction lisant la table "jeux" et ajoutant les colonnes calculées (score d'évaluation, ratio positif, tranche)
+def load_games(db_path):
+    import pandas as pd
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query("SELECT * FROM jeux", conn)
+    conn.close()
+
+    # Nettoyage + colonnes calculées
+    df["evaluation_steam"] = df["evaluation_steam"].str.lower().str.strip()
+    df["evaluation_score"] = df["evaluation_steam"].map(STEAM_EVAL_MAP)
+    df["note_metacritic"] = pd.to_numeric(df["note_metacritic"], errors="coerce")
+    df["reviews_pos"] = pd.to_numeric(df["reviews_pos"], errors="coerce")
+    df["reviews_total"] = pd.to_numeric(df["reviews_total"], errors="coerce")
+
+    df["positive_ratio"] = df["reviews_pos"] / df["reviews_total"]
+    df["positive_ratio"] = df["positive_ratio"].fillna(0)
+    df["metacritic_tranche"] = (df["note_metacritic"] // 10) * 10
+    return df
+
+# Fonction renvoyant le résumé par tranche Metacritic
+def summarize(df):
+    return df.groupby("metacritic_tranche").agg({
+        "reviews_total": "sum",
+        "reviews_pos": "sum",
+        "reviews_neg": "sum",
+        "positive_ratio": "mean"
+    }).reset_index()
+
+# Fonction renvoyant les lignes du rapport texte (descriptions, corrélation, résumé par tranche)
+def report_lines(df):
+    from scipy.stats import pearsonr
+    corr, p = pearsonr(df["note_metacritic"], df["evaluation_score"])
+    return [
+        "--- Statistiques note Metacritic ---",
+        str(df["note_metacritic"].describe()),
+        "\n--- Statistiques évaluation Steam ---",
+        str(df["evaluation_steam"].describe()),
+        f"\nCorrélation Metacritic / Éval Steam : {corr:.2f} (p={p:.3f})",
+        "\n--- Résumé par tranche Metacritic ---",
+        str(summarize(df))
+    ]
+
+# Fonction dessinant le ratio moyen de reviews positives par tranche sur un axe matplotlib
+def plot_positive_ratio(df, ax):
+    ax.clear()
+    df.groupby("metacritic_tranche")["positive_ratio"].mean().plot(kind="bar", ax=ax, color="green")
+    ax.set_title("Ratio moyen de reviews positives par tranche Metacritic")
+    ax.set_xlabel("Tranche Metacritic")
+    ax.set_ylabel("Ratio de reviews positives")
+    ax.set_ylim(0, 1)
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Statistiques de la table 'jeux' (sans interface graphique).")
+    parser.add_argument("bdd", help="Base SQLite contenant la table 'jeux'")
+    parser.add_argument("--csv", help="Exporter le résumé par tranche (CSV séparé par des points-virgules)")
+    parser.add_argument("--txt", help="Exporter le rapport texte")
+    parser.add_argument("--graphique", help="Exporter le graphique du ratio positif par tranche (PNG)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.bdd):
+        sys.exit(f"{args.bdd} n'existe pas.")
+    try:
+        df = load_games(args.bdd)
+    except Exception as e:
+        sys.exit(f"Lecture de la table 'jeux' impossible : {e}")
+
+    texte = "\n".join(report_lines(df))
+    print(texte)
+    if args.csv:
+        summarize(df).to_csv(args.csv, index=False, sep=";")
+    if args.txt:
+        with open(args.txt, "w", encoding="utf-8") as f:
+            f.write(texte)
+    if args.graphique:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(10, 5))
+        plot_positive_ratio(df, fig.subplots())
+        fig.savefig(args.graphique)
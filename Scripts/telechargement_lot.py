@@ -0,0 +1,187 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from reviews_steam import download_reviews, download_reviews_to_shard, sync_reviews, STEAM_REVIEWS_URL
+from cache_http import ReviewCache, format_stats
+from corpus_shard import ShardWriter, recommendationids
+
+STATUTS_A_REESSAYER = {429, 500, 502, 503, 504}
+
+# Limiteur de débit "token bucket" partagé par tous les threads de téléchargement
+class TokenBucket:
+    def __init__(self, rate, capacity=None): # rate : nombre de requêtes autorisées par seconde
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self): # Fonction bloquante jusqu'à obtenir un jeton
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Session HTTP keep-alive unique : chaque requête consomme un jeton et est réessayée (backoff exponentiel) sur 429/5xx
+class RateLimitedSession(requests.Session):
+    def __init__(self, bucket, pool_size=10, max_retries=5, backoff=1.0):
+        super().__init__()
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.request_count = 0
+        self.count_lock = threading.Lock()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            with self.count_lock:
+                self.request_count += 1
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.ConnectionError:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+
+            if response.status_code not in STATUTS_A_REESSAYER or attempt == self.max_retries:
+                return response
+
+            retry_after = response.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+            response.close()
+            time.sleep(delay)
+        return response
+
+# Fonction renvoyant la tranche Metacritic (ex : "30-40") d'une note
+def tranche_metacritic(note):
+    try:
+        debut = min(int(float(note)) // 10 * 10, 90)
+    except (TypeError, ValueError):
+        return None
+    return f"{debut}-{debut + 10}"
+
+# Fonction lisant la liste des jeux (nom, AppID, tranche) depuis la table "jeux" de la base de données
+def lire_jeux(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT nom, app_id, note_metacritic FROM jeux WHERE app_id IS NOT NULL AND app_id != ''").fetchall()
+    conn.close()
+    return [{"nom": nom, "appid": str(app_id).strip(), "tranche": tranche_metacritic(note)} for nom, app_id, note in rows]
+
+# Fonction téléchargeant plusieurs jeux en parallèle et renvoyant le débit obtenu pour chacun.
+# Avec shard=True, toutes les reviews sont ajoutées au corpus shard de output_dir (une review déjà présente n'est pas dupliquée).
+def telecharger_lot(jeux, output_dir, count=20, language="all", workers=8, rate=5.0, par_tranche=False, base_url=STEAM_REVIEWS_URL, sync=False, cache=None, shard=False):
+    if shard and sync:
+        raise ValueError("La synchronisation incrémentale n'est disponible que pour les fichiers texte.")
+    session = RateLimitedSession(TokenBucket(rate), pool_size=workers)
+    writer = connues = None
+    if shard:
+        connues = recommendationids(output_dir) if os.path.isdir(output_dir) else set()
+        writer = ShardWriter(output_dir)
+    rapport = []
+
+    def telecharger(jeu): # Téléchargement d'un seul jeu (exécuté dans un thread)
+        dossier = output_dir
+        if par_tranche and jeu.get("tranche"):
+            dossier = os.path.join(output_dir, jeu["tranche"])
+        debut = time.perf_counter()
+        game_folder = os.path.join(dossier, jeu["nom"])
+        if shard:
+            if not jeu.get("tranche"):
+                raise ValueError("Tranche Metacritic inconnue : impossible d'ajouter le jeu au corpus shard.")
+            saved = download_reviews_to_shard(jeu["appid"], writer, jeu["tranche"], jeu["nom"], count, language, session, base_url, cache, connues)
+        elif sync:
+            saved = sum(sync_reviews(jeu["appid"], game_folder, language, count, session, base_url, cache))
+        else:
+            saved = download_reviews(jeu["appid"], game_folder, count, language, session, base_url, cache)
+        return saved, time.perf_counter() - debut
+
+    debut_lot = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(telecharger, jeu): jeu for jeu in jeux}
+            for future in as_completed(futures):
+                jeu = futures[future]
+                try:
+                    saved, duree = future.result()
+                    rapport.append({"nom": jeu["nom"], "appid": jeu["appid"], "reviews": saved, "duree": duree,
+                                    "debit": saved / duree if duree > 0 else 0.0, "erreur": None})
+                except Exception as e:
+                    rapport.append({"nom": jeu["nom"], "appid": jeu["appid"], "reviews": 0, "duree": 0.0, "debit": 0.0, "erreur": str(e)})
+    finally:
+        if writer:
+            writer.close()
+    duree_totale = time.perf_counter() - debut_lot
+    session.close()
+
+    rapport.sort(key=lambda r: r["nom"])
+    return rapport, duree_totale, session.request_count
+
+# Fonction mettant en forme le rapport de débit par jeu
+def format_rapport(rapport, duree_totale, request_count):
+    lignes = [f"{'Jeu':<40} {'AppID':>9} {'Reviews':>8} {'Durée (s)':>10} {'Reviews/s':>10}"]
+    for r in rapport:
+        if r["erreur"]:
+            lignes.append(f"{r['nom'][:40]:<40} {r['appid']:>9}   ERREUR : {r['erreur']}")
+        else:
+            lignes.append(f"{r['nom'][:40]:<40} {r['appid']:>9} {r['reviews']:>8} {r['duree']:>10.2f} {r['debit']:>10.1f}")
+    total = sum(r["reviews"] for r in rapport)
+    lignes.append(f"\nTOTAL : {total} reviews pour {len(rapport)} jeux en {duree_totale:.2f} s "
+                  f"({total / duree_totale if duree_totale > 0 else 0:.1f} reviews/s, {request_count} requêtes)")
+    return "\n".join(lignes)
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Téléchargement en lot des reviews Steam de plusieurs jeux.")
+    parser.add_argument("--bdd", help="Base SQLite contenant la table 'jeux' (ex : data/BDD_Review.db)")
+    parser.add_argument("--appids", nargs="*", default=[], help="AppIDs à télécharger (en plus de la base)")
+    parser.add_argument("--sortie", required=True, help="Dossier de sortie")
+    parser.add_argument("--par-tranche", action="store_true", help="Ranger les jeux dans <sortie>/<tranche Metacritic>/<jeu>")
+    parser.add_argument("--nombre", type=int, default=20, help="Nombre de reviews par jeu (maximum en mode --sync)")
+    parser.add_argument("--sync", action="store_true", help="Ne télécharger que les reviews nouvelles ou modifiées depuis la dernière synchronisation")
+    parser.add_argument("--shard", action="store_true", help="Ajouter les reviews au corpus shard de --sortie (corpus_XXXX.shard) au lieu de fichiers texte")
+    parser.add_argument("--tranche", help="Tranche Metacritic des jeux de --appids (ex : 30-40)")
+    parser.add_argument("--langue", default="all")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=5.0, help="Requêtes par seconde autorisées")
+    parser.add_argument("--cache", help="Dossier du cache disque des réponses de l'API")
+    parser.add_argument("--ttl", type=float, default=24, help="Durée de validité du cache (heures)")
+    parser.add_argument("--cache-max-mo", type=float, default=512, help="Taille maximale du cache (Mo)")
+    parser.add_argument("--hors-ligne", action="store_true", help="Ne répondre qu'à partir du cache (nécessite --cache)")
+    args = parser.parse_args()
+
+    jeux = lire_jeux(args.bdd) if args.bdd else []
+    jeux += [{"nom": appid, "appid": appid, "tranche": args.tranche} for appid in args.appids]
+    if not jeux:
+        parser.error("Aucun jeu à télécharger (utiliser --bdd ou --appids).")
+    if args.shard and args.sync:
+        parser.error("--sync n'est pas disponible avec --shard.")
+
+    if args.hors_ligne and not args.cache:
+        parser.error("--hors-ligne nécessite --cache.")
+    cache = None
+    if args.cache:
+        cache = ReviewCache(args.cache, args.ttl * 3600, int(args.cache_max_mo * 1024 * 1024), args.hors_ligne)
+
+    rapport, duree, requetes = telecharger_lot(jeux, args.sortie, args.nombre, args.langue, args.threads, args.rps, args.par_tranche, sync=args.sync, cache=cache, shard=args.shard)
+    print(format_rapport(rapport, duree, requetes))
+    if cache:
+        print(format_stats(cache.stats()))
+        cache.close()
+    sys.exit(1 if any(r["erreur"] for r in rapport) else 0)
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Mesure du temps d'import à froid des scripts (un interpréteur neuf par mesure) et des bibliothèques lourdes qu'ils chargent :
+# les modules sans interface ne doivent charger scikit-learn, matplotlib, pandas, nltk ou Qt qu'à l'étape qui s'en sert.
+MODULES_DEFAUT = [
+    "corpus", "cache_langues", "identification_langue", "moteur_sentiment", "modeles", "comparaison_classifieurs", "sentiment_reviews", "scores_evaluation", "statistiques", "BDD_jeux",
+    "BDD_reviews", "reviews_steam", "telechargement_lot", "prediction", "serveur_score", "balayage_tranches", "f_score_graph",
+    "analyse_classifieurs", "analyse_sentiment", "analyse_eval_score", "analyse_stat", "BDD_Steam", "SteamReviewDownloader"
+]
+BIBLIOTHEQUES_LOURDES = ["PySide6", "sklearn", "scipy", "matplotlib", "seaborn", "pandas", "nltk", "textblob", "langdetect"]
+
+# Code exécuté dans l'interpréteur neuf : import du module, durée et bibliothèques lourdes chargées (JSON sur la sortie standard)
+MESURE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+duree = time.perf_counter() - start
+print(json.dumps({{"duree": duree, "chargees": [b for b in {lourdes!r} if b in sys.modules]}}))
+"""
+
+# Fonction mesurant l'import à froid d'un module (meilleure de n mesures) ; renvoie (durée en s, bibliothèques lourdes chargées)
+def measure(module, repetitions=3, folder=os.path.dirname(os.path.abspath(__file__))):
+    meilleure, chargees = None, []
+    for _ in range(repetitions):
+        sortie = subprocess.run(
+            [sys.executable, "-c", MESURE.format(module=module, lourdes=BIBLIOTHEQUES_LOURDES)],
+            cwd=folder, capture_output=True, text=True
+        )
+        if sortie.returncode != 0:
+            raise ImportError(sortie.stderr.strip().splitlines()[-1] if sortie.stderr.strip() else f"code {sortie.returncode}")
+        mesure = json.loads(sortie.stdout.strip().splitlines()[-1])
+        if meilleure is None or mesure["duree"] < meilleure:
+            meilleure, chargees = mesure["duree"], mesure["chargees"]
+    return meilleure, chargees
+
+# Fonction renvoyant les imports les plus coûteux d'un module (cumul en ms) selon python -X importtime
+def import_profile(module, top=10, folder=os.path.dirname(os.path.abspath(__file__))):
+    sortie = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=folder, capture_output=True, text=True)
+    lignes = []
+    for ligne in sortie.stderr.splitlines():
+        if not ligne.startswith("import time:") or "cumulative" in ligne:
+            continue
+        _, cumul, nom = ligne[len("import time:"):].split("|")
+        if not nom.startswith("  "): # Imports de premier niveau uniquement
+            lignes.append((int(cumul) / 1000, nom.strip()))
+    return sorted(lignes, reverse=True)[:top]
+
+if __name__ == "__main__": # Lancement en ligne de commande
+    parser = argparse.ArgumentParser(description="Temps d'import à froid des scripts du projet.")
+    parser.add_argument("modules", nargs="*", help="Modules mesurés (tous les scripts par défaut)")
+    parser.add_argument("--repetitions", type=int, default=3, help="Mesures par module (la meilleure est retenue)")
+    parser.add_argument("--detail", action="store_true", help="Afficher les imports les plus coûteux (python -X importtime)")
+    parser.add_argument("--json", help="Enregistrer les mesures dans un fichier JSON")
+    args = parser.parse_args()
+
+    resultats = {}
+    for module in args.modules or MODULES_DEFAUT:
+        try:
+            duree, chargees = measure(module, args.repetitions)
+        except ImportError as e:
+            print(f"{module:<26} non importable : {e}")
+            continue
+        resultats[module] = {"duree_ms": round(duree * 1000, 1), "bibliotheques_lourdes": chargees}
+        print(f"{module:<26} {duree * 1000:8.1f} ms  {', '.join(chargees) or '-'}")
+        if args.detail:
+            for cumul, nom in import_profile(module):
+                print(f"    {cumul:8.1f} ms  {nom}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les scripts sont des modules à plat dans Scripts/ : le dossier est ajouté au chemin d'import des tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import cache_http
+import reviews_steam
+from cache_http import ReviewCache, CacheMissError
+from test_reviews_steam import FakeSession, review
+
+PARAMS = {"json": 1, "cursor": "*", "language": "all"}
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ReviewCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+def test_page_evincee_pendant_la_lecture(cache, monkeypatch):
+    cache.put("10", PARAMS, {"success": 1, "reviews": []})
+    ouvrir = cache_http.gzip.open
+    def evincer_puis_ouvrir(path, *args, **kwargs): # Éviction par un autre thread entre la consultation de l'index et la lecture
+        os.remove(path)
+        return ouvrir(path, *args, **kwargs)
+    monkeypatch.setattr(cache_http.gzip, "open", evincer_puis_ouvrir)
+    assert cache.get("10", PARAMS) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entrees"]) == (0, 1, 0)
+
+def test_page_illisible(cache):
+    cache.put("10", PARAMS, {"success": 1, "reviews": []})
+    with open(cache.path(cache.make_key("10", PARAMS)), "wb") as f:
+        f.write(b"pas du gzip")
+    assert cache.get("10", PARAMS) is None
+    cache.hors_ligne = True
+    with pytest.raises(CacheMissError):
+        cache.get("10", PARAMS)
+
+def test_sync_redemande_la_premiere_page(tmp_path, cache):
+    dossier = str(tmp_path / "jeu")
+    premiere = {"*": ([review(2), review(1)], "c1"), "c1": ([], "c1")}
+    assert reviews_steam.sync_reviews("10", dossier, session=FakeSession(premiere), cache=cache) == (2, 0)
+
+    seconde = {"*": ([review(3), review(2), review(1)], "c1"), "c1": ([], "c1")}
+    session = FakeSession(seconde)
+    assert reviews_steam.sync_reviews("10", dossier, session=session, cache=cache) == (1, 0)
+    assert [appel["cursor"] for appel in session.appels] == ["*"]
+
+    # Hors ligne, la première page est lue dans le cache (mise à jour par la synchronisation précédente)
+    cache.hors_ligne = True
+    reviews = list(reviews_steam.iter_reviews("10", 10, review_filter="updated", session=FakeSession({}), cache=cache))
+    assert [r["recommendationid"] for r in reviews] == ["3", "2", "1"]
+
+def test_telechargement_utilise_le_cache(cache):
+    pages = {"*": ([review(1)], "c1"), "c1": ([], "c1")}
+    list(reviews_steam.iter_reviews("10", 10, session=FakeSession(pages), cache=cache))
+    session = FakeSession(pages)
+    assert [r["recommendationid"] for r in reviews_steam.iter_reviews("10", 10, session=session, cache=cache)] == ["1"]
+    assert session.appels == []
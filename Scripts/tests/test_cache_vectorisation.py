@@ -0,0 +1,26 @@
+import os
+
+import comparaison_classifieurs
+from cache_vectorisation import VectorizationCache
+from test_corpus import creer_corpus, reecrire_sur_place
+
+REVIEWS = {("30-40", "A", f"review_{i}.txt"): f"Note : {'👍' if i % 2 else '👎'}\n\nreview {i} {'bien' if i % 2 else 'nul'} jeu"
+           for i in range(1, 9)}
+
+def test_cache_puis_review_modifiee(tmp_path):
+    root = str(tmp_path / "data")
+    creer_corpus(root, REVIEWS)
+    cache = VectorizationCache(str(tmp_path / "cache"))
+
+    _, X, y, stats = comparaison_classifieurs.vectorize(root, None, 1, cache)
+    assert stats["vectorisation"] == "calculée"
+    _, X_cache, y_cache, stats = comparaison_classifieurs.vectorize(root, None, 1, cache)
+    assert stats["vectorisation"] == "cache"
+    assert (X_cache != X).nnz == 0 and list(y_cache) == list(y)
+
+    reecrire_sur_place(os.path.join(root, "30-40", "A", "review_1.txt"), "Note : 👎\n\nreview 1 vraiment nul")
+    vectorizer, X_apres, y_apres, stats = comparaison_classifieurs.vectorize(root, None, 1, cache)
+    assert stats["vectorisation"] == "calculée"
+    assert sum(y_apres) == sum(y) - 1
+    assert "vraiment" in vectorizer.vocabulary_
+    assert (cache.hits, cache.misses) == (1, 2)
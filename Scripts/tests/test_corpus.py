@@ -0,0 +1,57 @@
+import os
+
+import corpus
+
+# Fonction créant un corpus data/<tranche>/<jeu>/review_N.txt de test
+def creer_corpus(root, reviews):
+    for (tranche, jeu, fichier), contenu in reviews.items():
+        os.makedirs(os.path.join(root, tranche, jeu), exist_ok=True)
+        with open(os.path.join(root, tranche, jeu, fichier), "w", encoding="utf-8") as f:
+            f.write(contenu)
+
+# Fonction réécrivant un fichier sur place, sans changer la date de modification de son dossier
+def reecrire_sur_place(path, contenu):
+    dossier = os.path.dirname(path)
+    st_dossier, st = os.stat(dossier), os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(contenu)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    os.utime(dossier, ns=(st_dossier.st_atime_ns, st_dossier.st_mtime_ns))
+
+REVIEWS = {
+    ("30-40", "A", "review_1.txt"): "Note : 👍\n\nUn très bon jeu, je recommande",
+    ("30-40", "A", "review_2.txt"): "Note : 👎\n\nNul",
+    ("30-40", "A", "notes.txt"): "pas une review",
+    ("90-100", "B", "review_1.txt"): "Sans note",
+}
+
+def test_manifeste(tmp_path):
+    root = str(tmp_path)
+    creer_corpus(root, REVIEWS)
+    stats = corpus.nouvelles_stats()
+    reviews = list(corpus.iter_reviews(root, stats=stats))
+    assert sorted((r["jeu"], r["label"], r["texte"]) for r in reviews) == [("A", 0, "Nul"), ("A", 1, "Un très bon jeu, je recommande")]
+    assert stats == {"total": 4, "ignored_no_note": 1, "ignored_short": 0, "ignored_not_review": 1, "used": 2}
+    assert corpus.compter_par_tranche(root) == {"30-40": 2, "90-100": 1}
+    assert os.path.exists(os.path.join(root, corpus.FICHIER_MANIFESTE))
+    assert [r["texte"] for r in corpus.iter_reviews(root, ["30-40"], min_size=10)] == ["Un très bon jeu, je recommande"]
+
+def test_review_modifiee_sur_place(tmp_path):
+    root = str(tmp_path)
+    creer_corpus(root, REVIEWS)
+    assert len(list(corpus.iter_reviews(root))) == 2 # Manifeste enregistré
+
+    reecrire_sur_place(os.path.join(root, "30-40", "A", "review_1.txt"), "Note : 👎\n\nBof")
+    reviews = {r["chemin"]: r for r in corpus.iter_reviews(root)}
+    review_1 = reviews[os.path.join("30-40", "A", "review_1.txt")]
+    assert (review_1["label"], review_1["texte"]) == (0, "Bof")
+    # Le filtre de longueur utilise la nouvelle longueur
+    assert [r["texte"] for r in corpus.iter_reviews(root, min_size=10)] == []
+
+def test_ajout_et_suppression(tmp_path):
+    root = str(tmp_path)
+    creer_corpus(root, REVIEWS)
+    corpus.lister_entrees(root)
+    os.remove(os.path.join(root, "30-40", "A", "review_2.txt"))
+    creer_corpus(root, {("30-40", "C", "review_1.txt"): "Note : 👍\n\nSuper"})
+    assert sorted(r["jeu"] for r in corpus.iter_reviews(root)) == ["A", "C"]
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+import corpus
+import corpus_shard
+from corpus_shard import ShardWriter
+
+# Fonction créant n reviews de test réparties sur deux tranches
+def records(n, debut=0):
+    return [{"tranche": "30-40" if i % 3 else "90-100", "jeu": f"Jeu {i % 5}", "label": i % 2, "recommendationid": str(1000 + i),
+             "langue": "french" if i % 4 else "english", "timestamp": 1700000000 + i, "texte": f"Review {i} é👍 " * (i % 7 + 1)}
+            for i in range(debut, debut + n)]
+
+def test_aller_retour(tmp_path):
+    dossier = str(tmp_path / "shard")
+    attendus = records(50)
+    with ShardWriter(dossier, reviews_par_bloc=8, taille_shard_max=300) as writer:
+        for record in attendus:
+            writer.write(record)
+    assert writer.written == 50
+
+    shards = corpus_shard.lister_shards(dossier)
+    assert corpus_shard.est_corpus_shard(dossier) and len(shards) > 1
+    for shard_path in shards:
+        assert os.path.exists(shard_path[:-len(".shard")] + ".idx")
+    index = [entree for shard_path in shards for entree in corpus_shard.lire_index(shard_path)]
+    assert sum(nombre for _, _, nombre in index) == 50
+    assert [nombre for _, _, nombre in index] == [8] * 6 + [2]
+
+    assert list(corpus_shard.iter_records(dossier)) == attendus
+    assert list(corpus_shard.iter_records(dossier, ["90-100"])) == [r for r in attendus if r["tranche"] == "90-100"]
+    for numero in (0, 7, 8, 31, 49):
+        assert corpus_shard.lire_record(dossier, numero) == attendus[numero]
+    with pytest.raises(IndexError):
+        corpus_shard.lire_record(dossier, 50)
+    assert corpus_shard.compter_par_tranche(dossier) == {"30-40": 33, "90-100": 17}
+    assert corpus_shard.recommendationids(dossier) == {str(1000 + i) for i in range(50)}
+
+def test_ajout_a_un_corpus_existant(tmp_path):
+    dossier = str(tmp_path / "shard")
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(6):
+            writer.write(record)
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(5, debut=6):
+            writer.write(record)
+    assert list(corpus_shard.iter_records(dossier)) == records(11)
+    assert [r["texte"] for r in corpus.iter_reviews(dossier)] == [r["texte"] for r in records(11)]
+
+def test_entree_d_index_incomplete_ignoree(tmp_path):
+    dossier = str(tmp_path / "shard")
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(8):
+            writer.write(record)
+    index_path = corpus_shard.lister_shards(dossier)[0][:-len(".shard")] + ".idx"
+    with open(index_path, "r+b") as f: # Écriture interrompue au milieu de la dernière entrée
+        f.truncate(os.path.getsize(index_path) - 3)
+    assert list(corpus_shard.iter_records(dossier)) == records(4)
+
+def test_ajout_apres_une_entree_d_index_incomplete(tmp_path):
+    dossier = str(tmp_path / "shard")
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(8):
+            writer.write(record)
+    shard_path = corpus_shard.lister_shards(dossier)[0]
+    index_path = shard_path[:-len(".shard")] + ".idx"
+    os.truncate(index_path, os.path.getsize(index_path) - 3) # Arrêt brutal pendant l'écriture de la seconde entrée
+
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(5, debut=8):
+            writer.write(record)
+    # Le bloc dont l'entrée était incomplète est perdu, tout le reste est relu
+    attendus = records(4) + records(5, debut=8)
+    assert list(corpus_shard.iter_records(dossier)) == attendus
+    assert os.path.getsize(index_path) == 3 * corpus_shard.ENTREE_INDEX.size
+    assert corpus_shard.lire_record(dossier, 8) == attendus[8]
+
+def test_ajout_apres_un_bloc_sans_entree_d_index(tmp_path):
+    dossier = str(tmp_path / "shard")
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(4):
+            writer.write(record)
+    shard_path = corpus_shard.lister_shards(dossier)[0]
+    taille = os.path.getsize(shard_path)
+    with open(shard_path, "ab") as f: # Bloc écrit, arrêt avant son entrée d'index
+        f.write(b"bloc orphelin")
+
+    with ShardWriter(dossier, reviews_par_bloc=4) as writer:
+        for record in records(3, debut=4):
+            writer.write(record)
+    assert list(corpus_shard.iter_records(dossier)) == records(7)
+    assert corpus_shard.lire_index(shard_path)[1][0] == taille
+
+def test_conversion_arborescence(tmp_path):
+    data = tmp_path / "data"
+    for tranche, jeu, numero, contenu in [("30-40", "A", 1, "Note : 👍\n\nBien"), ("30-40", "A", 10, "Note : 👎\n\nNul"),
+                                          ("30-40", "A", 2, "Pas de note"), ("90-100", "B", 1, "Note : 👍\n\nSuper")]:
+        os.makedirs(data / tranche / jeu, exist_ok=True)
+        (data / tranche / jeu / f"review_{numero}.txt").write_text(contenu, encoding="utf-8")
+    written, ignored = corpus_shard.convertir_arborescence(str(data), str(tmp_path / "shard"))
+    assert (written, ignored) == (3, 1)
+    assert [(r["tranche"], r["jeu"], r["label"], r["texte"]) for r in corpus_shard.iter_records(str(tmp_path / "shard"))] == [
+        ("30-40", "A", 1, "Bien"), ("30-40", "A", 0, "Nul"), ("90-100", "B", 1, "Super")]
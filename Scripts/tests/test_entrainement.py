@@ -0,0 +1,40 @@
+import numpy as np
+
+import entrainement
+
+MOTS = ["great", "fun", "loved", "story", "boring", "broken", "awful", "refund", "game", "music", "price", "bugs"]
+
+# Fonction créant un corpus TF-IDF déséquilibré (un tiers d'avis négatifs)
+def donnees(n=150, graine=0):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    rng = np.random.default_rng(graine)
+    y = (rng.random(n) > 0.33).astype(int)
+    textes = [" ".join(rng.choice(MOTS[:4] if label else MOTS[4:8], 3).tolist() + rng.choice(MOTS[8:], 4).tolist()) for label in y]
+    return TfidfVectorizer().fit_transform(textes), y
+
+def test_modeles_paralleles_sur_donnees_surechantillonnees():
+    from sklearn.model_selection import train_test_split
+    from sklearn.svm import SVC
+    from sklearn.linear_model import LogisticRegression
+    X, y = donnees()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, y_train = entrainement.oversample(X_train, y_train)
+    assert not X_train.has_sorted_indices # Indices du TF-IDF non triés : SVC les trie avant l'entraînement
+
+    # Le mode séquentiel trie X_train en place (SVC) : le mode parallèle est lancé d'abord, sur la matrice d'origine
+    modeles = lambda: {"SVM": SVC(kernel="linear"), "Logistic Regression": LogisticRegression()}
+    parallele = entrainement.train_models(modeles(), X_train, y_train, X_test, y_test, n_workers=2)
+    sequentiel = entrainement.train_models(modeles(), X_train.copy(), y_train, X_test, y_test, n_workers=1)
+    for name in ("SVM", "Logistic Regression"):
+        assert list(parallele[1][name]) == list(sequentiel[1][name])
+        assert parallele[0][name] == sequentiel[0][name]
+
+def test_matrice_partagee_non_canonique(tmp_path):
+    from scipy.sparse import csr_matrix
+    X = csr_matrix((np.array([1.0, 2.0, 3.0]), np.array([2, 0, 2]), np.array([0, 3])), shape=(1, 3)) # Indices désordonnés et doublon
+    X_partagee = entrainement.load_shared_matrix(entrainement.share_matrix(X, str(tmp_path), "X"))
+    assert X_partagee.has_canonical_format
+    assert X_partagee.toarray().tolist() == [[2.0, 0.0, 4.0]]
+    X_partagee.sort_indices()
+    X_partagee.data *= 2 # Copie sur écriture : autorisé, sans toucher au fichier
+    assert entrainement.load_shared_matrix(entrainement.share_matrix(X, str(tmp_path), "Y")).toarray().tolist() == [[2.0, 0.0, 4.0]]
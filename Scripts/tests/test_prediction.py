@@ -0,0 +1,52 @@
+import os
+import csv
+
+import pytest
+
+import prediction
+from test_corpus import creer_corpus
+
+TEXTES = ["great fun game", "awesome story loved it", "really great", "boring and broken", "awful waste of money", "broken mess"]
+
+@pytest.fixture
+def pipeline_enregistre(tmp_path):
+    from sklearn.pipeline import Pipeline
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("modele", LogisticRegression())])
+    pipeline.fit(TEXTES * 3, [1, 1, 1, 0, 0, 0] * 3)
+    return prediction.save_pipeline(pipeline, str(tmp_path / "modele"), {"modele": "Logistic Regression", "f1-score": 1.0})
+
+# Fonction lisant un fichier CSV de prédictions
+def lire_csv(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+@pytest.mark.parametrize("disposition", ["jeu", "lot", "corpus"])
+def test_prediction_sur_un_dossier(tmp_path, pipeline_enregistre, disposition):
+    dossier = str(tmp_path / "reviews")
+    prefixe = {"jeu": (), "lot": ("Jeu",), "corpus": ("30-40", "Jeu")}[disposition]
+    fichiers = {prefixe + (f"review_{i}.txt",): f"Note : {'👍' if i <= 3 else '👎'}\n\n{texte}" for i, texte in enumerate(TEXTES, 1)}
+    fichiers[prefixe + (".sync_steam.json",)] = "{}"
+    for chemin, contenu in fichiers.items():
+        os.makedirs(os.path.join(dossier, *chemin[:-1]), exist_ok=True)
+        with open(os.path.join(dossier, *chemin), "w", encoding="utf-8") as f:
+            f.write(contenu)
+
+    pipeline, metadata = prediction.load_pipeline(pipeline_enregistre)
+    assert metadata["modele"] == "Logistic Regression" and metadata["probabilites"]
+    total, _, accord = prediction.predict_corpus(pipeline, dossier, str(tmp_path / "sortie"))
+    assert total == len(TEXTES)
+    assert accord == 1.0
+
+    lignes = sorted(lire_csv(tmp_path / "sortie" / "predictions_reviews.csv"), key=lambda l: os.path.basename(l["chemin"]))
+    labels, proba = prediction.predict_batch(pipeline, TEXTES)
+    assert [int(l["label_predit"]) for l in lignes] == list(labels)
+    assert [float(l["probabilite_positive"]) for l in lignes] == pytest.approx(list(proba), abs=1e-4)
+    jeux = lire_csv(tmp_path / "sortie" / "predictions_jeux.csv")
+    assert [(j["jeu"], j["reviews"]) for j in jeux] == [("reviews" if disposition == "jeu" else "Jeu", "6")]
+
+def test_dossier_sans_review(tmp_path, pipeline_enregistre):
+    creer_corpus(str(tmp_path), {("vide", "Jeu", "notes.txt"): "rien"})
+    pipeline, _ = prediction.load_pipeline(pipeline_enregistre)
+    assert prediction.predict_corpus(pipeline, str(tmp_path / "vide"), str(tmp_path / "sortie"))[0] == 0
@@ -0,0 +1,127 @@
+import os
+import json
+
+import pytest
+import requests
+
+import reviews_steam
+
+# Réponse HTTP factice
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        if self.data is None:
+            raise ValueError("corps invalide")
+        return self.data
+
+# Session factice : une page par curseur, les requêtes reçues sont gardées dans "appels"
+class FakeSession:
+    def __init__(self, pages, erreurs=None):
+        self.pages = pages
+        self.erreurs = erreurs or {}
+        self.appels = []
+
+    def get(self, url, params=None, timeout=None):
+        self.appels.append(dict(params))
+        cursor = params["cursor"]
+        if cursor in self.erreurs:
+            erreur = self.erreurs[cursor]
+            if isinstance(erreur, Exception):
+                raise erreur
+            return erreur
+        reviews, suivant = self.pages[cursor]
+        return FakeResponse(200, {"success": 1, "reviews": reviews, "cursor": suivant})
+
+# Fonction créant une review de l'API
+def review(numero, voted_up=True):
+    return {"recommendationid": str(numero), "review": f"Review numéro {numero}", "voted_up": voted_up,
+            "timestamp_updated": 1000 + numero}
+
+PAGES = {
+    "*": ([review(1), review(2)], "c1"),
+    "c1": ([review(3), review(4, False)], "c2"),
+    "c2": ([review(5)], "c3"),
+    "c3": ([], "c3"),
+}
+
+def test_iter_reviews_suit_le_curseur():
+    session = FakeSession(PAGES)
+    reviews = list(reviews_steam.iter_reviews("10", count=100, session=session))
+    assert [r["recommendationid"] for r in reviews] == ["1", "2", "3", "4", "5"]
+    assert [appel["cursor"] for appel in session.appels] == ["*", "c1", "c2", "c3"]
+
+def test_iter_reviews_s_arrete_au_nombre_demande():
+    session = FakeSession(PAGES)
+    reviews = list(reviews_steam.iter_reviews("10", count=3, session=session))
+    assert [r["recommendationid"] for r in reviews] == ["1", "2", "3"]
+    assert [appel["num_per_page"] for appel in session.appels] == [3, 1]
+
+def test_iter_reviews_s_arrete_si_le_curseur_ne_change_pas():
+    session = FakeSession({"*": ([review(1)], "c1"), "c1": ([review(2)], "c1")})
+    reviews = list(reviews_steam.iter_reviews("10", count=100, session=session))
+    assert [r["recommendationid"] for r in reviews] == ["1", "2"]
+    assert len(session.appels) == 2
+
+@pytest.mark.parametrize("erreur", [FakeResponse(503), FakeResponse(200, None), FakeResponse(200, {"success": 0}),
+                                    requests.ConnectionError("coupure")])
+def test_erreur_leve_et_garde_le_curseur(tmp_path, erreur):
+    checkpoint = str(tmp_path / reviews_steam.FICHIER_CURSEUR)
+    session = FakeSession(PAGES, {"c2": erreur})
+    recues = []
+    with pytest.raises(reviews_steam.SteamAPIError):
+        for r in reviews_steam.iter_reviews("10", count=100, checkpoint_path=checkpoint, session=session):
+            recues.append(r["recommendationid"])
+    assert recues == ["1", "2", "3", "4"]
+    with open(checkpoint, "r", encoding="utf-8") as f:
+        assert json.load(f) == {"appid": "10", "language": "all", "cursor": "c2", "recuperees": 4}
+
+def test_download_reprend_apres_une_erreur(tmp_path):
+    dossier = str(tmp_path / "jeu")
+    with pytest.raises(reviews_steam.SteamAPIError):
+        reviews_steam.download_reviews("10", dossier, count=100, session=FakeSession(PAGES, {"c2": FakeResponse(500)}))
+    assert os.path.exists(os.path.join(dossier, reviews_steam.FICHIER_CURSEUR))
+
+    session = FakeSession(PAGES)
+    assert reviews_steam.download_reviews("10", dossier, count=100, session=session) == 1
+    assert session.appels[0]["cursor"] == "c2"
+    assert not os.path.exists(os.path.join(dossier, reviews_steam.FICHIER_CURSEUR))
+    assert sorted(f for f in os.listdir(dossier) if f.startswith("review_")) == [f"review_{i}.txt" for i in range(1, 6)]
+    with open(os.path.join(dossier, "review_4.txt"), "r", encoding="utf-8") as f:
+        assert f.read() == "Note : 👎\n\nReview numéro 4"
+
+def test_download_dans_un_corpus_shard(tmp_path):
+    import corpus_shard
+    dossier = str(tmp_path / "shard")
+    for _ in range(2): # Un second téléchargement n'ajoute pas de doublons
+        connues = corpus_shard.recommendationids(dossier) if os.path.isdir(dossier) else set()
+        with corpus_shard.ShardWriter(dossier) as writer:
+            saved = reviews_steam.download_reviews_to_shard("10", writer, "30-40", "Jeu", count=100, session=FakeSession(PAGES), connues=connues)
+    assert saved == 0
+    records = list(corpus_shard.iter_records(dossier))
+    assert [(r["recommendationid"], r["label"], r["tranche"], r["jeu"]) for r in records] == [
+        ("1", 1, "30-40", "Jeu"), ("2", 1, "30-40", "Jeu"), ("3", 1, "30-40", "Jeu"), ("4", 0, "30-40", "Jeu"), ("5", 1, "30-40", "Jeu")]
+
+def test_sync_remplace_les_reviews_modifiees(tmp_path):
+    import corpus
+    dossier = str(tmp_path / "data" / "30-40" / "Jeu")
+    premiere = {"*": ([review(3), review(2), review(1)], "c1"), "c1": ([], "c1")}
+    assert reviews_steam.sync_reviews("10", dossier, session=FakeSession(premiere)) == (3, 0)
+    assert [r["label"] for r in corpus.iter_reviews(str(tmp_path / "data"))] == [1, 1, 1]
+
+    modifiee = {"recommendationid": "2", "review": "Finalement non", "voted_up": False, "timestamp_updated": 2000}
+    seconde = {"*": ([review(4), modifiee, review(3)], "c1"), "c1": ([], "c1")}
+    session = FakeSession(seconde)
+    assert reviews_steam.sync_reviews("10", dossier, session=session) == (1, 1)
+    assert all(appel["filter"] == "updated" for appel in session.appels)
+    with open(os.path.join(dossier, "review_2.txt"), "r", encoding="utf-8") as f:
+        assert f.read() == "Note : 👎\n\nFinalement non"
+    assert not any(fichier.endswith(".tmp") for fichier in os.listdir(dossier))
+
+    # Le manifeste du corpus voit la modification (nouveau label, nouveau texte)
+    reviews = {r["chemin"]: r for r in corpus.iter_reviews(str(tmp_path / "data"))}
+    assert len(reviews) == 4
+    review_2 = reviews[os.path.join("30-40", "Jeu", "review_2.txt")]
+    assert (review_2["label"], review_2["texte"]) == (0, "Finalement non")
@@ -0,0 +1,29 @@
+import scores_evaluation
+import sentiment_reviews
+from test_corpus import creer_corpus
+
+REVIEWS = {
+    ("30-40", "A", "review_1.txt"): "Note : 👍\n\nUn très bon jeu.\n\n  Je le recommande !  \nVraiment.",
+    ("30-40", "A", "review_2.txt"): "Note : 👎\n\nNul\n\n\nTrop cher",
+    ("90-100", "B", "review_1.txt"): "Note : 👍\n\nGreat game,\nloved it",
+}
+
+def test_memes_textes_que_l_analyse_de_sentiment(tmp_path, monkeypatch):
+    root = str(tmp_path / "data")
+    creer_corpus(root, REVIEWS)
+    evalues, analyses = [], []
+    def predict_batch(textes, langues=None):
+        evalues.extend(textes)
+        return [1] * len(textes)
+    def analyze_chunk(paquet):
+        analyses.extend(texte for texte, _ in paquet)
+        return [0.5] * len(paquet)
+    monkeypatch.setattr(scores_evaluation, "predict_batch", predict_batch)
+    monkeypatch.setattr(sentiment_reviews, "analyze_chunk", analyze_chunk)
+    monkeypatch.setattr(sentiment_reviews.moteur_sentiment, "vader", lambda: None)
+
+    scores = scores_evaluation.evaluate(root, ["30-40", "90-100"])
+    sentiment_reviews.analyze_corpus(root, ["30-40", "90-100"])
+    assert sorted(evalues) == sorted(analyses)
+    assert "Un très bon jeu.\n\n  Je le recommande !  \nVraiment." in evalues
+    assert scores["Global"][1] == 1.0
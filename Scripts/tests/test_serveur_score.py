@@ -0,0 +1,58 @@
+import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import prediction
+import serveur_score
+from test_prediction import TEXTES, pipeline_enregistre
+
+CLIENTS = 24
+
+@pytest.fixture
+def serveur(pipeline_enregistre):
+    server = serveur_score.create_server(pipeline_enregistre, port=0, sentiment=False, lot_max=64, attente_ms=200)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+# Fonction envoyant une requête et renvoyant (statut, réponse JSON)
+def requete(url, corps=None):
+    donnees = json.dumps(corps).encode("utf-8") if corps is not None else None
+    req = urllib.request.Request(url, data=donnees, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_requetes_simultanees_regroupees(serveur, pipeline_enregistre):
+    textes = [TEXTES[i % len(TEXTES)] for i in range(CLIENTS)]
+    depart = threading.Barrier(CLIENTS)
+    def client(texte):
+        depart.wait()
+        return requete(serveur + "/predire", {"texte": texte})
+    with ThreadPoolExecutor(max_workers=CLIENTS) as pool:
+        reponses = list(pool.map(client, textes))
+
+    pipeline, _ = prediction.load_pipeline(pipeline_enregistre)
+    labels, proba = prediction.predict_batch(pipeline, textes)
+    assert [statut for statut, _ in reponses] == [200] * CLIENTS
+    assert [r["label"] for _, r in reponses] == list(labels)
+    assert [r["probabilite_positive"] for _, r in reponses] == pytest.approx(list(proba))
+
+    statut, stats = requete(serveur + "/stats")
+    assert statut == 200
+    assert stats["textes"] == CLIENTS and stats["requetes"] == CLIENTS
+    assert 1 <= stats["lots"] < stats["textes"]
+
+def test_plusieurs_textes_et_erreurs(serveur):
+    statut, reponse = requete(serveur + "/predire", {"textes": TEXTES})
+    assert statut == 200 and len(reponse["resultats"]) == len(TEXTES)
+    assert requete(serveur + "/predire", {"textes": [1, 2]})[0] == 400
+    assert requete(serveur + "/inconnue", {})[0] == 404
+    assert requete(serveur + "/sante") == (200, {"statut": "ok"})
@@ -0,0 +1,110 @@
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+import telechargement_lot
+from telechargement_lot import TokenBucket, RateLimitedSession
+
+# Horloge factice remplaçant le module time de telechargement_lot : sleep() avance le temps sans attendre
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+        self.attentes = []
+
+    def monotonic(self):
+        return self.t
+
+    def perf_counter(self):
+        return self.t
+
+    def sleep(self, duree):
+        self.attentes.append(duree)
+        self.t += duree
+
+# Adaptateur HTTP factice : renvoie les statuts (ou lève les exceptions) prévus, dans l'ordre, en notant l'heure de chaque envoi
+class FakeAdapter(BaseAdapter):
+    def __init__(self, reponses, clock):
+        super().__init__()
+        self.reponses = list(reponses)
+        self.clock = clock
+        self.envois = []
+
+    def send(self, request, **kwargs):
+        self.envois.append(self.clock.t)
+        reponse = self.reponses.pop(0)
+        if isinstance(reponse, Exception):
+            raise reponse
+        status, headers = reponse if isinstance(reponse, tuple) else (reponse, {})
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = b"{}"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telechargement_lot, "time", clock)
+    return clock
+
+# Fonction créant une session limitée dont les requêtes passent par l'adaptateur factice
+def session_factice(clock, reponses, rate=1000, capacity=None, **kwargs):
+    session = RateLimitedSession(TokenBucket(rate, capacity), **kwargs)
+    adapter = FakeAdapter(reponses, clock)
+    session.mount("https://", adapter)
+    return session, adapter
+
+def test_bucket_rafale_puis_debit(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.attentes == []
+    bucket.acquire()
+    assert clock.attentes == [pytest.approx(0.5)]
+    clock.t += 10 # Les jetons se reconstituent sans dépasser la capacité
+    bucket.acquire()
+    bucket.acquire()
+    assert len(clock.attentes) == 1
+
+def test_session_espace_les_requetes(clock):
+    session, adapter = session_factice(clock, [200] * 5, rate=5, capacity=1)
+    for _ in range(5):
+        assert session.get("https://steam.test/appreviews/10").status_code == 200
+    ecarts = [b - a for a, b in zip(adapter.envois, adapter.envois[1:])]
+    assert ecarts == [pytest.approx(0.2)] * 4
+    assert session.request_count == 5
+
+def test_session_reessaie_429_et_5xx(clock):
+    session, adapter = session_factice(clock, [(429, {"Retry-After": "3"}), 503, 200], backoff=1.0)
+    response = session.get("https://steam.test/appreviews/10")
+    assert response.status_code == 200
+    assert session.request_count == 3
+    assert clock.attentes == [3.0, 2.0] # Retry-After, puis backoff * 2 ** 1
+
+def test_session_rend_la_derniere_erreur(clock):
+    session, adapter = session_factice(clock, [500] * 4, max_retries=3, backoff=0.5)
+    response = session.get("https://steam.test/appreviews/10")
+    assert response.status_code == 500
+    assert session.request_count == 4
+    assert clock.attentes == [0.5, 1.0, 2.0]
+
+def test_session_ne_reessaie_pas_les_autres_statuts(clock):
+    session, adapter = session_factice(clock, [404, 200])
+    assert session.get("https://steam.test/appreviews/10").status_code == 404
+    assert session.request_count == 1
+
+def test_session_erreurs_reseau(clock):
+    coupure = requests.ConnectionError("coupure")
+    session, adapter = session_factice(clock, [coupure, 200], backoff=1.0)
+    assert session.get("https://steam.test/appreviews/10").status_code == 200
+    assert clock.attentes == [1.0]
+
+    session, adapter = session_factice(clock, [coupure] * 3, max_retries=2, backoff=1.0)
+    with pytest.raises(requests.ConnectionError):
+        session.get("https://steam.test/appreviews/10")
+    assert session.request_count == 3